@@ -0,0 +1,273 @@
+# benchmarks/embedding_throughput.py
+"""
+Embedding throughput across backends, batch sizes, text lengths, thread
+counts and cache on/off.
+
+Each (backend, threads) pair runs in its own subprocess, so the thread
+count is pinned before torch / ONNX Runtime start and peak RSS belongs to
+that configuration alone. Results go to JSON; --compare diffs two runs.
+
+    python benchmarks/embedding_throughput.py --backends minilm,minilm-onnx-int8 --threads 1,4,8
+    python benchmarks/embedding_throughput.py --compare old.json new.json
+
+Runs offline (HF_HUB_OFFLINE=1): the models must already be cached.
+"""
+import sys, os
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import argparse
+import json
+import platform
+import random
+import resource
+import subprocess
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from benchmarks.length_bucketing import WORDS
+
+# Words per text for each length profile
+LENGTHS = {"short": (4, 12), "medium": (40, 80), "long": (150, 250)}
+
+
+def make_texts(n: int, length: str, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    low, high = LENGTHS[length]
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(low, high))) for _ in range(n)]
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def measure(embedder, batches: list[list[str]]) -> dict:
+    """
+    Embeds batches one call at a time (after one warm-up call).
+    """
+    embedder.embed(batches[0])
+
+    latencies = []
+    for batch in batches:
+        started = time.perf_counter()
+        embedder.embed(batch)
+        latencies.append(time.perf_counter() - started)
+
+    texts = sum(len(b) for b in batches)
+    return {
+        "texts_per_s": texts / sum(latencies),
+        "p50_ms": float(np.percentile(latencies, 50) * 1000),
+        "p99_ms": float(np.percentile(latencies, 99) * 1000),
+        "calls": len(batches),
+    }
+
+
+def run_config(config: dict, factory=None) -> list[dict]:
+    """
+    All batch size × length × cache measurements for one backend and
+    thread count. factory(backend, cache) builds the embedder
+    (default: create_embedder).
+    """
+    if factory is None:
+        from src.embedder.factory import create_embedder
+        factory = lambda backend, cache: create_embedder(backend, cache=cache)
+
+    started = time.perf_counter()
+    factory(config["backend"], False).embed(["load"])
+    load_seconds = time.perf_counter() - started
+
+    results = []
+    for length in config["lengths"]:
+        for batch_size in config["batch_sizes"]:
+            # Calls draw from a pool half their total size, so about half
+            # the texts repeat (what the cache is for)
+            calls = max(config["min_calls"], -(-config["min_texts"] // batch_size))
+            pool = make_texts(max(1, calls * batch_size // 2), length)
+            rng = random.Random(1)
+            batches = [[rng.choice(pool) for _ in range(batch_size)] for _ in range(calls)]
+
+            for cache in config["cache"]:
+                row = {
+                    "backend": config["backend"],
+                    "threads": config["threads"],
+                    "length": length,
+                    "batch_size": batch_size,
+                    "cache": cache,
+                }
+                row.update(measure(factory(config["backend"], cache), batches))
+                row["load_seconds"] = load_seconds
+                row["peak_rss_mb"] = peak_rss_mb()
+                results.append(row)
+    return results
+
+
+def run_in_subprocess(config: dict, online: bool = False) -> list[dict]:
+    threads = str(config["threads"])
+    env = dict(
+        os.environ,
+        OMP_NUM_THREADS=threads,
+        MKL_NUM_THREADS=threads,
+        ONNX_INTRA_OP_THREADS=threads,
+        TOKENIZERS_PARALLELISM="false",
+        EMBEDDING_CACHE_DIR="",  # cache runs use the in-process tier only
+    )
+    if not online:
+        env.update(HF_HUB_OFFLINE="1", TRANSFORMERS_OFFLINE="1")
+
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--_worker", json.dumps(config)],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{config['backend']} × {threads} threads failed:\n{proc.stderr[-2000:]}")
+
+    # The worker prints its results as the last stdout line
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def _worker(config_json: str):
+    config = json.loads(config_json)
+    try:
+        import torch
+        torch.set_num_threads(config["threads"])
+    except ImportError:
+        pass
+    print(json.dumps(run_config(config)))
+
+
+# -----------------------------
+# Reporting
+# -----------------------------
+def result_key(row: dict) -> tuple:
+    return (row["backend"], row["threads"], row["length"], row["batch_size"], row["cache"])
+
+
+def compare_results(old: dict, new: dict) -> list[dict]:
+    """
+    Rows present in both runs, with new/old throughput and p99 ratios.
+    """
+    before = {result_key(r): r for r in old["results"]}
+    rows = []
+    for r in new["results"]:
+        o = before.get(result_key(r))
+        if o is None:
+            continue
+        rows.append({
+            **{k: r[k] for k in ("backend", "threads", "length", "batch_size", "cache")},
+            "texts_per_s_old": o["texts_per_s"],
+            "texts_per_s_new": r["texts_per_s"],
+            "speedup": r["texts_per_s"] / o["texts_per_s"] if o["texts_per_s"] else 0.0,
+            "p99_ratio": r["p99_ms"] / o["p99_ms"] if o["p99_ms"] else 0.0,
+        })
+    return rows
+
+
+def best_settings(results: list[dict]) -> dict:
+    """
+    Highest-throughput (threads, batch_size) per backend and length, cache off.
+    """
+    best = {}
+    for r in results:
+        if r["cache"]:
+            continue
+        key = (r["backend"], r["length"])
+        if key not in best or r["texts_per_s"] > best[key]["texts_per_s"]:
+            best[key] = r
+    return best
+
+
+def print_results(results: list[dict]):
+    print(f"\n{'backend':<18} {'thr':>3} {'length':<6} {'batch':>5} {'cache':>5} "
+          f"{'texts/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'RSS MB':>7}")
+    for r in results:
+        print(f"{r['backend']:<18} {r['threads']:>3} {r['length']:<6} {r['batch_size']:>5} {str(r['cache']):>5} "
+              f"{r['texts_per_s']:>9.1f} {r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['peak_rss_mb']:>7.0f}")
+
+    print("\nBest settings (cache off):")
+    for (backend, length), r in sorted(best_settings(results).items()):
+        print(f"  {backend:<18} {length:<6} threads={r['threads']} batch_size={r['batch_size']} "
+              f"({r['texts_per_s']:.1f} texts/s)")
+
+
+def print_comparison(rows: list[dict]):
+    print(f"\n{'backend':<18} {'thr':>3} {'length':<6} {'batch':>5} {'cache':>5} "
+          f"{'old/s':>9} {'new/s':>9} {'speedup':>8} {'p99 x':>6}")
+    for r in rows:
+        print(f"{r['backend']:<18} {r['threads']:>3} {r['length']:<6} {r['batch_size']:>5} {str(r['cache']):>5} "
+              f"{r['texts_per_s_old']:>9.1f} {r['texts_per_s_new']:>9.1f} {r['speedup']:>7.2f}x {r['p99_ratio']:>5.2f}")
+
+
+def int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Embedding throughput benchmark")
+    parser.add_argument("--backends", default="minilm", help="Comma-separated embedder aliases")
+    parser.add_argument("--batch_sizes", default="1,8,32,128")
+    parser.add_argument("--lengths", default="short,medium,long", help=f"Any of {','.join(LENGTHS)}")
+    parser.add_argument("--threads", default=str(os.cpu_count() or 1), help="Comma-separated thread counts")
+    parser.add_argument("--cache", default="off,on", help="off, on or off,on")
+    parser.add_argument("--min_texts", type=int, default=512, help="Texts embedded per measurement (at least)")
+    parser.add_argument("--min_calls", type=int, default=20, help="Calls per measurement (at least), for p99")
+    parser.add_argument("--output", default=None, help="JSON results path")
+    parser.add_argument("--online", action="store_true", help="Allow model downloads")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Compare two result files")
+    parser.add_argument("--_worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args._worker:
+        _worker(args._worker)
+        return
+
+    if args.compare:
+        with open(args.compare[0]) as f_old, open(args.compare[1]) as f_new:
+            print_comparison(compare_results(json.load(f_old), json.load(f_new)))
+        return
+
+    results = []
+    for backend in args.backends.split(","):
+        for threads in int_list(args.threads):
+            config = {
+                "backend": backend,
+                "threads": threads,
+                "batch_sizes": int_list(args.batch_sizes),
+                "lengths": args.lengths.split(","),
+                "cache": [c == "on" for c in args.cache.split(",")],
+                "min_texts": args.min_texts,
+                "min_calls": args.min_calls,
+            }
+            print(f"Running {backend} with {threads} threads...")
+            results.extend(run_in_subprocess(config, online=args.online))
+
+    report = {
+        "meta": {
+            "host": platform.node(),
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+            "python": platform.python_version(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+
+    output = args.output or os.path.join(
+        ROOT, "benchmarks", "results", f"embedding_throughput_{platform.node() or 'local'}.json"
+    )
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print_results(results)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# benchmarks/length_bucketing.py
+"""
+Embedding throughput with and without length bucketing.
+
+Encodes the same mixed-length chunks twice, in ingest-sized calls:
+once as given (caller order) and once through LengthBucketedEmbedder,
+and reports texts/s plus padding efficiency (real tokens / token slots).
+
+    python benchmarks/length_bucketing.py --embedder minilm-onnx
+    python benchmarks/length_bucketing.py --input data/chunks --texts 5000
+"""
+import sys, os
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import argparse
+import glob
+import random
+import time
+
+from src.embedder.bucketing import LengthBucketedEmbedder
+from src.embedder.factory import create_embedder
+
+WORDS = (
+    "retrieval augmented generation vector database embedding chunk query ranking "
+    "context prompt model token latency throughput index document section paragraph"
+).split()
+
+
+def synthetic_chunks(n: int, seed: int = 0) -> list[str]:
+    """
+    Ingest-like mix: short headings and list items next to long sections.
+    """
+    rng = random.Random(seed)
+    chunks = []
+    for _ in range(n):
+        kind = rng.random()
+        words = rng.randint(2, 8) if kind < 0.3 else rng.randint(20, 60) if kind < 0.6 else rng.randint(120, 220)
+        chunks.append(" ".join(rng.choice(WORDS) for _ in range(words)))
+    return chunks
+
+
+def load_chunks(path: str, limit: int) -> list[str]:
+    from src.data_prep.saver import iter_saved_chunks
+
+    files = sorted(glob.glob(os.path.join(path, "*.json")) + glob.glob(os.path.join(path, "*.chunks")))
+    chunks = []
+    for file in files:
+        for text, _ in iter_saved_chunks(file):
+            chunks.append(text)
+            if len(chunks) >= limit:
+                return chunks
+    return chunks
+
+
+def run(embedder, texts: list[str], call_size: int) -> float:
+    """
+    Embeds texts in calls of call_size; returns texts/s.
+    """
+    embedder.embed(texts[:call_size])  # warm-up
+    started = time.perf_counter()
+    for start in range(0, len(texts), call_size):
+        embedder.embed(texts[start:start + call_size])
+    return len(texts) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Length-bucketed vs. caller-order embedding")
+    parser.add_argument("--embedder", default="minilm", help="Embedder alias (minilm, minilm-onnx, ...)")
+    parser.add_argument("--input", default=None, help="Directory of saved chunks (default: synthetic mix)")
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument("--call_size", type=int, default=256, help="Texts per embed() call, as on ingest")
+    parser.add_argument("--bucket_size", type=int, default=32)
+    args = parser.parse_args()
+
+    texts = load_chunks(args.input, args.texts) if args.input else synthetic_chunks(args.texts)
+    base = create_embedder(args.embedder, cache=False)
+    bucketed = LengthBucketedEmbedder(base, bucket_size=args.bucket_size)
+
+    plain_rate = run(base, texts, args.call_size)
+    bucketed_rate = run(bucketed, texts, args.call_size)
+    stats = bucketed.stats()
+
+    print("\n========== LENGTH BUCKETING ==========")
+    print(f"Embedder:            {args.embedder}")
+    print(f"Texts:               {len(texts)} (calls of {args.call_size}, buckets of {args.bucket_size})")
+    print(f"Caller order:        {plain_rate:.1f} texts/s")
+    print(f"Length-bucketed:     {bucketed_rate:.1f} texts/s ({bucketed_rate / plain_rate:.2f}x)")
+    print(f"Padding efficiency:  {stats['padding_efficiency']:.1%} bucketed vs "
+          f"{stats['unsorted_efficiency']:.1%} in caller order")
+    print("======================================\n")
+
+
+if __name__ == "__main__":
+    main()
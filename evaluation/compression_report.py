@@ -0,0 +1,166 @@
+# evaluation/compression_report.py
+"""
+Recall vs. index size for the vector compression options.
+
+For every setting (none, PCA / truncation to 256/128/64 dims, with and
+without float16) the corpus and queries are compressed and searched
+exactly; recall@k is the overlap with exact full-dimension top-k. The
+queries are the eval-set questions plus a sample of corpus chunks (each
+excluded from its own results).
+
+    python evaluation/compression_report.py
+    python evaluation/compression_report.py --input data/chunks --k 10
+"""
+import sys
+import os
+import json
+import csv
+import glob
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+# -----------------------------
+# Ensure project root is importable
+# -----------------------------
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.config import CHROMA_DIR
+from src.vectorstore.compression import VectorCompressor
+
+DIMS = (256, 128, 64)
+
+
+# -----------------------------
+# Exact search
+# -----------------------------
+def exact_top_k(corpus: np.ndarray, queries: np.ndarray, k: int, exclude=None) -> np.ndarray:
+    """
+    (n_queries, k) corpus indices by cosine similarity. exclude[i] is a
+    corpus index to leave out of query i's results (-1 = none).
+    """
+    corpus = corpus / np.clip(np.linalg.norm(corpus, axis=1, keepdims=True), 1e-12, None)
+    queries = queries / np.clip(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12, None)
+    scores = queries @ corpus.T
+
+    if exclude is not None:
+        rows = np.flatnonzero(np.asarray(exclude) >= 0)
+        scores[rows, np.asarray(exclude)[rows]] = -np.inf
+
+    k = min(k, corpus.shape[0])
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1)
+    return np.take_along_axis(top, order, axis=1)
+
+
+def recall_vs_full(reference: np.ndarray, found: np.ndarray) -> float:
+    """
+    Mean fraction of the exact top-k found by the compressed search.
+    """
+    return float(np.mean([len(set(r) & set(f)) / len(r) for r, f in zip(reference, found)]))
+
+
+def evaluate(corpus, queries, k, exclude, fit_sample) -> list[dict]:
+    reference = exact_top_k(corpus, queries, k, exclude)
+    full_bytes = corpus.shape[1] * 4
+
+    configs = [("none", corpus.shape[1], False)]
+    configs += [(method, dim, f16) for method in ("pca", "truncate") for dim in DIMS for f16 in (False, True)]
+
+    rows = []
+    for method, dim, f16 in configs:
+        if method == "none":
+            found, bytes_per_vector = reference, full_bytes
+        else:
+            if dim >= corpus.shape[1] or (method == "pca" and len(fit_sample) < dim):
+                continue
+            compressor = VectorCompressor(method, dim, f16).fit(fit_sample)
+            found = exact_top_k(compressor.transform(corpus), compressor.transform(queries), k, exclude)
+            bytes_per_vector = compressor.bytes_per_vector()
+
+        rows.append({
+            "method": method,
+            "dim": dim,
+            "float16": f16,
+            "bytes_per_vector": bytes_per_vector,
+            "index_mb": round(bytes_per_vector * len(corpus) / 1e6, 3),
+            "size_ratio": round(bytes_per_vector / full_bytes, 4),
+            f"recall@{k}": round(recall_vs_full(reference, found), 4),
+        })
+    return rows
+
+
+# -----------------------------
+# Corpus loading
+# -----------------------------
+def load_chroma_corpus(persist_dir: str):
+    from src.vectorstore.factory import create_vector_store
+
+    store = create_vector_store(persist_dir=persist_dir, compression="none")
+    data = store.collection.get(include=["embeddings"])
+    return store.embedder, np.asarray(data["embeddings"], dtype=np.float32)
+
+
+def load_chunk_corpus(path: str):
+    from src.data_prep.saver import iter_saved_chunks
+    from src.embedder.bucketing import for_ingest
+    from src.embedder.shared import get_shared_embedder
+
+    files = sorted(glob.glob(os.path.join(path, "*.json")) + glob.glob(os.path.join(path, "*.chunks")))
+    texts = [text for file in files for text, _ in iter_saved_chunks(file)]
+
+    embedder = get_shared_embedder()
+    return embedder, np.asarray(for_ingest(embedder).embed(texts), dtype=np.float32)
+
+
+# -----------------------------
+# Main
+# -----------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Recall vs. size of compressed vector indexes")
+    parser.add_argument("--persist_dir", default=CHROMA_DIR, help="Full-size Chroma collection to evaluate")
+    parser.add_argument("--input", default=None, help="Saved chunks directory to embed instead of Chroma")
+    parser.add_argument("--dataset", default=str(ROOT / "evaluation" / "data" / "sample_eval.json"))
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--corpus_queries", type=int, default=500, help="Corpus chunks used as extra queries")
+    parser.add_argument("--fit_sample", type=int, default=20000)
+    parser.add_argument("--output", default=str(ROOT / "evaluation" / "reports" / "compression_report.csv"))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    embedder, corpus = load_chunk_corpus(args.input) if args.input else load_chroma_corpus(args.persist_dir)
+    if len(corpus) == 0:
+        print("Empty corpus; ingest documents or pass --input.")
+        return
+
+    rng = np.random.default_rng(args.seed)
+
+    with open(args.dataset, "r") as f:
+        eval_queries = [sample["query"] for sample in json.load(f)]
+    sampled = rng.choice(len(corpus), size=min(args.corpus_queries, len(corpus)), replace=False)
+
+    queries = np.concatenate([np.asarray(embedder.embed(eval_queries), dtype=np.float32), corpus[sampled]])
+    exclude = np.concatenate([np.full(len(eval_queries), -1), sampled])
+    fit_sample = corpus[rng.choice(len(corpus), size=min(args.fit_sample, len(corpus)), replace=False)]
+
+    rows = evaluate(corpus, queries, args.k, exclude, fit_sample)
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=rows[0].keys())
+        writer.writeheader()
+        writer.writerows(rows)
+
+    print(f"\nCorpus: {len(corpus)} vectors × {corpus.shape[1]} dims, "
+          f"{len(eval_queries)} eval + {len(sampled)} corpus queries\n")
+    print(f"{'method':<9} {'dim':>4} {'fp16':>5} {'B/vec':>6} {'index MB':>9} {'size':>6} {f'recall@{args.k}':>9}")
+    for r in rows:
+        print(f"{r['method']:<9} {r['dim']:>4} {str(r['float16']):>5} {r['bytes_per_vector']:>6} "
+              f"{r['index_mb']:>9.2f} {r['size_ratio']:>6.1%} {r[f'recall@{args.k}']:>9.3f}")
+    print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -26,7 +26,7 @@ from src.rag.pipeline import RAGPipeline
 from src.llm.fake import FakeLLMClient
 from src.prompts.prompt_builder import PromptBuilder
 
-from src.search.semantic_search import semantic_search
+from src.search.semantic_search import semantic_search, semantic_search_many
 from src.search.vector_search import get_store
 from src.search.reranker import LocalSimpleRanker
 
@@ -58,10 +58,23 @@ class Retriever:
         self.store = store or get_store()
         self.top_k = top_k
         self.min_score = min_score
+        self._prefetched = {}  # (query, top_k) -> [(text, score)]
+
+    def prefetch(self, queries, top_k: int = None):
+        """
+        Searches all queries in one batch (one embed call, one vector
+        query); later search() calls for them are lookups.
+        """
+        top_k = top_k or self.top_k
+        results = semantic_search_many(list(queries), store=self.store, top_k=top_k)
+        for query, res in zip(queries, results):
+            self._prefetched[(query, top_k)] = res
 
     def search(self, query: str, top_k: int = None):
         top_k = top_k or self.top_k
-        results = semantic_search(query, store=self.store, top_k=top_k)
+        results = self._prefetched.get((query, top_k))
+        if results is None:
+            results = semantic_search(query, store=self.store, top_k=top_k)
 
         docs = []
         for i, (text, score) in enumerate(results):
@@ -91,6 +104,15 @@ def load_dataset(path: str):
 def evaluate_pipeline(pipeline, retriever, reranker, dataset, top_k=5):
     results = []
 
+    # -------- Batched retrieval --------
+    # One embed + one vector query for the whole dataset instead of one
+    # per sample; per-query retrieval latency is the amortized share
+    prefetch_ms = 0.0
+    if hasattr(retriever, "prefetch") and dataset:
+        t0 = time.perf_counter()
+        retriever.prefetch([sample["query"] for sample in dataset], top_k=top_k)
+        prefetch_ms = (time.perf_counter() - t0) * 1000 / len(dataset)
+
     for sample in dataset:
         query = sample["query"]
         gold_docs = sample.get("relevant_docs", [])
@@ -116,10 +138,10 @@ def evaluate_pipeline(pipeline, retriever, reranker, dataset, top_k=5):
             "precision@k": precision_at_k(retrieved_texts, gold_docs, k=top_k),
             "recall@k": recall_at_k(retrieved_texts, gold_docs, k=top_k),
             "rag_quality": keyword_overlap_score(answer, expected_answer),
-            "latency_retrieval_ms": (t1 - t0) * 1000,
+            "latency_retrieval_ms": prefetch_ms + (t1 - t0) * 1000,
             "latency_rerank_ms": (t2 - t1) * 1000,
             "latency_llm_ms": (t3 - t2) * 1000,
-            "latency_total_ms": (t3 - t0) * 1000,
+            "latency_total_ms": prefetch_ms + (t3 - t0) * 1000,
         })
 
     return results
@@ -0,0 +1,41 @@
+# scripts/build_bm25_index.py
+import sys, os
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import argparse
+import time
+
+from src.config import CHROMA_DIR
+from src.vectorstore.factory import create_vector_store
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="(Re)build the BM25 index of an existing collection from its stored documents"
+    )
+    parser.add_argument("--persist_dir", default=CHROMA_DIR, help="Chroma DB folder")
+    parser.add_argument("--page_size", type=int, default=1000)
+    args = parser.parse_args()
+
+    store = create_vector_store(persist_dir=args.persist_dir, bm25=True)
+    total = store.collection.count()
+
+    start = time.perf_counter()
+    store.bm25_index.clear()
+
+    offset = 0
+    while True:
+        page = store.collection.get(limit=args.page_size, offset=offset, include=["documents"])
+        if not page["ids"]:
+            break
+        store.bm25_index.add(page["ids"], page["documents"])
+        offset += len(page["ids"])
+        print(f"  {offset}/{total}")
+
+    print(f"\nIndexed {len(store.bm25_index)} documents of {store.collection.name} "
+          f"in {time.perf_counter() - start:.1f}s ({store.bm25_index.path})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# scripts/compress_index.py
+import sys, os
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import argparse
+import time
+
+import numpy as np
+
+from src.config import CHROMA_DIR, VECTOR_COMPRESSION, VECTOR_DIM, VECTOR_FLOAT16
+from src.vectorstore.factory import create_vector_store
+
+
+def iter_pages(collection, page_size: int):
+    """
+    (ids, embeddings, documents, metadatas) pages of a whole collection.
+    """
+    offset = 0
+    while True:
+        page = collection.get(
+            limit=page_size,
+            offset=offset,
+            include=["embeddings", "documents", "metadatas"],
+        )
+        if not page["ids"]:
+            return
+        yield page["ids"], np.asarray(page["embeddings"], dtype=np.float32), page["documents"], page["metadatas"]
+        offset += len(page["ids"])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build a compressed copy of the full-size Chroma collection (no re-embedding)"
+    )
+    parser.add_argument("--persist_dir", default=CHROMA_DIR, help="Chroma DB folder")
+    parser.add_argument("--method", default=VECTOR_COMPRESSION if VECTOR_COMPRESSION != "none" else "pca",
+                        choices=["pca", "truncate"])
+    parser.add_argument("--dim", type=int, default=VECTOR_DIM)
+    parser.add_argument("--float16", action="store_true", default=VECTOR_FLOAT16)
+    parser.add_argument("--sample", type=int, default=20000, help="Vectors used to fit PCA")
+    parser.add_argument("--page_size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    source = create_vector_store(persist_dir=args.persist_dir, compression="none")
+    total = source.collection.count()
+    if not total:
+        print("Source collection is empty; ingest documents first.")
+        return
+
+    target = create_vector_store(
+        persist_dir=args.persist_dir,
+        embedder=source.embedder,
+        compression=args.method,
+        compression_dim=args.dim,
+        float16=args.float16,
+    )
+
+    # -----------------------------
+    # Fit on a uniform sample of the corpus
+    # -----------------------------
+    start = time.perf_counter()
+    rng = np.random.default_rng(args.seed)
+    keep = set(rng.choice(total, size=min(args.sample, total), replace=False).tolist())
+
+    sample, position = [], 0
+    for _, vectors, _, _ in iter_pages(source.collection, args.page_size):
+        rows = [i for i in range(len(vectors)) if position + i in keep]
+        sample.append(vectors[rows])
+        position += len(vectors)
+
+    target.fit_compressor(np.concatenate(sample))
+    print(f"Fitted {args.method}→{args.dim} on {len(keep)} vectors in {time.perf_counter() - start:.1f}s "
+          f"({target.compressor_path})")
+
+    # -----------------------------
+    # Copy, compressing the stored vectors
+    # -----------------------------
+    written = 0
+    for ids, vectors, documents, metadatas in iter_pages(source.collection, args.page_size):
+        target.upsert(ids=ids, documents=documents, metadatas=metadatas, embeddings=vectors)
+        written += len(ids)
+        print(f"  {written}/{total}")
+
+    full_bytes = source.collection.count() * vectors.shape[1] * 4
+    compressed_bytes = target.collection.count() * target.compressor.bytes_per_vector()
+
+    print("\n==============================")
+    print("SUMMARY")
+    print("==============================")
+    print(f"Collection:   {target.collection.name} ({target.collection.count()} vectors)")
+    print(f"Vector bytes: {full_bytes / 1e6:.1f} MB → {compressed_bytes / 1e6:.1f} MB")
+    print(f"Elapsed:      {time.perf_counter() - start:.1f}s")
+    print(f"\nSet VECTOR_COMPRESSION={args.method} VECTOR_DIM={args.dim}"
+          f"{' VECTOR_FLOAT16=true' if args.float16 else ''} to query it.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,86 @@
 #!/usr/bin/env python3
 # scripts/data-prep.py
 import argparse
+from src.data_prep.batch import prepare_many, resolve_inputs
 from src.data_prep.pipeline import prepare_data
-from src.data_prep.saver import save_chunks
+from src.data_prep.saver import save_chunks, save_chunks_binary
 import os, json
 
+def print_progress(stats, done, total):
+    if stats["error"]:
+        print(f"[{done}/{total}] FAILED {stats['input']}: {stats['error']}")
+    else:
+        print(
+            f"[{done}/{total}] {stats['input']} → {stats['output']} "
+            f"({stats['chunks']} chunks, {stats['seconds']:.2f}s)"
+        )
+
 def main():
     parser = argparse.ArgumentParser()
-    parser.add_argument("input", help="Input file path (txt/docx/pdf)")
+    parser.add_argument("input", help="Input file, directory or glob (txt/docx/pdf)")
     parser.add_argument("--chunk_size", type=int, default=600)
     parser.add_argument("--overlap", type=int, default=50)
-    parser.add_argument("--output", default=None, help="Output json path (optional)")
+    parser.add_argument("--output", default=None, help="Output json path (optional, single file only)")
+    parser.add_argument("--output_dir", default="data/chunks", help="Output folder for batch runs")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk_mode", choices=["chars", "tokens"], default="chars",
+                        help="Measure chunks in characters or embedding-model tokens")
+    parser.add_argument("--token_budget", type=int, default=None,
+                        help="Max tokens per chunk in tokens mode (default: model max length)")
+    parser.add_argument("--format", choices=["json", "bin"], default="json",
+                        help="json array or memory-mappable binary chunk store (*.chunks)")
 
     args = parser.parse_args()
 
-    chunks = prepare_data(args.input, chunk_size=args.chunk_size, overlap=args.overlap)
+    # Single file with explicit output keeps the original behaviour
+    if args.output and os.path.isfile(args.input):
+        chunks = prepare_data(
+            args.input,
+            chunk_size=args.chunk_size,
+            overlap=args.overlap,
+            chunk_mode=args.chunk_mode,
+            token_budget=args.token_budget,
+        )
+        if args.format == "bin":
+            save_chunks_binary(chunks, args.output, source=args.input)
+        else:
+            save_chunks(chunks, args.output)
+        print("Saved chunks:", args.output)
+        return
+
+    if args.output:
+        parser.error("--output only applies to a single input file; use --output_dir for directories and globs")
+
+    inputs = resolve_inputs(args.input)
+    if not inputs:
+        print("No supported input files found:", args.input)
+        return
 
-    out = args.output
-    if not out:
-        base = os.path.splitext(os.path.basename(args.input))[0]
-        out = f"data/chunks/{base}.json"
+    try:
+        summary = prepare_many(
+            inputs,
+            output_dir=args.output_dir,
+            chunk_size=args.chunk_size,
+            overlap=args.overlap,
+            workers=args.workers,
+            on_result=print_progress,
+            chunk_mode=args.chunk_mode,
+            token_budget=args.token_budget,
+            output_format=args.format,
+        )
+    except ValueError as e:
+        parser.error(str(e))
 
-    save_chunks(chunks, out)
-    print("Saved chunks:", out)
+    print("\n==============================")
+    print("SUMMARY")
+    print("==============================")
+    print(f"Files: {summary['succeeded']}/{summary['files']} ok, {summary['failed']} failed")
+    print(f"Chunks: {summary['chunks']}")
+    print(f"Time: {summary['seconds']:.2f}s")
+    print(
+        f"Throughput: {summary['files_per_s']:.2f} files/s, "
+        f"{summary['mb_per_s']:.2f} MB/s, {summary['chunks_per_s']:.1f} chunks/s"
+    )
 
 if __name__ == "__main__":
     main()
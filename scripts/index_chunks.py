@@ -0,0 +1,74 @@
+# scripts/index_chunks.py
+import sys, os
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import argparse
+from src.config import CHROMA_DIR
+from src.vectorstore.factory import create_vector_store
+from src.embedder.process_pool import ProcessPoolEmbedder
+from src.vectorstore.pipeline import index_chunks
+
+
+def print_stats(snapshot):
+    parts = [
+        f"{s['name']}: {s['units_out']} chunks, {s['units_per_s']:.1f}/s, q={s['queue_depth']}"
+        for s in snapshot["stages"]
+    ]
+    print(f"[{snapshot['elapsed_seconds']:.1f}s] " + " | ".join(parts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream saved chunks (data/chunks) into Chroma, resumably")
+    parser.add_argument("chunks_folder", nargs="?", default="data/chunks")
+    parser.add_argument("--persist_dir", default=CHROMA_DIR, help="Chroma DB folder")
+    parser.add_argument("--batch_size", type=int, default=256, help="Chunks per embedding batch")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and index everything")
+    parser.add_argument("--embed_workers", type=int, default=0,
+                        help="Embedding processes, each with its own model (0 = embed in this process)")
+    parser.add_argument("--embed_threads", type=int, default=None,
+                        help="Torch threads per embedding process (default: CPUs / embed_workers)")
+    args = parser.parse_args()
+
+    store = create_vector_store(persist_dir=args.persist_dir)
+
+    embedder = None
+    if args.embed_workers > 0:
+        embedder = ProcessPoolEmbedder(
+            store.embedder_name,
+            workers=args.embed_workers,
+            threads_per_worker=args.embed_threads,
+            shard_size=max(1, args.batch_size // args.embed_workers),
+        )
+        print(f"Starting {embedder.workers} embedding processes × {embedder.threads_per_worker} threads...")
+        print(f"Embedding processes ready in {embedder.warm_up():.1f}s")
+
+    try:
+        stats = index_chunks(
+            args.chunks_folder,
+            store=store,
+            embedder=embedder,
+            batch_size=args.batch_size,
+            embed_workers=max(1, args.embed_workers),
+            restart=args.restart,
+            on_stats=print_stats,
+        )
+    finally:
+        if embedder:
+            embedder.close()
+
+    print("\n==============================")
+    print("SUMMARY")
+    print("==============================")
+    print(f"Chunk files:     {stats['files']} ({stats['files_skipped']} already indexed)")
+    print(f"Chunks written:  {stats['chunks_written']} ({stats['chunks_skipped']} resumed past)")
+    print(f"Throughput:      {stats['chunks_per_s']:.1f} chunks/s in {stats['seconds']:.2f}s")
+    if "padding_efficiency" in stats:
+        print(f"Padding:         {stats['padding_efficiency']:.1%} of encoded token slots are real tokens")
+    if stats.get("errors"):
+        print(f"Errors:          {stats['errors']} (last: {stats['last_error']}); rerun to resume")
+    print(f"Collection size: {store.collection.count()}")
+
+
+if __name__ == "__main__":
+    main()
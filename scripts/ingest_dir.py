@@ -0,0 +1,104 @@
+# scripts/ingest_dir.py
+import sys, os
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import argparse
+from src.config import CHROMA_DIR
+from src.data_prep.batch import resolve_inputs
+from src.vectorstore.factory import create_vector_store
+from src.embedder.process_pool import ProcessPoolEmbedder
+from src.embedder.bucketing import ingest_padding_stats
+from src.vectorstore.staged_pipeline import build_ingest_pipeline
+
+
+def print_stats(snapshot):
+    parts = [
+        f"{s['name']}: {s['units_out']} chunks, {s['units_per_s']:.1f}/s, "
+        f"q={s['queue_depth']}, util={s['utilization']:.0%}"
+        for s in snapshot["stages"]
+    ]
+    print(f"[{snapshot['elapsed_seconds']:.1f}s] " + " | ".join(parts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-load raw documents into Chroma")
+    parser.add_argument("input", help="Input file, directory or glob (txt/docx/pdf)")
+    parser.add_argument("--persist_dir", default=CHROMA_DIR, help="Chroma DB folder")
+    parser.add_argument("--chunk_size", type=int, default=500, help="Same as uploads, so both share chunk ids")
+    parser.add_argument("--overlap", type=int, default=50)
+    parser.add_argument("--batch_size", type=int, default=64, help="Chunks per embedding batch")
+    parser.add_argument("--parse_workers", type=int, default=2)
+    parser.add_argument("--queue_size", type=int, default=8, help="Max batches buffered between stages")
+    parser.add_argument("--embed_workers", type=int, default=0,
+                        help="Embedding processes, each with its own model (0 = embed in this process)")
+    parser.add_argument("--embed_threads", type=int, default=None,
+                        help="Torch threads per embedding process (default: CPUs / embed_workers)")
+    args = parser.parse_args()
+
+    inputs = resolve_inputs(args.input)
+    if not inputs:
+        print("No supported input files found:", args.input)
+        return
+
+    store = create_vector_store(persist_dir=args.persist_dir)
+
+    embedder = None
+    if args.embed_workers > 0:
+        embedder = ProcessPoolEmbedder(
+            store.embedder_name,
+            workers=args.embed_workers,
+            threads_per_worker=args.embed_threads,
+            shard_size=args.batch_size,
+        )
+        print(f"Starting {embedder.workers} embedding processes × {embedder.threads_per_worker} threads...")
+        print(f"Embedding processes ready in {embedder.warm_up():.1f}s")
+
+    pipeline = build_ingest_pipeline(
+        store,
+        embedder=embedder,
+        batch_size=args.batch_size,
+        chunk_size=args.chunk_size,
+        overlap=args.overlap,
+        parse_workers=args.parse_workers,
+        queue_size=args.queue_size,
+        embed_workers=max(1, args.embed_workers),
+        # Sources named like uploads: relative to the input directory
+        root=os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in inputs]),
+    )
+
+    try:
+        snapshot = pipeline.run(inputs, on_stats=print_stats)
+    finally:
+        if embedder:
+            embedder.close()
+
+    print("\n==============================")
+    print("SUMMARY")
+    print("==============================")
+    for s in snapshot["stages"]:
+        print(
+            f"{s['name']:>6}: in={s['items_in']} out={s['items_out']} chunks={s['units_out']} errors={s['errors']} "
+            f"max_queue={s['queue_max_depth']} util={s['utilization']:.0%}"
+        )
+        if s["last_error"]:
+            print(f"        last error: {s['last_error']}")
+
+    write = snapshot["stages"][-1]
+    print(f"\nChunks written: {write['units_out']} in {snapshot['elapsed_seconds']:.2f}s "
+          f"({write['units_per_s']:.1f} chunks/s)")
+    if embedder:
+        pool = embedder.stats()
+        print(f"Embedding pool: {pool['texts']} chunks, {pool['chunks_per_s']:.1f} chunks/s")
+    padding = ingest_padding_stats()
+    if padding:
+        print(f"Padding:        {padding['padding_efficiency']:.1%} of encoded token slots are real tokens "
+              f"(unsorted: {padding['unsorted_efficiency']:.1%})")
+    counts = pipeline.ingest_stats
+    print(f"Unchanged: {counts['unchanged']}, near-duplicates skipped: {counts['near_duplicates']}, "
+          f"stale chunks deleted: {counts['deleted']}")
+    print(f"Collection size: {store.collection.count()}")
+
+
+if __name__ == "__main__":
+    main()
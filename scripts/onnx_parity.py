@@ -0,0 +1,62 @@
+# scripts/onnx_parity.py
+import sys, os
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import argparse
+import time
+from src.embedder.factory import create_embedder
+from src.embedder.onnx_embedder import check_parity
+
+SAMPLE_TEXTS = [
+    "What is retrieval-augmented generation?",
+    "Vector databases store embeddings for similarity search.",
+    "LinkedIn posts perform best when they open with a clear hook.",
+    "Chunking splits long documents into passages the model can embed.",
+    "ONNX Runtime executes exported models without PyTorch.",
+    "Cosine similarity compares the direction of two vectors.",
+    "A short query",
+    "A much longer passage that goes on to describe, in some detail, how the ingestion "
+    "pipeline parses files, cleans their text, splits it into sections and embeds them.",
+]
+
+
+def timed_embed(embedder, texts, repeats=20):
+    embedder.embed(texts)  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        embedder.embed(texts)
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare an ONNX embedding backend against PyTorch")
+    parser.add_argument("--backend", default="minilm-onnx-int8", help="ONNX embedder alias")
+    parser.add_argument("--reference", default="minilm", help="PyTorch embedder alias")
+    parser.add_argument("--min_cosine", type=float, default=0.99, help="Fail below this cosine")
+    args = parser.parse_args()
+
+    onnx_embedder = create_embedder(args.backend, cache=False)
+    reference = create_embedder(args.reference, cache=False)
+
+    report = check_parity(onnx_embedder, reference, SAMPLE_TEXTS)
+
+    print("\n========== PARITY ==========")
+    print(f"Backend:       {args.backend} ({onnx_embedder.model_path})")
+    print(f"Reference:     {args.reference}")
+    print(f"Min cosine:    {report['min_cosine']:.5f}")
+    print(f"Mean cosine:   {report['mean_cosine']:.5f}")
+    print(f"Max abs diff:  {report['max_abs_diff']:.5f}")
+    print(f"Batch latency: {timed_embed(onnx_embedder, SAMPLE_TEXTS) * 1000:.1f} ms (onnx) vs "
+          f"{timed_embed(reference, SAMPLE_TEXTS) * 1000:.1f} ms (torch)")
+    print("============================\n")
+
+    if report["min_cosine"] < args.min_cosine:
+        print(f"❌ Parity check failed: min cosine below {args.min_cosine}")
+        sys.exit(1)
+
+    print("✅ Parity check passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# src/api/jobs.py
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from typing import Callable, Optional
+
+from src.config import UPLOAD_WORKERS, MAX_TRACKED_JOBS
+
+
+@dataclass
+class IngestJob:
+    """
+    Progress record for one background ingestion job.
+    Fields are updated by the worker thread and read by the API.
+    """
+    id: str
+    filename: str
+    status: str = "queued"  # queued | running | done | failed
+    pages_parsed: int = 0
+    chunks_created: int = 0
+    chunks_embedded: int = 0
+    chunks_written: int = 0
+    chunks_unchanged: int = 0
+    chunks_deleted: int = 0
+    chunks_near_duplicate: int = 0
+    files_total: int = 0
+    files_parsed: int = 0
+    files_failed: int = 0
+    file_errors: dict = field(default_factory=dict)
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class JobQueue:
+    """
+    Runs ingestion jobs on a worker pool, off the event loop.
+
+    Only the most recent `max_jobs` jobs are tracked; the oldest
+    finished jobs are forgotten first.
+    """
+
+    def __init__(self, workers: int = UPLOAD_WORKERS, max_jobs: int = MAX_TRACKED_JOBS):
+        self.max_jobs = max_jobs
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingest")
+        self._jobs: "OrderedDict[str, IngestJob]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, filename: str, fn: Callable, *args) -> IngestJob:
+        """
+        Queues fn(job, *args) and returns the job immediately.
+        """
+        job = IngestJob(id=uuid.uuid4().hex, filename=filename)
+
+        with self._lock:
+            self._jobs[job.id] = job
+            self._evict()
+
+        self._executor.submit(self._run, job, fn, *args)
+        return job
+
+    def get(self, job_id: str) -> Optional[IngestJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job: IngestJob, fn: Callable, *args):
+        job.status = "running"
+        job.started_at = time.time()
+
+        try:
+            fn(job, *args)
+            job.status = "done"
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+
+    def _evict(self):
+        if len(self._jobs) <= self.max_jobs:
+            return
+
+        for job_id in [j.id for j in self._jobs.values() if j.finished_at]:
+            del self._jobs[job_id]
+            if len(self._jobs) <= self.max_jobs:
+                break
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
@@ -1,27 +1,124 @@
 # src/api/main.py
-from fastapi import FastAPI, UploadFile, File, HTTPException
+import base64
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import List
+import numpy as np
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request
+from fastapi.responses import JSONResponse, Response
 from src.api.schemas import AskRequest, AskResponse
 from src.rag.factory import create_rag_pipeline
-from src.embedder.factory import create_embedder
-from src.api.schemas import EmbeddingRequest, EmbeddingResponse, UploadResponse
-from src.utils import ingest_text, extract_text_from_pdf_bytes, clean_text
-from src.config import EMBEDDING_MODEL_NAME
-
-app = FastAPI(title="RAG API")
+from src.embedder.shared import get_shared_embedder, loaded_models
+from src.search.result_cache import get_query_cache
+from src.embedder.bucketing import ingest_padding_stats
+from src.api.schemas import (
+    EmbeddingRequest,
+    EmbeddingResponse,
+    EmbeddingBatchRequest,
+    EmbeddingBatchResponse,
+    UploadJobResponse,
+    JobStatusResponse,
+)
+from src.api.jobs import JobQueue
+from src.api.uploads import is_supported_upload, is_archive, run_upload_job, run_batch_upload_job
+from src.config import (
+    EMBEDDING_MODEL_NAME,
+    EMBEDDING_MICRO_BATCH_ENABLED,
+    API_WARMUP,
+    EMBEDDING_BATCH_MAX_TEXTS,
+)
 
 # ---------------------------------------
-# SINGLETONS (must be defined FIRST)
+# SHARED MODELS (loaded lazily, once per process)
 # ---------------------------------------
-embedder = create_embedder(EMBEDDING_MODEL_NAME)
-rag_pipeline = create_rag_pipeline()
+_rag_pipeline = None
+_rag_lock = threading.Lock()
+_warmup = {"started_at": None, "finished_at": None, "error": None}
+
+def get_embedder():
+    # One embedder for /embedding, /ask queries and uploads, so concurrent
+    # requests share a model and get micro-batched together
+    return get_shared_embedder(EMBEDDING_MODEL_NAME, micro_batch=EMBEDDING_MICRO_BATCH_ENABLED)
+
+def get_rag_pipeline():
+    global _rag_pipeline
+    with _rag_lock:
+        if _rag_pipeline is None:
+            _rag_pipeline = create_rag_pipeline(embedder=get_embedder())
+        return _rag_pipeline
+
+def warm_up():
+    """
+    Loads the models and runs one embedding so the first real request
+    doesn't pay for it. /ready reports when this has finished.
+    """
+    _warmup["started_at"] = time.time()
+    try:
+        get_embedder().embed(["warm-up"])
+        get_rag_pipeline()
+    except Exception as e:
+        _warmup["error"] = f"{type(e).__name__}: {e}"
+        print("⚠️ Warm-up failed:", _warmup["error"])
+    finally:
+        _warmup["finished_at"] = time.time()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm up in the background so the server accepts connections
+    # (and answers /ready with 503) while models load
+    if API_WARMUP:
+        threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+    yield
+
+app = FastAPI(title="RAG API", lifespan=lifespan)
+
+upload_jobs = JobQueue()
+
+def _run_with_models(job, fn, *args):
+    # Resolved on the job thread, so the request never waits for a model load
+    fn(job, *args, get_embedder(), get_rag_pipeline().retriever.store)
 
 @app.get("/")
 def root():
     return {"message": "LinkedIn RAG API is running"}
 
+@app.get("/ready")
+def ready():
+    """
+    200 once models are loaded and warm, 503 until then. With warm-up
+    disabled models load lazily on first use, so the API is always ready.
+    """
+    is_ready = _warmup["finished_at"] is not None and _warmup["error"] is None
+    if not API_WARMUP:
+        is_ready = True
+
+    body = {
+        "ready": is_ready,
+        "models": loaded_models(),
+        "warmup_seconds": (
+            _warmup["finished_at"] - _warmup["started_at"]
+            if _warmup["finished_at"] else None
+        ),
+        "error": _warmup["error"],
+    }
+    return JSONResponse(body, status_code=200 if is_ready else 503)
+
+@app.get("/stats")
+def stats():
+    """
+    Cache hit rates and sizes, and padding efficiency of ingest
+    embedding (length bucketing).
+    """
+    cache = get_query_cache()
+    return {
+        "query_cache": cache.stats() if cache else None,
+        "ingest_padding": ingest_padding_stats(),
+    }
+
 @app.post("/ask", response_model=AskResponse)
 def ask(request: AskRequest):
-    return rag_pipeline.run_with_context(
+    return get_rag_pipeline().run_with_context(
         query=request.query,
         top_k=request.top_k,
         use_rerank=request.use_rerank,
@@ -29,42 +126,107 @@ def ask(request: AskRequest):
 
 @app.post("/embedding", response_model=EmbeddingResponse)
 def embedding(req: EmbeddingRequest):
+    embedder = get_embedder()
     vectors = embedder.embed([req.text])  # batch
     vector = vectors[0]                   # single embedding
 
     return EmbeddingResponse(
-        embedding=vector,
+        embedding=vector.tolist(),            # lists only at the JSON boundary
         dimensions=len(vector),
         model=embedder.model_name,
     )
 
-@app.post("/upload", response_model=UploadResponse)
-async def upload(file: UploadFile = File(...)):
-    filename = file.filename.lower()
-    data = await file.read()
+@app.post("/embedding/batch", response_model=EmbeddingBatchResponse)
+def embedding_batch(req: EmbeddingBatchRequest, request: Request):
+    if len(req.texts) > EMBEDDING_BATCH_MAX_TEXTS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {EMBEDDING_BATCH_MAX_TEXTS} texts per request, got {len(req.texts)}",
+        )
+    if any(not text for text in req.texts):
+        raise HTTPException(status_code=422, detail="Texts must be non-empty")
 
-    if filename.endswith(".txt"):
-        text = clean_text(data.decode("utf-8"))
+    embedder = get_embedder()
+    vectors = np.asarray(embedder.embed(req.texts), dtype="<f4")  # one batched call
+    count, dimensions = vectors.shape
 
-    elif filename.endswith(".pdf"):
-        text = extract_text_from_pdf_bytes(data)
+    if req.encoding == "binary" or "application/octet-stream" in request.headers.get("accept", ""):
+        return Response(
+            content=vectors.tobytes(),
+            media_type="application/octet-stream",
+            headers={
+                "X-Embedding-Model": embedder.model_name,
+                "X-Embedding-Count": str(count),
+                "X-Embedding-Dimensions": str(dimensions),
+                "X-Embedding-Dtype": "float32-le",
+            },
+        )
 
+    body = {"model": embedder.model_name, "count": count, "dimensions": dimensions, "dtype": "float32"}
+    if req.encoding == "base64":
+        body["embeddings_base64"] = base64.b64encode(vectors.tobytes()).decode("ascii")
     else:
+        body["embeddings"] = vectors.tolist()
+
+    # Built directly: validating thousands of floats through the
+    # response model costs more than the embedding itself
+    return JSONResponse(body)
+
+@app.post("/upload", response_model=UploadJobResponse, status_code=202)
+async def upload(file: UploadFile = File(...)):
+    if not is_supported_upload(file.filename):
         raise HTTPException(
             status_code=400,
             detail="Only .txt and .pdf files are supported",
         )
 
-    chunks_created = ingest_text(
-        text=text,
-        filename=file.filename,
-        embedder=embedder,
-        vector_store=rag_pipeline.retriever.store,
+    data = await file.read()
+
+    # Parsing, embedding and writing are blocking → run on the job pool
+    job = upload_jobs.submit(
+        file.filename,
+        _run_with_models,
+        run_upload_job,
+        file.filename,
+        data,
     )
 
-    return UploadResponse(
-        status="success",
+    return UploadJobResponse(
+        job_id=job.id,
+        status=job.status,
         filename=file.filename,
-        chunks_created=chunks_created,
-        collection="default",
     )
+
+@app.post("/upload/batch", response_model=UploadJobResponse, status_code=202)
+async def upload_batch(files: List[UploadFile] = File(...)):
+    for file in files:
+        if not (is_supported_upload(file.filename) or is_archive(file.filename)):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unsupported file: {file.filename} (expected .txt, .pdf, .zip, .tar or .tar.gz)",
+            )
+
+    uploads = [(file.filename, await file.read()) for file in files]
+    label = files[0].filename if len(files) == 1 else f"{len(files)} files"
+
+    # Archive expansion, parsing, embedding and writing all run on the job pool
+    job = upload_jobs.submit(
+        label,
+        _run_with_models,
+        run_batch_upload_job,
+        uploads,
+    )
+
+    return UploadJobResponse(
+        job_id=job.id,
+        status=job.status,
+        filename=label,
+    )
+
+@app.get("/jobs/{job_id}", response_model=JobStatusResponse)
+def job_status(job_id: str):
+    job = upload_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return JobStatusResponse(job_id=job.id, **job.to_dict())
@@ -1,6 +1,6 @@
 # src/api/schemas.py
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict
+from typing import List, Literal, Optional, Dict
 
 
 class AskRequest(BaseModel):
@@ -28,8 +28,41 @@ class EmbeddingResponse(BaseModel):
 class EmbeddingRequest(BaseModel):
     text: str = Field(..., min_length=1)
 
-class UploadResponse(BaseModel):
+class EmbeddingBatchRequest(BaseModel):
+    texts: List[str] = Field(..., min_length=1)
+    # json: nested arrays; base64: little-endian float32 matrix as one
+    # string; binary: the raw matrix as application/octet-stream
+    encoding: Literal["json", "base64", "binary"] = "json"
+
+class EmbeddingBatchResponse(BaseModel):
+    model: str
+    count: int
+    dimensions: int
+    dtype: str = "float32"
+    embeddings: Optional[List[List[float]]] = None
+    embeddings_base64: Optional[str] = None
+
+class UploadJobResponse(BaseModel):
+    job_id: str
+    status: str
+    filename: str
+
+class JobStatusResponse(BaseModel):
+    job_id: str
     status: str
     filename: str
-    chunks_created: int
-    collection: str
+    pages_parsed: int = 0
+    chunks_created: int = 0
+    chunks_embedded: int = 0
+    chunks_written: int = 0
+    chunks_unchanged: int = 0
+    chunks_deleted: int = 0
+    chunks_near_duplicate: int = 0
+    files_total: int = 0
+    files_parsed: int = 0
+    files_failed: int = 0
+    file_errors: Dict[str, str] = {}
+    error: Optional[str] = None
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
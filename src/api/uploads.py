@@ -0,0 +1,210 @@
+# src/api/uploads.py
+import io
+import posixpath
+import tarfile
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+from src.api.jobs import IngestJob
+from src.config import (
+    BATCH_UPLOAD_PARSE_WORKERS,
+    BATCH_UPLOAD_EMBED_BATCH_SIZE,
+    BATCH_UPLOAD_MAX_FILES,
+    BATCH_UPLOAD_MAX_BYTES,
+)
+from src.utils import (
+    ingest_text_incremental,
+    ingest_documents_incremental,
+    extract_text_from_pdf_bytes,
+    clean_text,
+)
+
+SUPPORTED_UPLOAD_EXTENSIONS = (".txt", ".pdf")
+ARCHIVE_EXTENSIONS = (".zip", ".tar", ".tar.gz", ".tgz")
+
+
+def is_supported_upload(filename: str) -> bool:
+    return filename.lower().endswith(SUPPORTED_UPLOAD_EXTENSIONS)
+
+
+def is_archive(filename: str) -> bool:
+    return filename.lower().endswith(ARCHIVE_EXTENSIONS)
+
+
+def extract_upload_text(filename: str, data: bytes, on_page=None) -> str:
+    """
+    Decodes an uploaded .txt or .pdf file into cleaned text.
+    """
+    name = filename.lower()
+
+    if name.endswith(".txt"):
+        return clean_text(data.decode("utf-8"))
+
+    if name.endswith(".pdf"):
+        return extract_text_from_pdf_bytes(data, on_page=on_page)
+
+    raise ValueError(f"Unsupported upload type: {filename}")
+
+
+def run_upload_job(job: IngestJob, filename: str, data: bytes, embedder, vector_store):
+    """
+    Background body of POST /upload: extract → chunk → embed → write,
+    reporting progress on the job as it goes.
+    """
+
+    def on_page(pages_parsed: int):
+        job.pages_parsed = pages_parsed
+
+    def on_progress(stats: dict):
+        job.chunks_created = stats["chunks"]
+        job.chunks_embedded = stats["embedded"]
+        job.chunks_written = stats["added"]
+        job.chunks_unchanged = stats["unchanged"]
+        job.chunks_near_duplicate = stats["near_duplicates"]
+
+    text = extract_upload_text(filename, data, on_page=on_page)
+
+    stats = ingest_text_incremental(
+        text=text,
+        filename=filename,
+        embedder=embedder,
+        vector_store=vector_store,
+        on_progress=on_progress,
+    )
+
+    on_progress(stats)
+    job.chunks_deleted = stats["deleted"]
+
+
+# ============================================================
+# Batch uploads
+# ============================================================
+
+def _is_document_member(name: str) -> bool:
+    base = posixpath.basename(name)
+    # Skip macOS resource forks and other hidden files
+    if not base or base.startswith(".") or name.startswith("__MACOSX/"):
+        return False
+    return is_supported_upload(name)
+
+
+def _iter_archive(filename: str, data: bytes):
+    """
+    Yields (member_name, size, read) for every regular file in a
+    .zip or .tar(.gz) archive; read() returns the member's bytes.
+    """
+    if filename.lower().endswith(".zip"):
+        archive = zipfile.ZipFile(io.BytesIO(data))
+        for info in archive.infolist():
+            if not info.is_dir():
+                yield info.filename, info.file_size, lambda info=info: archive.read(info)
+        return
+
+    archive = tarfile.open(fileobj=io.BytesIO(data), mode="r:*")
+    for member in archive.getmembers():
+        # Regular files only: no links, devices or directories
+        if member.isfile():
+            yield member.name, member.size, lambda member=member: archive.extractfile(member).read()
+
+
+def expand_uploads(
+    uploads: list[tuple[str, bytes]],
+    max_files: int = BATCH_UPLOAD_MAX_FILES,
+    max_bytes: int = BATCH_UPLOAD_MAX_BYTES,
+) -> list[tuple[str, bytes]]:
+    """
+    Flattens uploaded files and archives into (filename, data) documents.
+    Archive members keep their path inside the archive as filename;
+    unsupported members are skipped. If a filename appears twice, the
+    last one wins. Raises ValueError past max_files or max_bytes
+    (uncompressed), checked before anything is decompressed.
+    """
+    documents = {}
+    total_bytes = 0
+
+    def take(name: str, size: int, read):
+        nonlocal total_bytes
+
+        total_bytes += size
+        if total_bytes > max_bytes:
+            raise ValueError(f"Batch upload exceeds {max_bytes} bytes")
+
+        documents.pop(name, None)
+        documents[name] = read()
+        if len(documents) > max_files:
+            raise ValueError(f"Batch upload exceeds {max_files} files")
+
+    for filename, data in uploads:
+        if is_archive(filename):
+            for name, size, read in _iter_archive(filename, data):
+                name = posixpath.normpath(name).lstrip("/")
+                if _is_document_member(name):
+                    take(name, size, read)
+        elif is_supported_upload(filename):
+            take(filename, len(data), lambda data=data: data)
+        else:
+            raise ValueError(f"Unsupported upload type: {filename}")
+
+    return list(documents.items())
+
+
+def run_batch_upload_job(
+    job: IngestJob,
+    uploads: list[tuple[str, bytes]],
+    embedder,
+    vector_store,
+    parse_workers: int = BATCH_UPLOAD_PARSE_WORKERS,
+    batch_size: int = BATCH_UPLOAD_EMBED_BATCH_SIZE,
+):
+    """
+    Background body of POST /upload/batch: expand archives, parse all
+    files concurrently, then embed and write the pooled new chunks of
+    every file in large length-sorted batches.
+
+    A file that fails to parse is recorded in job.file_errors and skipped;
+    the job itself only fails if the batch as a whole can't be processed.
+    """
+    documents = expand_uploads(uploads)
+    job.files_total = len(documents)
+
+    lock = threading.Lock()
+
+    def on_page(_pages_parsed: int):
+        with lock:
+            job.pages_parsed += 1
+
+    def parse(document):
+        filename, data = document
+        try:
+            text = extract_upload_text(filename, data, on_page=on_page)
+        except Exception as e:
+            with lock:
+                job.files_failed += 1
+                job.file_errors[filename] = f"{type(e).__name__}: {e}"
+            return None
+
+        with lock:
+            job.files_parsed += 1
+        return filename, text
+
+    with ThreadPoolExecutor(max_workers=max(1, parse_workers), thread_name_prefix="batch-parse") as pool:
+        texts = [parsed for parsed in pool.map(parse, documents) if parsed]
+
+    def on_progress(stats: dict):
+        job.chunks_created = stats["chunks"]
+        job.chunks_embedded = stats["embedded"]
+        job.chunks_written = stats["added"]
+        job.chunks_unchanged = stats["unchanged"]
+        job.chunks_near_duplicate = stats["near_duplicates"]
+
+    stats = ingest_documents_incremental(
+        texts,
+        embedder=embedder,
+        vector_store=vector_store,
+        batch_size=batch_size,
+        on_progress=on_progress,
+    )
+
+    on_progress(stats)
+    job.chunks_deleted = stats["deleted"]
@@ -19,6 +19,14 @@ load_dotenv()
 
 CHROMA_DIR = os.getenv("CHROMA_DIR", "data/chroma")
 
+# Per-page PDF text cache, e.g. data/cache/pdf_pages (off by default:
+# it keeps the text of every parsed PDF, uploads included, on disk)
+PDF_CACHE_DIR = os.getenv("PDF_CACHE_DIR", "")
+
+# Page cache size cap in MB; least recently used documents are evicted
+# (0 = unbounded)
+PDF_CACHE_MAX_MB = float(os.getenv("PDF_CACHE_MAX_MB", 512))
+
 # ============================================================
 # Models
 # ============================================================
@@ -35,6 +43,80 @@ EMBEDDING_MODEL_NAME = os.getenv(
     "minilm"   # alias resolved via embedder factory
 )
 
+# ONNX backends ("minilm-onnx", "minilm-onnx-int8"): exported models are
+# cached here; 0 threads = onnxruntime default (one per physical core)
+ONNX_CACHE_DIR = os.getenv("ONNX_CACHE_DIR", "data/cache/onnx")
+ONNX_INTRA_OP_THREADS = int(os.getenv("ONNX_INTRA_OP_THREADS", 0)) or None
+
+# Embedding cache (in-process LRU + sqlite on disk), keyed by model + text
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "false").lower() == "true"
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", "data/cache/embeddings")
+EMBEDDING_CACHE_MEMORY_ITEMS = int(os.getenv("EMBEDDING_CACHE_MEMORY_ITEMS", 10000))
+EMBEDDING_CACHE_DISK_ITEMS = int(os.getenv("EMBEDDING_CACHE_DISK_ITEMS", 1000000))
+
+# Ingest paths sort each embedding call by token length and encode it in
+# buckets of BUCKET_SIZE texts, so batches aren't padded to one long outlier
+EMBED_LENGTH_BUCKETING = os.getenv("EMBED_LENGTH_BUCKETING", "true").lower() == "true"
+EMBED_BUCKET_SIZE = int(os.getenv("EMBED_BUCKET_SIZE", 32))
+
+# API micro-batching: concurrent embed calls arriving within WAIT_MS are
+# merged into one model call of up to SIZE texts
+EMBEDDING_MICRO_BATCH_ENABLED = os.getenv("EMBEDDING_MICRO_BATCH_ENABLED", "true").lower() == "true"
+EMBEDDING_MICRO_BATCH_SIZE = int(os.getenv("EMBEDDING_MICRO_BATCH_SIZE", 32))
+EMBEDDING_MICRO_BATCH_WAIT_MS = float(os.getenv("EMBEDDING_MICRO_BATCH_WAIT_MS", 5))
+
+# Vector store backend: "chroma" (HNSW, any size) or "numpy" (exact
+# in-process search; best below a few hundred thousand chunks). The numpy
+# index is single-process: a second process opening it fails fast
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "chroma")
+
+# Vector search result cache: (query, top_k, collection, version) → results.
+# Writes bump the collection version (a counter in CHROMA_DIR shared by
+# every process on it), so entries are never served after a write; the
+# TTL only bounds memory use of rarely repeated queries
+QUERY_CACHE_ENABLED = os.getenv("QUERY_CACHE_ENABLED", "true").lower() == "true"
+QUERY_CACHE_MAX_ITEMS = int(os.getenv("QUERY_CACHE_MAX_ITEMS", 10000))
+QUERY_CACHE_TTL_SECONDS = float(os.getenv("QUERY_CACHE_TTL_SECONDS", 3600))
+
+# Hybrid retrieval: RETRIEVER_MODE=hybrid fuses a BM25 inverted index
+# with vector search by reciprocal rank fusion (HYBRID_CANDIDATES per
+# list, RRF_K). The BM25 index is kept next to the collection and updated
+# on every write; it is only maintained in hybrid mode unless BM25_ENABLED
+# says otherwise
+RETRIEVER_MODE = os.getenv("RETRIEVER_MODE", "semantic")
+BM25_ENABLED = os.getenv("BM25_ENABLED", "true" if RETRIEVER_MODE == "hybrid" else "false").lower() == "true"
+HYBRID_CANDIDATES = int(os.getenv("HYBRID_CANDIDATES", 20))
+RRF_K = int(os.getenv("RRF_K", 60))
+
+# Index compression: "none", "pca" or "truncate" to VECTOR_DIM dimensions.
+# Each setting gets its own collection; PCA must be fitted first
+# (scripts/compress_index.py). VECTOR_FLOAT16 rounds stored vectors to
+# half precision (stored as float16 only by backends that support it).
+VECTOR_COMPRESSION = os.getenv("VECTOR_COMPRESSION", "none")
+VECTOR_DIM = int(os.getenv("VECTOR_DIM", 128))
+VECTOR_FLOAT16 = os.getenv("VECTOR_FLOAT16", "false").lower() == "true"
+
+# ============================================================
+# Chunking
+# ============================================================
+
+# "chars" (section-aware, character sized) or "tokens" (packed to the
+# embedding model's word-piece budget)
+CHUNK_MODE = os.getenv("CHUNK_MODE", "chars")
+
+# Token budget per chunk in "tokens" mode (0 = model max length)
+CHUNK_TOKEN_BUDGET = int(os.getenv("CHUNK_TOKEN_BUDGET", 0))
+
+# ============================================================
+# Near-Duplicate Elimination
+# ============================================================
+
+# Skip chunks that are near-duplicates of already indexed ones
+DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "false").lower() == "true"
+
+# SimHash similarity (1 - hamming / 64) at or above which a chunk is dropped
+DEDUP_SIMILARITY = float(os.getenv("DEDUP_SIMILARITY", 0.9))
+
 # ============================================================
 # RAG Thresholds
 # ============================================================
@@ -54,6 +136,40 @@ EXTRACTIVE_SCORE_THRESHOLD = float(
 DEFAULT_TOP_K = int(os.getenv("DEFAULT_TOP_K", 5))
 MAX_CONTEXT_DOCS = int(os.getenv("MAX_CONTEXT_DOCS", 8))
 
+# ============================================================
+# Document Parsing
+# ============================================================
+
+# Worker processes for page-parallel PDF extraction (None = CPU count)
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", 0)) or None
+
+# PDFs with fewer uncached pages than this are parsed in-process
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", 32))
+
+# ============================================================
+# API
+# ============================================================
+
+# Load models in the background at startup; /ready returns 503 until done.
+# When off, models load on the first request that needs them.
+API_WARMUP = os.getenv("API_WARMUP", "true").lower() == "true"
+
+# Max texts per POST /embedding/batch request
+EMBEDDING_BATCH_MAX_TEXTS = int(os.getenv("EMBEDDING_BATCH_MAX_TEXTS", 256))
+
+# ============================================================
+# Background Ingestion
+# ============================================================
+
+UPLOAD_WORKERS = int(os.getenv("UPLOAD_WORKERS", 2))
+MAX_TRACKED_JOBS = int(os.getenv("MAX_TRACKED_JOBS", 1000))
+
+# POST /upload/batch: parser threads, pooled embedding batch size and limits
+BATCH_UPLOAD_PARSE_WORKERS = int(os.getenv("BATCH_UPLOAD_PARSE_WORKERS", 4))
+BATCH_UPLOAD_EMBED_BATCH_SIZE = int(os.getenv("BATCH_UPLOAD_EMBED_BATCH_SIZE", 256))
+BATCH_UPLOAD_MAX_FILES = int(os.getenv("BATCH_UPLOAD_MAX_FILES", 2000))
+BATCH_UPLOAD_MAX_BYTES = int(os.getenv("BATCH_UPLOAD_MAX_BYTES", 512 * 1024 * 1024))
+
 # ============================================================
 # Gemini Loader
 # ============================================================
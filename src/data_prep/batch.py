@@ -0,0 +1,196 @@
+# src/data_prep/batch.py
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from src.data_prep.pipeline import iter_prepared_chunks
+from src.data_prep.saver import save_chunks, save_chunks_binary
+
+SUPPORTED_EXTENSIONS = (".txt", ".docx", ".pdf")
+
+
+def resolve_inputs(target: str) -> list[str]:
+    """
+    Expands a file path, directory or glob pattern into a sorted
+    list of supported input files.
+    """
+    if os.path.isdir(target):
+        pattern = os.path.join(target, "**", "*")
+        candidates = glob.glob(pattern, recursive=True)
+    elif os.path.isfile(target):
+        candidates = [target]
+    else:
+        candidates = glob.glob(target, recursive=True)
+
+    return sorted(
+        p for p in candidates
+        if os.path.isfile(p) and os.path.splitext(p)[1].lower() in SUPPORTED_EXTENSIONS
+    )
+
+
+OUTPUT_EXTENSIONS = {"json": ".json", "bin": ".chunks"}
+
+
+def output_path_for(input_path: str, output_dir: str, output_format: str = "json", root: str | None = None) -> str:
+    """
+    Flat output path for input_path. With a root, the name is the path
+    relative to it with directories joined by "__" (a/notes.txt →
+    a__notes.json), so same-named files in different folders don't clash.
+    """
+    rel = os.path.relpath(input_path, root) if root else os.path.basename(input_path)
+    base = os.path.splitext(rel)[0].replace(os.sep, "__")
+    return os.path.join(output_dir, base + OUTPUT_EXTENSIONS[output_format])
+
+
+def output_paths_for(input_paths: list[str], output_dir: str, output_format: str = "json") -> dict[str, str]:
+    """
+    {input: output} for a batch, named relative to the inputs' common
+    folder. Raises ValueError if two inputs would still share an output
+    (e.g. notes.txt and notes.pdf) instead of silently overwriting one.
+    """
+    if not input_paths:
+        return {}
+
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in input_paths])
+    outputs = {p: output_path_for(os.path.abspath(p), output_dir, output_format, root) for p in input_paths}
+
+    claimed = {}
+    for path, output in outputs.items():
+        if output in claimed:
+            raise ValueError(f"{claimed[output]} and {path} would both be written to {output}; rename one")
+        claimed[output] = path
+    return outputs
+
+
+def prepare_file(
+    input_path: str,
+    output_path: str,
+    chunk_size: int = 600,
+    overlap: int = 50,
+    chunk_mode: str = "chars",
+    token_budget: int | None = None,
+    output_format: str = "json",
+) -> dict:
+    """
+    Runs load → clean → chunk → save for one file.
+    Never raises: failures are reported in the returned stats so one
+    bad document cannot take down a whole batch.
+    """
+    started = time.perf_counter()
+    stats = {
+        "input": input_path,
+        "output": output_path,
+        "bytes": 0,
+        "chunks": 0,
+        "seconds": 0.0,
+        "error": None,
+    }
+
+    try:
+        stats["bytes"] = os.path.getsize(input_path)
+        chunks = iter_prepared_chunks(
+            input_path,
+            chunk_size=chunk_size,
+            overlap=overlap,
+            chunk_mode=chunk_mode,
+            token_budget=token_budget,
+        )
+
+        if output_format == "bin":
+            # Streams straight into the store, no intermediate list
+            stats["chunks"] = save_chunks_binary(chunks, output_path, source=input_path)
+        else:
+            chunks = list(chunks)
+            save_chunks(chunks, output_path)
+            stats["chunks"] = len(chunks)
+    except Exception as e:
+        stats["error"] = f"{type(e).__name__}: {e}"
+
+    stats["seconds"] = time.perf_counter() - started
+    return stats
+
+
+def prepare_many(
+    input_paths: list[str],
+    output_dir: str = "data/chunks",
+    chunk_size: int = 600,
+    overlap: int = 50,
+    workers: int | None = None,
+    on_result=None,
+    chunk_mode: str = "chars",
+    token_budget: int | None = None,
+    output_format: str = "json",
+) -> dict:
+    """
+    Prepares many files across a process pool.
+
+    on_result(stats, done, total) is called in the parent as each file
+    finishes. Outputs are named by output_paths_for (ValueError on
+    clashing names, before anything runs). Returns a summary with per-file results and throughput.
+    """
+    outputs = output_paths_for(input_paths, output_dir, output_format)
+    os.makedirs(output_dir, exist_ok=True)
+    started = time.perf_counter()
+    results = []
+    total = len(input_paths)
+
+    def record(stats):
+        results.append(stats)
+        if on_result:
+            on_result(stats, len(results), total)
+
+    if workers == 1:
+        # Serial path: easier to debug and avoids pool start-up cost
+        for path in input_paths:
+            record(
+                prepare_file(
+                    path,
+                    outputs[path],
+                    chunk_size,
+                    overlap,
+                    chunk_mode,
+                    token_budget,
+                    output_format,
+                )
+            )
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(
+                    prepare_file,
+                    path,
+                    outputs[path],
+                    chunk_size,
+                    overlap,
+                    chunk_mode,
+                    token_budget,
+                    output_format,
+                )
+                for path in input_paths
+            ]
+            for future in as_completed(futures):
+                record(future.result())
+
+    elapsed = time.perf_counter() - started
+    return summarize(results, elapsed)
+
+
+def summarize(results: list[dict], elapsed: float) -> dict:
+    ok = [r for r in results if r["error"] is None]
+    total_bytes = sum(r["bytes"] for r in ok)
+    total_chunks = sum(r["chunks"] for r in ok)
+    elapsed = max(elapsed, 1e-9)
+
+    return {
+        "files": len(results),
+        "succeeded": len(ok),
+        "failed": len(results) - len(ok),
+        "chunks": total_chunks,
+        "bytes": total_bytes,
+        "seconds": elapsed,
+        "files_per_s": len(ok) / elapsed,
+        "mb_per_s": total_bytes / (1024 * 1024) / elapsed,
+        "chunks_per_s": total_chunks / elapsed,
+        "results": results,
+    }
@@ -0,0 +1,178 @@
+# src/data_prep/chunk_store.py
+"""
+Compact, append-only chunk store.
+
+A store is a directory (conventionally named *.chunks) holding:
+- text.blob    UTF-8 chunk texts, back to back
+- meta.blob    UTF-8 JSON metadata per chunk, back to back
+- offsets.idx  8-byte magic, then one record per chunk:
+               (text_offset, text_length, meta_offset, meta_length)
+               as little-endian uint64
+
+Index records whose data is not fully on disk (crash mid-append) are
+ignored by readers and trimmed by the next writer. Readers memory-map all
+three files and decode a chunk only when it is accessed, so indexers can
+stream or random-access millions of chunks without parsing the whole store.
+"""
+
+import json
+import mmap
+import os
+import struct
+from typing import Iterator
+
+MAGIC = b"CHNKIDX1"
+RECORD = struct.Struct("<4Q")
+
+TEXT_FILE = "text.blob"
+META_FILE = "meta.blob"
+INDEX_FILE = "offsets.idx"
+
+
+def is_chunk_store(path: str) -> bool:
+    return os.path.isfile(os.path.join(path, INDEX_FILE))
+
+
+def _complete_records(index, text_size: int, meta_size: int) -> int:
+    """
+    Number of index records whose data is fully on disk. A crash
+    mid-append can leave a torn record or one pointing past a blob.
+    """
+    count = max(0, (len(index) - len(MAGIC)) // RECORD.size)
+
+    while count:
+        text_off, text_len, meta_off, meta_len = RECORD.unpack_from(
+            index, len(MAGIC) + (count - 1) * RECORD.size
+        )
+        if text_off + text_len <= text_size and meta_off + meta_len <= meta_size:
+            break
+        count -= 1
+
+    return count
+
+
+class ChunkStoreWriter:
+    """
+    Appends chunks to a store, creating it if needed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+        index_path = os.path.join(path, INDEX_FILE)
+        new_store = not os.path.exists(index_path)
+
+        self._text = open(os.path.join(path, TEXT_FILE), "ab")
+        self._meta = open(os.path.join(path, META_FILE), "ab")
+
+        if new_store:
+            self._index = open(index_path, "ab")
+            self._index.write(MAGIC)
+        else:
+            self._index = open(index_path, "r+b")
+            self._truncate_torn_records()
+
+        self._text_offset = self._text.tell()
+        self._meta_offset = self._meta.tell()
+
+    def _truncate_torn_records(self):
+        index = self._index.read()
+        if index[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"Not a chunk store: {self.path}")
+
+        count = _complete_records(index, self._text.tell(), self._meta.tell())
+        self._index.truncate(len(MAGIC) + count * RECORD.size)
+        self._index.seek(0, os.SEEK_END)
+
+    def __len__(self) -> int:
+        return (self._index.tell() - len(MAGIC)) // RECORD.size
+
+    def append(self, text: str, metadata: dict | None = None):
+        text_bytes = text.encode("utf-8")
+        meta_bytes = json.dumps(metadata or {}, ensure_ascii=False).encode("utf-8")
+
+        self._text.write(text_bytes)
+        self._meta.write(meta_bytes)
+        self._index.write(
+            RECORD.pack(self._text_offset, len(text_bytes), self._meta_offset, len(meta_bytes))
+        )
+
+        self._text_offset += len(text_bytes)
+        self._meta_offset += len(meta_bytes)
+
+    def close(self):
+        # Blobs first, so index records never point past flushed data
+        self._text.close()
+        self._meta.close()
+        self._index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _map(path: str):
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class ChunkStoreReader:
+    """
+    Memory-mapped, random-access view of a store.
+    reader[i] → chunk text, reader.metadata(i) → dict.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._index = _map(os.path.join(path, INDEX_FILE))
+
+        if self._index[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"Not a chunk store: {path}")
+
+        self._text = _map(os.path.join(path, TEXT_FILE))
+        self._meta = _map(os.path.join(path, META_FILE))
+
+        # Torn trailing records (crash mid-append) are ignored
+        self._count = _complete_records(self._index, len(self._text), len(self._meta))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _record(self, i: int) -> tuple[int, int, int, int]:
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        return RECORD.unpack_from(self._index, len(MAGIC) + i * RECORD.size)
+
+    def __getitem__(self, i: int) -> str:
+        text_off, text_len, _, _ = self._record(i)
+        return bytes(self._text[text_off:text_off + text_len]).decode("utf-8")
+
+    def metadata(self, i: int) -> dict:
+        _, _, meta_off, meta_len = self._record(i)
+        return json.loads(bytes(self._meta[meta_off:meta_off + meta_len]).decode("utf-8"))
+
+    def iter_range(self, start: int = 0, stop: int | None = None) -> Iterator[tuple[str, dict]]:
+        stop = self._count if stop is None else min(stop, self._count)
+        for i in range(start, stop):
+            yield self[i], self.metadata(i)
+
+    def __iter__(self) -> Iterator[tuple[str, dict]]:
+        return self.iter_range()
+
+    def close(self):
+        for m in (self._index, self._text, self._meta):
+            if isinstance(m, mmap.mmap):
+                m.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
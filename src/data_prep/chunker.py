@@ -1,6 +1,8 @@
 # src/data_prep/chunker.py
 
+import io
 import re
+from typing import IO, Iterable, Iterator
 
 
 def split_into_paragraphs(text: str) -> list[str]:
@@ -12,6 +14,33 @@ def split_into_paragraphs(text: str) -> list[str]:
     return [p.strip() for p in paragraphs if p.strip()]
 
 
+def iter_paragraphs(stream: IO) -> Iterator[str]:
+    """
+    Lazily yields paragraphs from a text or binary stream.
+    Same blank-line rules as split_into_paragraphs, but only one
+    paragraph is held in memory at a time.
+    """
+    if isinstance(stream, (io.RawIOBase, io.BufferedIOBase)):
+        stream = io.TextIOWrapper(stream, encoding="utf-8")
+
+    lines: list[str] = []
+
+    for line in stream:
+        line = line.strip()
+
+        # Blank (or whitespace-only) line → paragraph boundary
+        if not line:
+            if lines:
+                yield "\n".join(lines)
+                lines = []
+            continue
+
+        lines.append(line)
+
+    if lines:
+        yield "\n".join(lines)
+
+
 def is_section_heading(paragraph: str) -> bool:
     """
     Detects headings such as:
@@ -28,59 +57,81 @@ def is_section_heading(paragraph: str) -> bool:
     return False
 
 
-def chunk_by_sections(paragraphs: list[str], max_size: int = 600) -> list[str]:
+def iter_sections(paragraphs: Iterable[str], max_size: int = 600) -> Iterator[str]:
     """
-    Groups paragraphs into semantically meaningful section-based chunks.
+    Streaming core of chunk_by_sections.
+    Buffers only the chunk being built, so memory is bounded by
+    max_size (plus the largest single paragraph).
     """
+    parts: list[str] = []
+    size = 0
 
-    chunks = []
-    current_chunk = ""
+    def flush() -> Iterator[str]:
+        chunk = "".join(parts).strip()
+        if chunk:
+            yield chunk
 
     for para in paragraphs:
 
         # If paragraph is a heading → start new chunk
         if is_section_heading(para):
-            if current_chunk.strip():
-                chunks.append(current_chunk.strip())
-            current_chunk = para + "\n"
+            yield from flush()
+            parts = [para + "\n"]
+            size = len(para) + 1
             continue
 
         # If adding this paragraph exceeds max_size → store and start new
-        if len(current_chunk) + len(para) > max_size:
-            chunks.append(current_chunk.strip())
-            current_chunk = ""
+        if size + len(para) > max_size:
+            yield from flush()
+            parts = []
+            size = 0
 
-        current_chunk += para + "\n\n"
+        parts.append(para + "\n\n")
+        size += len(para) + 2
 
     # Add last chunk if exists
-    if current_chunk.strip():
-        chunks.append(current_chunk.strip())
+    yield from flush()
+
 
-    return chunks
+def chunk_by_sections(paragraphs: list[str], max_size: int = 600) -> list[str]:
+    """
+    Groups paragraphs into semantically meaningful section-based chunks.
+    """
+    return list(iter_sections(paragraphs, max_size=max_size))
 
 
-def chunk_text(text: str, chunk_size: int = 600, overlap: int = 0) -> list[str]:
+def iter_overlapped(chunks: Iterable[str], overlap: int = 0) -> Iterator[str]:
     """
-    Main entry: section-aware chunking with optional overlap.
+    Prefixes every chunk with the tail of the previous one.
+    Only the previous tail is kept between iterations.
     """
-    paragraphs = split_into_paragraphs(text)
-    base_chunks = chunk_by_sections(paragraphs, max_size=chunk_size)
+    prev_tail = None
 
-    # If no overlap requested, return as-is
-    if overlap <= 0:
-        return base_chunks
+    for chunk in chunks:
+        if overlap <= 0:
+            yield chunk
+            continue
 
-    # Build overlapping windows of chunks
-    overlapped = []
-    for i in range(len(base_chunks)):
-        chunk = base_chunks[i]
+        out = chunk if prev_tail is None else prev_tail + "\n" + chunk
+        prev_tail = chunk[-overlap:]
+        yield out
 
-        # Add overlap from previous chunk
-        if i > 0:
-            prev_tail = base_chunks[i - 1][-overlap:]
-            chunk = prev_tail + "\n" + chunk
 
-        overlapped.append(chunk)
+def iter_chunks(stream: IO, chunk_size: int = 600, overlap: int = 0) -> Iterator[str]:
+    """
+    Streaming variant of chunk_text for very large documents.
+    Reads paragraphs lazily from a file or byte stream and yields
+    section-aware chunks with the same heading and overlap rules.
+    """
+    paragraphs = iter_paragraphs(stream)
+    sections = iter_sections(paragraphs, max_size=chunk_size)
+    yield from iter_overlapped(sections, overlap=overlap)
 
-    return overlapped
 
+def chunk_text(text: str, chunk_size: int = 600, overlap: int = 0) -> list[str]:
+    """
+    Main entry: section-aware chunking with optional overlap.
+    """
+    paragraphs = split_into_paragraphs(text)
+    base_chunks = iter_sections(paragraphs, max_size=chunk_size)
+    return list(iter_overlapped(base_chunks, overlap=overlap))
@@ -0,0 +1,255 @@
+# src/data_prep/dedup.py
+"""
+Near-duplicate chunk detection with 64-bit SimHash.
+
+Signatures live in a small sqlite index next to the vector collection.
+Lookups use the pigeonhole trick: with a max Hamming distance of d, the
+64 bits are split into d + 1 bands, and any two signatures within
+distance d must agree exactly on at least one band. Only chunks sharing
+a band are compared bit-by-bit.
+
+Chunks dropped as near-duplicates are kept as aliases of the chunk they
+duplicate (with their text and metadata), so they can be stored after
+all when that chunk is deleted.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+
+import numpy as np
+
+BITS = 64
+SHINGLE_SIZE = 3
+
+
+def _shingles(text: str) -> list[str]:
+    tokens = re.findall(r"\w+", text.lower())
+    if len(tokens) <= SHINGLE_SIZE:
+        return [" ".join(tokens)] if tokens else []
+    return [" ".join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)]
+
+
+def simhash(text: str) -> int:
+    """
+    64-bit SimHash over word 3-shingles.
+    """
+    shingles = _shingles(text)
+    if not shingles:
+        return 0
+
+    hashes = np.array(
+        [int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "little") for s in shingles],
+        dtype=np.uint64,
+    )
+
+    # (n, 64) bit matrix → per-bit vote
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+    votes = bits.sum(axis=0, dtype=np.int64) * 2 - len(shingles)
+
+    packed = np.packbits(votes > 0, bitorder="little")
+    return int.from_bytes(packed.tobytes(), "little")
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def max_distance_for(similarity: float) -> int:
+    """
+    Similarity is 1 - hamming / 64.
+    """
+    return int((1.0 - similarity) * BITS)
+
+
+def _band_ranges(bands: int) -> list[tuple[int, int]]:
+    edges = [round(i * BITS / bands) for i in range(bands + 1)]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def _to_signed(value: int) -> int:
+    # sqlite INTEGER is signed 64-bit
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def _to_unsigned(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+class NearDuplicateIndex:
+    """
+    Persistent SimHash index.
+
+    find(text) returns the id of a stored chunk at or above the
+    configured similarity, or None. The index is thread-safe.
+
+    Aliases record dropped duplicates: chunk_id → kept_id, plus the
+    duplicate's document and metadata.
+    """
+
+    def __init__(self, path: str = ":memory:", similarity: float = 0.9):
+        self.path = path
+        self.similarity = similarity
+        self.max_distance = max_distance_for(similarity)
+        self.bands = _band_ranges(self.max_distance + 1)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._init_schema()
+
+    def _init_schema(self):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS signatures (chunk_id TEXT PRIMARY KEY, simhash INTEGER)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS bands (band INTEGER, value INTEGER, chunk_id TEXT)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS bands_lookup ON bands (band, value)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS bands_chunk ON bands (chunk_id)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS aliases ("
+                "chunk_id TEXT PRIMARY KEY, kept_id TEXT, source TEXT, document TEXT, metadata TEXT)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS aliases_kept ON aliases (kept_id)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS aliases_source ON aliases (source)")
+
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'bands'").fetchone()
+            if row is None or int(row[0]) != len(self.bands):
+                self._rebuild_bands()
+
+    def _rebuild_bands(self):
+        # Band layout depends on the similarity threshold
+        self._conn.execute("DELETE FROM bands")
+        rows = self._conn.execute("SELECT chunk_id, simhash FROM signatures").fetchall()
+        for chunk_id, signed in rows:
+            self._conn.executemany(
+                "INSERT INTO bands VALUES (?, ?, ?)",
+                [(b, v, chunk_id) for b, v in self._band_values(_to_unsigned(signed))],
+            )
+        self._conn.execute(
+            "INSERT OR REPLACE INTO meta VALUES ('bands', ?)", (str(len(self.bands)),)
+        )
+
+    def _band_values(self, signature: int) -> list[tuple[int, int]]:
+        # A single band is the whole 64-bit signature, so band values are
+        # stored signed like the signatures themselves
+        return [
+            (i, _to_signed((signature >> start) & ((1 << (end - start)) - 1)))
+            for i, (start, end) in enumerate(self.bands)
+        ]
+
+    # -------------------------------------------------------------
+
+    def find(self, text: str, signature: int | None = None, exclude=()) -> str | None:
+        """
+        exclude: chunk ids to ignore (e.g. chunks about to be deleted).
+        """
+        signature = simhash(text) if signature is None else signature
+
+        with self._lock:
+            for band, value in self._band_values(signature):
+                rows = self._conn.execute(
+                    "SELECT s.chunk_id, s.simhash FROM bands b "
+                    "JOIN signatures s ON s.chunk_id = b.chunk_id "
+                    "WHERE b.band = ? AND b.value = ?",
+                    (band, value),
+                ).fetchall()
+
+                for chunk_id, signed in rows:
+                    if chunk_id in exclude:
+                        continue
+                    if hamming(signature, _to_unsigned(signed)) <= self.max_distance:
+                        return chunk_id
+
+        return None
+
+    def add(self, chunk_id: str, text: str, signature: int | None = None):
+        signature = simhash(text) if signature is None else signature
+
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM bands WHERE chunk_id = ?", (chunk_id,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO signatures VALUES (?, ?)", (chunk_id, _to_signed(signature))
+            )
+            self._conn.executemany(
+                "INSERT INTO bands VALUES (?, ?, ?)",
+                [(b, v, chunk_id) for b, v in self._band_values(signature)],
+            )
+
+    def remove(self, chunk_ids):
+        chunk_ids = [(cid,) for cid in chunk_ids]
+        if not chunk_ids:
+            return
+
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM signatures WHERE chunk_id = ?", chunk_ids)
+            self._conn.executemany("DELETE FROM bands WHERE chunk_id = ?", chunk_ids)
+
+    # -------------------------------------------------------------
+    # Aliases of dropped duplicates
+    # -------------------------------------------------------------
+
+    def add_aliases(self, aliases):
+        """
+        aliases: [(chunk_id, kept_id, document, metadata)]
+        """
+        rows = [
+            (cid, kept, (meta or {}).get("source"), doc, json.dumps(meta))
+            for cid, kept, doc, meta in aliases
+        ]
+        if not rows:
+            return
+
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO aliases VALUES (?, ?, ?, ?, ?)", rows)
+
+    def aliases_of(self, kept_ids) -> list[tuple[str, str, dict]]:
+        """
+        [(chunk_id, document, metadata)] of duplicates dropped in favour of kept_ids.
+        """
+        kept_ids = list(kept_ids)
+        found = []
+        with self._lock:
+            for start in range(0, len(kept_ids), 900):  # sqlite parameter limit
+                part = kept_ids[start:start + 900]
+                found += self._conn.execute(
+                    "SELECT chunk_id, document, metadata FROM aliases "
+                    f"WHERE kept_id IN ({','.join('?' * len(part))})",
+                    part,
+                ).fetchall()
+        return [(cid, doc, json.loads(meta)) for cid, doc, meta in found]
+
+    def source_aliases(self, source: str) -> dict[str, str | None]:
+        """
+        {chunk_id: content_hash} of a source's dropped duplicates.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT chunk_id, metadata FROM aliases WHERE source = ?", (source,)
+            ).fetchall()
+        return {cid: json.loads(meta).get("content_hash") for cid, meta in rows}
+
+    def remove_aliases(self, chunk_ids):
+        chunk_ids = [(cid,) for cid in chunk_ids]
+        if not chunk_ids:
+            return
+
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM aliases WHERE chunk_id = ?", chunk_ids)
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM signatures")
+            self._conn.execute("DELETE FROM bands")
+            self._conn.execute("DELETE FROM aliases")
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM signatures").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
@@ -1,6 +1,7 @@
 import os
 import docx
-import pypdf
+
+from src.data_prep.pdf_engine import iter_pdf_pages
 
 def load_txt(path: str) -> str:
     with open(path, "r", encoding="utf-8") as f:
@@ -13,14 +14,8 @@ def load_docx(path: str) -> str:
 
 
 def load_pdf(path: str) -> str:
-    text = ""
-    with open(path, "rb") as f:
-        reader = pypdf.PdfReader(f)
-        for page in reader.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + "\n"
-    return text
+    pages = iter_pdf_pages(path, extractor="pypdf")
+    return "".join(page_text + "\n" for page_text in pages if page_text)
 
 
 def load_file(path: str) -> str:
@@ -0,0 +1,302 @@
+# src/data_prep/pdf_engine.py
+"""
+Page-parallel PDF text extraction with a per-page disk cache.
+
+Pages are extracted across worker processes in contiguous ranges and
+yielded back in page order as soon as each one is available. With
+PDF_CACHE_DIR set, extracted text is cached on disk keyed by (file
+hash, page number, extractor), so re-processing the same document only
+parses pages that were never seen. The cache is capped at
+PDF_CACHE_MAX_MB; least recently used documents are evicted first.
+"""
+
+import hashlib
+import io
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator
+
+import pypdf
+
+from src.config import PDF_CACHE_DIR, PDF_CACHE_MAX_MB, PDF_WORKERS, PDF_PARALLEL_MIN_PAGES
+
+PAGES_PER_TASK = 8
+
+
+# ============================================================
+# Extractors (run inside worker processes)
+# ============================================================
+
+def _open_source(source):
+    return io.BytesIO(source) if isinstance(source, bytes) else open(source, "rb")
+
+
+def _extract_pypdf(source, start: int, stop: int) -> list[str]:
+    with _open_source(source) as f:
+        reader = pypdf.PdfReader(f)
+        return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def _extract_pdfplumber(source, start: int, stop: int) -> list[str]:
+    import pdfplumber
+
+    # pdfplumber page numbers are 1-based
+    pages = list(range(start + 1, stop + 1))
+    with _open_source(source) as f, pdfplumber.open(f, pages=pages) as pdf:
+        return [page.extract_text() or "" for page in pdf.pages]
+
+
+EXTRACTORS = {
+    "pypdf": _extract_pypdf,
+    "pdfplumber": _extract_pdfplumber,
+}
+
+
+def _extract_range(extractor: str, source, start: int, stop: int) -> list[str]:
+    return EXTRACTORS[extractor](source, start, stop)
+
+
+# ============================================================
+# Page cache
+# ============================================================
+
+class PageCache:
+    """
+    Stores one text file per (file hash, extractor, page).
+    Writes are atomic, so concurrent workers never see partial pages.
+
+    max_bytes caps the cache size (None = unbounded). Each document's
+    directory mtime records its last use; evict() drops the least
+    recently used documents until the cache fits.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int | None = None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    def _path(self, file_hash: str, page: int, extractor: str) -> str:
+        return os.path.join(self.cache_dir, file_hash, extractor, f"{page:06d}.txt")
+
+    def get(self, file_hash: str, page: int, extractor: str) -> str | None:
+        """
+        The cached text, or None on a miss (including a page evicted by
+        another process a moment ago).
+        """
+        path = self._path(file_hash, page, extractor)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, file_hash: str, page: int, extractor: str, text: str):
+        path = self._path(file_hash, page, extractor)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+
+    def touch(self, file_hash: str):
+        """
+        Marks a document as just used.
+        """
+        try:
+            os.utime(os.path.join(self.cache_dir, file_hash))
+        except FileNotFoundError:
+            pass
+
+    def size(self, file_hash: str) -> int:
+        total = 0
+        for root, _, files in os.walk(os.path.join(self.cache_dir, file_hash)):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(root, name))
+                except FileNotFoundError:
+                    pass
+        return total
+
+    def evict(self, keep: str | None = None) -> int:
+        """
+        Removes least recently used documents (never `keep`) until the
+        cache is within max_bytes. Returns the number removed.
+        """
+        if self.max_bytes is None:
+            return 0
+
+        try:
+            entries = list(os.scandir(self.cache_dir))
+        except FileNotFoundError:
+            return 0
+
+        docs = []
+        for entry in entries:
+            try:
+                if entry.is_dir():
+                    docs.append((entry.stat().st_mtime, entry.name))
+            except FileNotFoundError:
+                continue
+
+        sizes = {name: self.size(name) for _, name in docs}
+        total = sum(sizes.values())
+
+        removed = 0
+        for _, name in sorted(docs):
+            if total <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            shutil.rmtree(os.path.join(self.cache_dir, name), ignore_errors=True)
+            total -= sizes[name]
+            removed += 1
+        return removed
+
+
+# ============================================================
+# Engine
+# ============================================================
+
+def file_hash(source) -> str:
+    """
+    sha256 of PDF bytes or of a file on disk (read in blocks).
+    """
+    digest = hashlib.sha256()
+
+    if isinstance(source, bytes):
+        digest.update(source)
+    else:
+        with open(source, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+
+    return digest.hexdigest()
+
+
+def count_pages(source, extractor: str = "pypdf") -> int:
+    """
+    Page count as seen by the extractor that will read the pages, so a
+    file only one of the parsers can open isn't rejected by the other.
+    """
+    if extractor == "pdfplumber":
+        import pdfplumber
+
+        with _open_source(source) as f, pdfplumber.open(f) as pdf:
+            return len(pdf.pages)
+
+    with _open_source(source) as f:
+        return len(pypdf.PdfReader(f).pages)
+
+
+def _missing_ranges(missing: list[int], size: int) -> list[tuple[int, int]]:
+    """
+    Groups missing page numbers into contiguous [start, stop) ranges
+    of at most `size` pages.
+    """
+    ranges = []
+    for page in missing:
+        if ranges and ranges[-1][1] == page and page - ranges[-1][0] < size:
+            ranges[-1] = (ranges[-1][0], page + 1)
+        else:
+            ranges.append((page, page + 1))
+    return ranges
+
+
+def iter_pdf_pages(
+    source,
+    extractor: str = "pypdf",
+    workers: int | None = PDF_WORKERS,
+    cache_dir: str | None = PDF_CACHE_DIR,
+    min_parallel_pages: int = PDF_PARALLEL_MIN_PAGES,
+    cache_max_mb: float | None = PDF_CACHE_MAX_MB,
+) -> Iterator[str]:
+    """
+    Yields the text of every page (empty string for pages without text),
+    in page order.
+
+    source: PDF bytes or a path to a PDF file.
+    cache_dir: page cache root, or None/"" to disable caching (the
+    default unless PDF_CACHE_DIR is set).
+    cache_max_mb: cache size cap, enforced after each document (None/0 = unbounded).
+    """
+    if extractor not in EXTRACTORS:
+        raise ValueError(f"Unsupported PDF extractor: {extractor}")
+
+    max_bytes = int(cache_max_mb * (1 << 20)) if cache_max_mb else None
+    cache = PageCache(cache_dir, max_bytes=max_bytes) if cache_dir else None
+    digest = file_hash(source) if cache else None
+    if cache:
+        cache.touch(digest)
+    total = count_pages(source, extractor)
+
+    # Cached pages are read up front: a page evicted between a check and
+    # a read would otherwise come back as None. Whatever isn't read here
+    # is extracted
+    cached = {}
+    if cache:
+        for p in range(total):
+            text = cache.get(digest, p, extractor)
+            if text is not None:
+                cached[p] = text
+    missing = [p for p in range(total) if p not in cached]
+    ranges = _missing_ranges(missing, PAGES_PER_TASK)
+    range_of = {p: r for r in ranges for p in range(*r)}
+
+    # Small documents: a pool costs more than it saves
+    parallel = workers != 1 and len(missing) >= min_parallel_pages
+
+    spooled = None
+    pool = None
+    pending = {}
+
+    try:
+        if parallel:
+            # Spool bytes to disk once so workers get a path,
+            # not a pickled copy of the whole file per task
+            path = source
+            if isinstance(source, bytes):
+                fd, spooled = tempfile.mkstemp(suffix=".pdf")
+                with os.fdopen(fd, "wb") as f:
+                    f.write(source)
+                path = spooled
+
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            for r in ranges:
+                pending[r] = pool.submit(_extract_range, extractor, path, *r)
+
+        results = {}  # only the range currently being drained
+
+        for page in range(total):
+            r = range_of.get(page)
+
+            if r is None:
+                yield cached.pop(page)
+                continue
+
+            if r not in results:
+                if parallel:
+                    results[r] = pending.pop(r).result()
+                else:
+                    results[r] = _extract_range(extractor, source, *r)
+
+            text = results[r][page - r[0]]
+            if page == r[1] - 1:
+                del results[r]
+
+            if cache:
+                cache.put(digest, page, extractor, text)
+            yield text
+    finally:
+        if pool:
+            pool.shutdown(wait=False, cancel_futures=True)
+        if spooled:
+            os.remove(spooled)
+        if cache:
+            cache.touch(digest)
+            cache.evict(keep=digest)
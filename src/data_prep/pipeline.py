@@ -1,11 +1,75 @@
 # src/data_prep/pipeline.py (update)
+import io
+import os
+from contextlib import contextmanager
+from typing import IO, Iterator
+
 from src.data_prep.loader import load_file
 from src.utils import clean_text
-from src.data_prep.chunker import chunk_text
+from src.data_prep.chunker import iter_chunks
+from src.data_prep.token_chunker import iter_token_chunks
 from src.data_prep.saver import save_chunks
 
-def prepare_data(file_path: str, chunk_size: int = 600, overlap: int = 50):
-    raw_text = load_file(file_path)
-    cleaned_text = clean_text(raw_text)   # import from your utils/text_utils
-    chunks = chunk_text(cleaned_text, chunk_size=chunk_size, overlap=overlap)
-    return chunks
+
+def _chunk_stream(stream, chunk_size: int, overlap: int, chunk_mode: str, token_budget):
+    if chunk_mode == "tokens":
+        # Budget is in word-pieces; overlap would push chunks past it
+        return iter_token_chunks(stream, max_tokens=token_budget)
+    if chunk_mode == "chars":
+        return iter_chunks(stream, chunk_size=chunk_size, overlap=overlap)
+    raise ValueError(f"Unsupported chunk mode: {chunk_mode}")
+
+
+@contextmanager
+def open_prepared_text(file_path: str) -> Iterator[IO]:
+    """
+    Cleaned text of a document as a stream. Plain-text files are read
+    lazily (the paragraph reader strips lines and collapses blank runs,
+    which is what clean_text does); docx / pdf parsers need the whole
+    document anyway.
+    """
+    extension = os.path.splitext(str(file_path))[1].lower()
+
+    if extension == ".txt":
+        with open(file_path, "r", encoding="utf-8") as f:
+            yield f
+        return
+
+    yield io.StringIO(clean_text(load_file(file_path)))
+
+
+def iter_prepared_chunks(
+    file_path: str,
+    chunk_size: int = 600,
+    overlap: int = 50,
+    chunk_mode: str = "chars",
+    token_budget: int | None = None,
+) -> Iterator[str]:
+    """
+    Streaming variant of prepare_data. Plain-text files are read lazily
+    (open_prepared_text), so memory stays bounded by chunk size instead
+    of document size.
+
+    chunk_mode="tokens" packs paragraphs up to token_budget word-pieces
+    of the embedding model tokenizer (default: model max length).
+    """
+    with open_prepared_text(file_path) as stream:
+        yield from _chunk_stream(stream, chunk_size, overlap, chunk_mode, token_budget)
+
+
+def prepare_data(
+    file_path: str,
+    chunk_size: int = 600,
+    overlap: int = 50,
+    chunk_mode: str = "chars",
+    token_budget: int | None = None,
+):
+    return list(
+        iter_prepared_chunks(
+            file_path,
+            chunk_size=chunk_size,
+            overlap=overlap,
+            chunk_mode=chunk_mode,
+            token_budget=token_budget,
+        )
+    )
@@ -1,5 +1,59 @@
 import json
+import os
+import shutil
+from typing import Iterable, Iterator
+
+from src.data_prep.chunk_store import ChunkStoreReader, ChunkStoreWriter, is_chunk_store
 
 def save_chunks(chunks: list[str], output_path: str):
     with open(output_path, "w", encoding="utf-8") as f:
         json.dump(chunks, f, indent=2, ensure_ascii=False)
+
+
+def save_chunks_binary(
+    chunks: Iterable[str],
+    output_path: str,
+    source: str | None = None,
+    append: bool = False,
+) -> int:
+    """
+    Writes chunks to a memory-mappable chunk store (see chunk_store).
+    Accepts any iterable, so streamed chunks never need to be listed.
+    An existing store is replaced unless append=True.
+    """
+    if not append and os.path.isdir(output_path):
+        shutil.rmtree(output_path)
+
+    count = 0
+    with ChunkStoreWriter(output_path) as writer:
+        start = len(writer)
+        for i, chunk in enumerate(chunks, start=start):
+            writer.append(chunk, {"source": source or output_path, "chunk_index": i})
+            count += 1
+    return count
+
+
+def iter_saved_chunks(path: str) -> Iterator[tuple[str, dict]]:
+    """
+    Streams (text, metadata) from any saved chunk file:
+    - chunk store directories (*.chunks)
+    - JSON arrays written by save_chunks
+    - JSON objects of the form {"source": ..., "chunks": [...]}
+    """
+    if is_chunk_store(path):
+        with ChunkStoreReader(path) as reader:
+            yield from reader
+        return
+
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    if isinstance(data, dict):
+        source = data.get("source", path)
+        chunks = data.get("chunks", [])
+    else:
+        source = os.path.splitext(os.path.basename(path))[0]
+        chunks = data
+
+    for i, chunk in enumerate(chunks):
+        yield chunk, {"source": source, "chunk_index": i}
@@ -0,0 +1,144 @@
+# src/data_prep/token_chunker.py
+"""
+Token-budget chunking aligned with the embedding model tokenizer.
+
+Paragraphs are packed up to a word-piece budget instead of a character
+count, so chunks are neither silently truncated by the model nor padded
+with wasted slots. Token counting is batched through the fast tokenizer.
+"""
+
+from functools import lru_cache
+from itertools import islice
+from typing import IO, Iterable, Iterator
+
+from src.config import EMBEDDING_MODEL_NAME
+from src.data_prep.chunker import is_section_heading, iter_paragraphs, split_into_paragraphs
+from src.embedder.model_registry import EMBEDDING_MODEL_REGISTRY, EMBEDDING_MAX_SEQ_LENGTH
+
+# [CLS] + [SEP] are added by the model on top of the chunk tokens
+SPECIAL_TOKENS = 2
+
+
+def _resolve_model(embedder_name: str) -> str:
+    model_name = EMBEDDING_MODEL_REGISTRY.get(embedder_name)
+    if not model_name:
+        raise ValueError(f"Unsupported embedding model: {embedder_name}")
+    return model_name
+
+
+@lru_cache(maxsize=None)
+def load_tokenizer(embedder_name: str = EMBEDDING_MODEL_NAME):
+    from transformers import AutoTokenizer
+
+    return AutoTokenizer.from_pretrained(_resolve_model(embedder_name))
+
+
+def default_token_budget(embedder_name: str = EMBEDDING_MODEL_NAME) -> int:
+    max_seq = EMBEDDING_MAX_SEQ_LENGTH.get(_resolve_model(embedder_name), 256)
+    return max_seq - SPECIAL_TOKENS
+
+
+def count_tokens(texts: list[str], tokenizer, batch_size: int = 256) -> list[int]:
+    """
+    Word-piece counts (without special tokens), tokenized in batches.
+    """
+    counts = []
+    for start in range(0, len(texts), batch_size):
+        encoded = tokenizer(texts[start:start + batch_size], add_special_tokens=False)
+        counts.extend(len(ids) for ids in encoded["input_ids"])
+    return counts
+
+
+def split_by_tokens(text: str, tokenizer, max_tokens: int) -> list[str]:
+    """
+    Cuts an oversized paragraph into windows of at most max_tokens,
+    at token boundaries (needs a fast tokenizer for offsets).
+    """
+    offsets = tokenizer(
+        text, add_special_tokens=False, return_offsets_mapping=True
+    )["offset_mapping"]
+
+    pieces = []
+    for start in range(0, len(offsets), max_tokens):
+        window = offsets[start:start + max_tokens]
+        begin = window[0][0]
+        end = offsets[start + max_tokens][0] if start + max_tokens < len(offsets) else len(text)
+        piece = text[begin:end].strip()
+        if piece:
+            pieces.append(piece)
+
+    return pieces
+
+
+def iter_token_sections(
+    paragraphs: Iterable[str],
+    tokenizer,
+    max_tokens: int,
+    batch_size: int = 256,
+) -> Iterator[str]:
+    """
+    Token-budget counterpart of chunker.iter_sections: same heading
+    rules, paragraphs packed until the next one would exceed max_tokens.
+    """
+    paragraphs = iter(paragraphs)
+    parts: list[str] = []
+    used = 0
+
+    def flush() -> Iterator[str]:
+        chunk = "\n\n".join(parts).strip()
+        if chunk:
+            yield chunk
+
+    while True:
+        batch = list(islice(paragraphs, batch_size))
+        if not batch:
+            break
+
+        for para, n_tokens in zip(batch, count_tokens(batch, tokenizer, batch_size)):
+
+            # Heading → start new chunk
+            if is_section_heading(para):
+                yield from flush()
+                parts, used = [para], n_tokens
+                continue
+
+            # Paragraph alone exceeds the budget → emit it in windows
+            if n_tokens > max_tokens:
+                yield from flush()
+                parts, used = [], 0
+                yield from split_by_tokens(para, tokenizer, max_tokens)
+                continue
+
+            if used + n_tokens > max_tokens:
+                yield from flush()
+                parts, used = [], 0
+
+            parts.append(para)
+            used += n_tokens
+
+    yield from flush()
+
+
+def iter_token_chunks(
+    stream: IO,
+    tokenizer=None,
+    max_tokens: int | None = None,
+    embedder_name: str = EMBEDDING_MODEL_NAME,
+) -> Iterator[str]:
+    """
+    Streaming token-budget chunking (see chunker.iter_chunks).
+    """
+    tokenizer = tokenizer or load_tokenizer(embedder_name)
+    max_tokens = max_tokens or default_token_budget(embedder_name)
+    yield from iter_token_sections(iter_paragraphs(stream), tokenizer, max_tokens)
+
+
+def chunk_text_by_tokens(
+    text: str,
+    tokenizer=None,
+    max_tokens: int | None = None,
+    embedder_name: str = EMBEDDING_MODEL_NAME,
+) -> list[str]:
+    tokenizer = tokenizer or load_tokenizer(embedder_name)
+    max_tokens = max_tokens or default_token_budget(embedder_name)
+    return list(iter_token_sections(split_into_paragraphs(text), tokenizer, max_tokens))
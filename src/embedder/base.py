@@ -1,7 +1,14 @@
 # src/embedder/base.py
 from typing import List
 
+import numpy as np
+
 
 class BaseEmbedder:
-    def embed(self, texts: List[str]) -> List[List[float]]:
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Returns a C-contiguous float32 array of shape (len(texts), dim).
+        Consumers (Chroma, the vector store, the API) take it as is;
+        only JSON responses convert to lists.
+        """
         raise NotImplementedError
@@ -0,0 +1,139 @@
+# src/embedder/batching.py
+"""
+Dynamic micro-batching in front of an embedder.
+
+Concurrent callers (API threads embedding one query each) put their texts
+on a queue; a single scheduler thread collects whatever arrives within
+max_wait seconds, up to max_batch texts, runs one batched embed() and hands
+each caller its slice of the result. On CPU a batch of 32 short texts costs
+little more than a batch of 4, so throughput grows with concurrency while
+an idle server adds at most max_wait of latency.
+"""
+
+import queue
+import threading
+import time
+from typing import List
+
+import numpy as np
+
+from src.embedder.base import BaseEmbedder
+
+
+class _Request:
+    __slots__ = ("texts", "done", "result", "error")
+
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class MicroBatchingEmbedder(BaseEmbedder):
+    def __init__(self, embedder, max_batch: int = 32, max_wait: float = 0.005):
+        """
+        embedder:   the embedder to schedule calls for
+        max_batch:  texts per batched call; requests this large or larger
+                    (e.g. ingest batches) bypass the scheduler
+        max_wait:   seconds to wait for more requests after the first one
+        """
+        self.inner = embedder
+        self.model_name = getattr(embedder, "model_name", type(embedder).__name__)
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+
+        self._queue: "queue.Queue[_Request]" = queue.Queue()
+        self._carry = None  # request that didn't fit in the previous batch
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+        self.batches = 0
+        self.requests = 0
+        self.texts = 0
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="embed-batcher", daemon=True)
+                self._thread.start()
+
+    # -------------------------------------------------------------
+
+    def _collect(self) -> list[_Request]:
+        first = self._carry or self._queue.get()
+        self._carry = None
+
+        batch, size = [first], len(first.texts)
+        deadline = time.monotonic() + self.max_wait
+
+        while size < self.max_batch:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+
+            if size + len(request.texts) > self.max_batch:
+                self._carry = request
+                break
+
+            batch.append(request)
+            size += len(request.texts)
+
+        return batch
+
+    def _loop(self):
+        while True:
+            batch = self._collect()
+            texts = [t for request in batch for t in request.texts]
+
+            try:
+                vectors = np.asarray(self.inner.embed(texts), dtype=np.float32)
+            except Exception as e:
+                for request in batch:
+                    request.error = e
+                    request.done.set()
+                continue
+
+            self.batches += 1
+            self.requests += len(batch)
+            self.texts += len(texts)
+
+            start = 0
+            for request in batch:
+                request.result = vectors[start:start + len(request.texts)]
+                start += len(request.texts)
+                request.done.set()
+
+    # -------------------------------------------------------------
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return self.inner.embed([])
+
+        # Already a full batch: waiting would only add latency
+        if len(texts) >= self.max_batch:
+            return self.inner.embed(texts)
+
+        self._ensure_started()
+
+        request = _Request(list(texts))
+        self._queue.put(request)
+        request.done.wait()
+
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "texts": self.texts,
+            "mean_batch_size": self.texts / self.batches if self.batches else 0.0,
+        }
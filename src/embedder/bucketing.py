@@ -0,0 +1,179 @@
+# src/embedder/bucketing.py
+"""
+Length-bucketed batching.
+
+A batch is padded to its longest member, so a 10-token heading encoded
+next to a 250-token section costs 250 tokens of compute. This wrapper
+sorts a call's texts by token length, encodes them in buckets of similar
+length and scatters the vectors back into the caller's order.
+"""
+
+import threading
+import weakref
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from src.config import EMBED_LENGTH_BUCKETING, EMBED_BUCKET_SIZE
+from src.embedder.base import BaseEmbedder
+from src.embedder.model_registry import EMBEDDING_MODEL_REGISTRY, EMBEDDING_MAX_SEQ_LENGTH
+
+# [CLS] + [SEP]
+SPECIAL_TOKENS = 2
+
+
+def token_length_fn(model_name: str) -> Callable[[List[str]], List[int]]:
+    """
+    Token counts as the model sees them (special tokens included,
+    truncated at the model's max length). Falls back to character
+    counts if the model's tokenizer isn't available.
+    """
+    from src.data_prep.token_chunker import load_tokenizer, count_tokens
+
+    # Embedders report either an alias ("minilm", ProcessPoolEmbedder) or
+    # the model id itself
+    if model_name in EMBEDDING_MODEL_REGISTRY:
+        alias, model_name = model_name, EMBEDDING_MODEL_REGISTRY[model_name]
+    else:
+        alias = next((a for a, m in EMBEDDING_MODEL_REGISTRY.items() if m == model_name), None)
+    try:
+        tokenizer = load_tokenizer(alias) if alias else None
+    except Exception as e:
+        print(f"⚠️ No tokenizer for {model_name} ({type(e).__name__}); bucketing by characters")
+        tokenizer = None
+
+    if tokenizer is None:
+        return lambda texts: [len(t) for t in texts]
+
+    max_len = EMBEDDING_MAX_SEQ_LENGTH.get(model_name, 512)
+    lock = threading.Lock()  # fast tokenizers aren't safe to share across threads
+
+    def lengths(texts: List[str]) -> List[int]:
+        with lock:
+            counts = count_tokens(texts, tokenizer)
+        return [min(n + SPECIAL_TOKENS, max_len) for n in counts]
+
+    return lengths
+
+
+def padded_cost(lengths: List[int], bucket_size: int) -> int:
+    """
+    Token slots used when lengths are encoded bucket_size at a time, in order.
+    """
+    return sum(
+        max(lengths[i:i + bucket_size]) * len(lengths[i:i + bucket_size])
+        for i in range(0, len(lengths), bucket_size)
+    )
+
+
+class LengthBucketedEmbedder(BaseEmbedder):
+    def __init__(
+        self,
+        embedder,
+        bucket_size: int = EMBED_BUCKET_SIZE,
+        length_fn: Optional[Callable[[List[str]], List[int]]] = None,
+    ):
+        """
+        bucket_size: texts per encode call
+        length_fn:   texts → token lengths (default: the model's tokenizer)
+        """
+        self.inner = embedder
+        self.model_name = getattr(embedder, "model_name", type(embedder).__name__)
+        self.bucket_size = bucket_size
+        self.length_fn = length_fn or token_length_fn(self.model_name)
+
+        self._lock = threading.Lock()
+        self.real_tokens = 0
+        self.padded_tokens = 0
+        self.unsorted_padded_tokens = 0
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        texts = list(texts)
+        if len(texts) <= 1:
+            return np.asarray(self.inner.embed(texts), dtype=np.float32)
+
+        lengths = self.length_fn(texts)
+        order = np.argsort(lengths, kind="stable")
+        sorted_lengths = [lengths[i] for i in order]
+
+        out = None
+        for start in range(0, len(texts), self.bucket_size):
+            idx = order[start:start + self.bucket_size]
+            vectors = np.asarray(self.inner.embed([texts[i] for i in idx]), dtype=np.float32)
+            if out is None:
+                out = np.empty((len(texts), vectors.shape[1]), dtype=np.float32)
+            out[idx] = vectors
+
+        with self._lock:
+            self.real_tokens += sum(lengths)
+            self.padded_tokens += padded_cost(sorted_lengths, self.bucket_size)
+            self.unsorted_padded_tokens += padded_cost(lengths, self.bucket_size)
+
+        return out
+
+    def stats(self) -> dict:
+        """
+        padding_efficiency: real tokens / token slots encoded (1.0 = no padding).
+        unsorted_efficiency: the same for caller-order batches of bucket_size.
+        """
+        with self._lock:
+            return {
+                "real_tokens": self.real_tokens,
+                "padded_tokens": self.padded_tokens,
+                "padding_efficiency": self.real_tokens / self.padded_tokens if self.padded_tokens else 1.0,
+                "unsorted_efficiency": (
+                    self.real_tokens / self.unsorted_padded_tokens if self.unsorted_padded_tokens else 1.0
+                ),
+            }
+
+
+# One bucketed wrapper per embedder (kept on the embedder), so its
+# tokenizer is loaded once and its padding stats cover every ingest
+_bucketed = weakref.WeakSet()
+_bucketed_lock = threading.Lock()
+
+
+def for_ingest(embedder):
+    """
+    The embedder to use on ingest paths: length-bucketed unless
+    EMBED_LENGTH_BUCKETING is off. Idempotent, and the same embedder
+    always gets the same wrapper.
+    """
+    if not EMBED_LENGTH_BUCKETING or isinstance(embedder, LengthBucketedEmbedder):
+        return embedder
+
+    with _bucketed_lock:
+        wrapper = getattr(embedder, "_length_bucketed", None)
+        if wrapper is None:
+            wrapper = LengthBucketedEmbedder(embedder)
+            try:
+                embedder._length_bucketed = wrapper
+            except AttributeError:  # no attribute slots: no reuse
+                pass
+            _bucketed.add(wrapper)
+        return wrapper
+
+
+def ingest_padding_stats() -> Optional[dict]:
+    """
+    Padding stats summed over every for_ingest wrapper in this process,
+    or None if nothing has been ingested through one.
+    """
+    with _bucketed_lock:
+        wrappers = list(_bucketed)
+
+    real = padded = unsorted = 0
+    for wrapper in wrappers:
+        stats = wrapper.stats()
+        real += stats["real_tokens"]
+        padded += stats["padded_tokens"]
+        unsorted += wrapper.unsorted_padded_tokens
+
+    if not padded:
+        return None
+    return {
+        "real_tokens": real,
+        "padded_tokens": padded,
+        "padding_efficiency": real / padded,
+        "unsorted_efficiency": real / unsorted if unsorted else 1.0,
+    }
@@ -0,0 +1,227 @@
+# src/embedder/cached.py
+"""
+Two-tier embedding cache around any embedder.
+
+- memory: LRU of the most recently used vectors
+- disk:   sqlite table of float32 blobs, shared across processes/restarts
+
+Entries are keyed by (cache key, sha256 of whitespace-normalized text).
+The cache key is the model name plus the runtime when it isn't torch
+(e.g. "<model>#onnx-int8"), so switching models or backends never
+serves another one's vectors. Only misses reach the
+wrapped embedder, in a single batched call per embed().
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import List
+
+import numpy as np
+
+from src.embedder.base import BaseEmbedder
+
+# sqlite's default limit on bound parameters is 999
+_SQL_BATCH = 500
+
+
+def text_key(text: str) -> str:
+    """
+    Cache key for a text: whitespace runs don't change the tokens the
+    model sees, so they don't change the key either.
+    """
+    normalized = " ".join(text.split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def cache_key_of(embedder) -> str:
+    """
+    The first cache_key found down the wrapper chain (.inner), else the
+    model name.
+    """
+    inner = embedder
+    while inner is not None:
+        key = getattr(inner, "cache_key", None)
+        if key:
+            return key
+        inner = getattr(inner, "inner", None)
+    return getattr(embedder, "model_name", type(embedder).__name__)
+
+
+class CachedEmbedder(BaseEmbedder):
+    def __init__(
+        self,
+        embedder,
+        cache_dir: str | None = None,
+        memory_items: int = 10_000,
+        disk_items: int = 1_000_000,
+        model_name: str | None = None,
+    ):
+        """
+        embedder:      the embedder to wrap (anything with embed(texts))
+        cache_dir:     where embeddings.sqlite lives; None = memory tier only
+        memory_items:  max vectors kept in the in-process LRU
+        disk_items:    max vectors kept on disk; least recently used go first
+        model_name:    name and cache identity override (default: the
+                       embedder's model_name / cache_key_of(embedder))
+        """
+        self.inner = embedder
+        self.model_name = model_name or getattr(embedder, "model_name", type(embedder).__name__)
+        self.cache_key = model_name or cache_key_of(embedder)
+        self.memory_items = memory_items
+        self.disk_items = disk_items
+
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._db = None
+        self._disk_count = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._db = sqlite3.connect(
+                os.path.join(cache_dir, "embeddings.sqlite"),
+                check_same_thread=False,
+                timeout=30,
+            )
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                " model TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " vector BLOB NOT NULL,"
+                " last_used REAL NOT NULL,"
+                " PRIMARY KEY (model, key))"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)")
+            self._db.commit()
+            self._disk_count = self._db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    # -------------------------------------------------------------
+    # Memory tier
+    # -------------------------------------------------------------
+
+    def _memory_get(self, key: str):
+        vector = self._memory.get(key)
+        if vector is not None:
+            self._memory.move_to_end(key)
+        return vector
+
+    def _memory_put(self, key: str, vector: np.ndarray):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    # -------------------------------------------------------------
+    # Disk tier
+    # -------------------------------------------------------------
+
+    def _disk_get(self, keys: list[str]) -> dict:
+        found = {}
+        for start in range(0, len(keys), _SQL_BATCH):
+            batch = keys[start:start + _SQL_BATCH]
+            rows = self._db.execute(
+                f"SELECT key, vector FROM embeddings WHERE model = ? AND key IN ({','.join('?' * len(batch))})",
+                [self.cache_key, *batch],
+            ).fetchall()
+            for key, blob in rows:
+                found[key] = np.frombuffer(blob, dtype=np.float32)
+
+        if found:
+            self._db.executemany(
+                "UPDATE embeddings SET last_used = ? WHERE model = ? AND key = ?",
+                [(time.time(), self.cache_key, key) for key in found],
+            )
+            self._db.commit()
+        return found
+
+    def _disk_put(self, entries: dict):
+        now = time.time()
+        cursor = self._db.executemany(
+            "INSERT OR REPLACE INTO embeddings (model, key, vector, last_used) VALUES (?, ?, ?, ?)",
+            [(self.cache_key, key, vector.tobytes(), now) for key, vector in entries.items()],
+        )
+        self._disk_count += cursor.rowcount if cursor.rowcount > 0 else len(entries)
+
+        # Evict down to 90% so eviction doesn't run on every insert
+        if self._disk_count > self.disk_items:
+            self._disk_count = self._db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            excess = self._disk_count - int(self.disk_items * 0.9)
+            if excess > 0:
+                self._db.execute(
+                    "DELETE FROM embeddings WHERE rowid IN"
+                    " (SELECT rowid FROM embeddings ORDER BY last_used LIMIT ?)",
+                    (excess,),
+                )
+                self._disk_count -= excess
+        self._db.commit()
+
+    # -------------------------------------------------------------
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.asarray(self.inner.embed([]), dtype=np.float32)
+
+        keys = [text_key(t) for t in texts]
+        vectors = {}
+
+        with self._lock:
+            for key in keys:
+                if key in vectors:
+                    continue
+                vector = self._memory_get(key)
+                if vector is not None:
+                    vectors[key] = vector
+                    self.memory_hits += 1
+
+            missing = [k for k in dict.fromkeys(keys) if k not in vectors]
+            if missing and self._db is not None:
+                for key, vector in self._disk_get(missing).items():
+                    vectors[key] = vector
+                    self._memory_put(key, vector)
+                    self.disk_hits += 1
+
+        # One call for every distinct text neither tier had
+        todo = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors:
+                todo.setdefault(key, text)
+
+        if todo:
+            computed = np.asarray(self.inner.embed(list(todo.values())), dtype=np.float32)
+            # Copies, so cached rows don't pin the whole batch array
+            fresh = {key: row.copy() for key, row in zip(todo, computed)}
+            vectors.update(fresh)
+
+            with self._lock:
+                self.misses += len(fresh)
+                for key, vector in fresh.items():
+                    self._memory_put(key, vector)
+                if self._db is not None:
+                    self._disk_put(fresh)
+
+        return np.stack([vectors[key] for key in keys])
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                "memory_items": len(self._memory),
+                "disk_items": self._disk_count,
+            }
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -1,11 +1,51 @@
 # src/embedders/factory.py
 from typing import Any
-from .sentence_transformer_embedder import SentenceTransformerEmbedder
-from .model_registry import EMBEDDING_MODEL_REGISTRY
+from .shared import get_base_embedder
+from .model_registry import EMBEDDING_MODEL_REGISTRY, EMBEDDING_BACKENDS
+from src.config import (
+    EMBEDDING_CACHE_ENABLED,
+    EMBEDDING_CACHE_DIR,
+    EMBEDDING_CACHE_MEMORY_ITEMS,
+    EMBEDDING_CACHE_DISK_ITEMS,
+    EMBEDDING_MICRO_BATCH_SIZE,
+    EMBEDDING_MICRO_BATCH_WAIT_MS,
+)
 
-def create_embedder(embedder_name: str) -> Any:
+def create_embedder(
+    embedder_name: str,
+    cache: bool | None = None,
+    micro_batch: bool = False,
+) -> Any:
+    """
+    micro_batch=True puts a scheduler in front of the model that merges
+    concurrent small embed() calls (meant for the API). The cache sits
+    outside it, so cache hits never wait for a batch.
+
+    The model underneath is shared process-wide (see shared.py); only
+    the wrappers are new per call.
+    """
     model_name = EMBEDDING_MODEL_REGISTRY.get(embedder_name)
     if not model_name:
         raise ValueError(f"Unsupported embedding model: {embedder_name}")
 
-    return SentenceTransformerEmbedder(model_name=model_name)
+    backend = EMBEDDING_BACKENDS.get(embedder_name, "torch")
+    embedder = get_base_embedder(model_name, backend)
+
+    if micro_batch:
+        from .batching import MicroBatchingEmbedder
+        embedder = MicroBatchingEmbedder(
+            embedder,
+            max_batch=EMBEDDING_MICRO_BATCH_SIZE,
+            max_wait=EMBEDDING_MICRO_BATCH_WAIT_MS / 1000,
+        )
+
+    if EMBEDDING_CACHE_ENABLED if cache is None else cache:
+        from .cached import CachedEmbedder
+        embedder = CachedEmbedder(
+            embedder,
+            cache_dir=EMBEDDING_CACHE_DIR or None,
+            memory_items=EMBEDDING_CACHE_MEMORY_ITEMS,
+            disk_items=EMBEDDING_CACHE_DISK_ITEMS,
+        )
+
+    return embedder
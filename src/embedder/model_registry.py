@@ -5,4 +5,18 @@ MINILM = "sentence-transformers/all-MiniLM-L6-v2"
 EMBEDDING_MODEL_REGISTRY = {
     "minilm": MINILM,
     "all-MiniLM-L6-v2": MINILM,
+    "minilm-onnx": MINILM,
+    "minilm-onnx-int8": MINILM,
+}
+
+# Runtime used per alias; anything not listed runs on PyTorch
+# (sentence-transformers)
+EMBEDDING_BACKENDS = {
+    "minilm-onnx": "onnx",
+    "minilm-onnx-int8": "onnx-int8",
+}
+
+# Max word-pieces the model sees per text (longer inputs are truncated)
+EMBEDDING_MAX_SEQ_LENGTH = {
+    MINILM: 256,
 }
@@ -0,0 +1,210 @@
+# src/embedder/onnx_embedder.py
+"""
+ONNX Runtime backend for sentence-transformers style models.
+
+On first use the Hugging Face model is exported to ONNX (optionally
+dynamically quantized to int8) and cached on disk together with its
+tokenizer; later runs only load the cached files, without torch.
+Embeddings are mean-pooled and L2-normalized like the all-MiniLM
+sentence-transformers pipeline.
+
+Exporting needs torch + onnx; running only needs onnxruntime.
+"""
+
+import os
+import re
+import tempfile
+import threading
+from typing import List
+
+import numpy as np
+
+from src.config import ONNX_CACHE_DIR, ONNX_INTRA_OP_THREADS
+from src.embedder.base import BaseEmbedder
+from src.embedder.model_registry import EMBEDDING_MAX_SEQ_LENGTH
+
+FP32_FILE = "model.onnx"
+INT8_FILE = "model.int8.onnx"
+INPUT_NAMES = ["input_ids", "attention_mask", "token_type_ids"]
+
+
+def model_cache_dir(model_name: str, cache_dir: str = ONNX_CACHE_DIR) -> str:
+    return os.path.join(cache_dir, re.sub(r"[^A-Za-z0-9_.-]+", "__", model_name))
+
+
+# ============================================================
+# Export
+# ============================================================
+
+def export_onnx(model_name: str, out_dir: str, opset: int = 17) -> str:
+    """
+    Exports model_name (hub id or local path) to out_dir/model.onnx and
+    saves its tokenizer next to it. Returns the model path.
+    """
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+
+    os.makedirs(out_dir, exist_ok=True)
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModel.from_pretrained(model_name)
+    model.eval()
+
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    inputs = tuple(sample[name] for name in INPUT_NAMES if name in sample)
+    input_names = [name for name in INPUT_NAMES if name in sample]
+
+    class _Encoder(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, *args):
+            return self.model(**dict(zip(input_names, args))).last_hidden_state
+
+    path = os.path.join(out_dir, FP32_FILE)
+    tmp = tempfile.NamedTemporaryFile(dir=out_dir, suffix=".onnx.tmp", delete=False).name
+
+    with torch.no_grad():
+        torch.onnx.export(
+            _Encoder(model),
+            inputs,
+            tmp,
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes={name: {0: "batch", 1: "sequence"} for name in input_names + ["last_hidden_state"]},
+            opset_version=opset,
+            dynamo=False,
+        )
+
+    tokenizer.save_pretrained(out_dir)
+    os.replace(tmp, path)
+    return path
+
+
+def quantize_int8(fp32_path: str, out_path: str) -> str:
+    """
+    Dynamic (weight-only, per-channel) int8 quantization of an exported model.
+    """
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    tmp = out_path + ".tmp"
+    quantize_dynamic(fp32_path, tmp, weight_type=QuantType.QInt8, per_channel=True)
+    os.replace(tmp, out_path)
+    return out_path
+
+
+def ensure_onnx_model(model_name: str, quantize: bool = False, cache_dir: str = ONNX_CACHE_DIR) -> str:
+    """
+    Path of the cached ONNX model, exporting / quantizing it first if needed.
+    """
+    out_dir = model_cache_dir(model_name, cache_dir)
+    fp32_path = os.path.join(out_dir, FP32_FILE)
+
+    if not os.path.exists(fp32_path):
+        print(f"Exporting {model_name} to ONNX → {out_dir}")
+        export_onnx(model_name, out_dir)
+
+    if not quantize:
+        return fp32_path
+
+    int8_path = os.path.join(out_dir, INT8_FILE)
+    if not os.path.exists(int8_path):
+        print(f"Quantizing {fp32_path} to int8")
+        quantize_int8(fp32_path, int8_path)
+    return int8_path
+
+
+# ============================================================
+# Embedder
+# ============================================================
+
+class OnnxEmbedder(BaseEmbedder):
+    def __init__(
+        self,
+        model_name: str,
+        quantize: bool = False,
+        cache_dir: str = ONNX_CACHE_DIR,
+        intra_op_threads: int | None = ONNX_INTRA_OP_THREADS,
+        max_seq_length: int | None = None,
+    ):
+        """
+        intra_op_threads: threads per inference call (None = onnxruntime
+        default, one per physical core). Inter-op parallelism is off:
+        an encoder graph is a single chain of ops.
+        """
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        self.model_name = model_name
+        self.quantize = quantize
+        # ONNX (and int8 even more so) vectors only approximate the torch
+        # ones: CachedEmbedder keeps them apart
+        self.cache_key = f"{model_name}#onnx{'-int8' if quantize else ''}"
+        self.max_seq_length = max_seq_length or EMBEDDING_MAX_SEQ_LENGTH.get(model_name, 512)
+
+        self.model_path = ensure_onnx_model(model_name, quantize=quantize, cache_dir=cache_dir)
+        self.tokenizer = AutoTokenizer.from_pretrained(os.path.dirname(self.model_path))
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.inter_op_num_threads = 1
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+
+        self.session = ort.InferenceSession(
+            self.model_path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self._input_names = {i.name for i in self.session.get_inputs()}
+
+        # Hidden size is a static axis of the export
+        hidden = self.session.get_outputs()[0].shape[-1]
+        self.dim = hidden if isinstance(hidden, int) else None
+
+        # Fast tokenizers aren't safe to call concurrently; sessions are
+        self._tokenizer_lock = threading.Lock()
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            if self.dim is None:
+                self.dim = self.embed([""]).shape[1]
+            return np.empty((0, self.dim), dtype=np.float32)
+
+        with self._tokenizer_lock:
+            encoded = self.tokenizer(
+                list(texts),
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np",
+            )
+        feeds = {k: v.astype(np.int64) for k, v in encoded.items() if k in self._input_names}
+        hidden = self.session.run(None, feeds)[0]
+
+        # Mean pooling over real tokens, then L2 normalization
+        mask = encoded["attention_mask"][..., None].astype(np.float32)
+        pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+
+        return np.ascontiguousarray(pooled, dtype=np.float32)
+
+
+def check_parity(embedder, reference, texts: List[str]) -> dict:
+    """
+    Cosine similarity between two embedders' vectors for the same texts
+    (e.g. ONNX vs. the PyTorch sentence-transformers model).
+    """
+    a = np.asarray(embedder.embed(texts), dtype=np.float32)
+    b = np.asarray(reference.embed(texts), dtype=np.float32)
+
+    a /= np.clip(np.linalg.norm(a, axis=1, keepdims=True), 1e-12, None)
+    b /= np.clip(np.linalg.norm(b, axis=1, keepdims=True), 1e-12, None)
+    cosine = (a * b).sum(axis=1)
+
+    return {
+        "texts": len(texts),
+        "min_cosine": float(cosine.min()),
+        "mean_cosine": float(cosine.mean()),
+        "max_abs_diff": float(np.abs(a - b).max()),
+    }
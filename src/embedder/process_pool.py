@@ -0,0 +1,153 @@
+# src/embedder/process_pool.py
+"""
+Multi-process embedding for bulk indexing.
+
+Texts are split into shards and embedded by a pool of worker processes,
+each holding its own model copy with a pinned torch thread count. For
+short sequences one torch process can't keep a many-core box busy;
+several smaller processes can. Output order always matches input order.
+"""
+
+import multiprocessing as mp
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from src.embedder.base import BaseEmbedder
+from src.embedder.model_registry import EMBEDDING_MODEL_REGISTRY, EMBEDDING_BACKENDS
+
+# Set in each worker process by _init_worker
+_worker_embedder = None
+
+
+def _load_embedder(embedder_name: str):
+    from src.embedder.factory import create_embedder
+    return create_embedder(embedder_name, cache=False)
+
+
+def _init_worker(embedder_name: str, threads: int, factory: Optional[Callable]):
+    global _worker_embedder
+
+    # Pin intra-op threads before torch spins up its pools
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    os.environ["MKL_NUM_THREADS"] = str(threads)
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+
+    _worker_embedder = (factory or _load_embedder)(embedder_name)
+
+
+def _embed_shard(texts: List[str]) -> np.ndarray:
+    return np.asarray(_worker_embedder.embed(texts), dtype=np.float32)
+
+
+def _ping(delay: float) -> int:
+    # Holds the worker briefly so every ping lands on a different process
+    time.sleep(delay)
+    return os.getpid()
+
+
+class ProcessPoolEmbedder(BaseEmbedder):
+    def __init__(
+        self,
+        embedder_name: str,
+        workers: int | None = None,
+        threads_per_worker: int | None = None,
+        shard_size: int = 64,
+        factory: Optional[Callable] = None,
+    ):
+        """
+        workers:             model processes (None = CPU count // 4)
+        threads_per_worker:  torch threads per process (None = CPUs / workers)
+        shard_size:          texts per task; calls larger than this are
+                             split across workers
+        factory:             picklable embedder_name → embedder callable
+                             (defaults to create_embedder)
+        """
+        cpus = os.cpu_count() or 1
+        self.model_name = embedder_name
+        # Same cache identity as the embedder the workers build
+        model = EMBEDDING_MODEL_REGISTRY.get(embedder_name, embedder_name)
+        backend = EMBEDDING_BACKENDS.get(embedder_name, "torch")
+        self.cache_key = model if backend == "torch" else f"{model}#{backend}"
+        self.workers = workers or max(1, cpus // 4)
+        self.threads_per_worker = threads_per_worker or max(1, cpus // self.workers)
+        self.shard_size = shard_size
+
+        # spawn: forked torch/tokenizer state is not fork-safe
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=mp.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(embedder_name, self.threads_per_worker, factory),
+        )
+
+        # Known after the first embed (or asked of a worker by .dim)
+        self._dim = None
+
+        # Wall-clock span of embedding work; calls may run concurrently
+        self.texts = 0
+        self._first_start = None
+        self._last_end = None
+        self._lock = threading.Lock()
+
+    def warm_up(self) -> float:
+        """
+        Starts every worker and loads its model now instead of on the
+        first shards. Returns the seconds it took.
+        """
+        started = time.perf_counter()
+        list(self._pool.map(_ping, [0.2] * self.workers))
+        return time.perf_counter() - started
+
+    @property
+    def dim(self) -> int:
+        if self._dim is None:
+            self._dim = self._pool.submit(_embed_shard, [""]).result().shape[1]
+        return self._dim
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        texts = list(texts)
+        if not texts:
+            return np.empty((0, self.dim), dtype=np.float32)
+
+        with self._lock:
+            if self._first_start is None:
+                self._first_start = time.perf_counter()
+
+        shards = [texts[i:i + self.shard_size] for i in range(0, len(texts), self.shard_size)]
+        vectors = np.concatenate(list(self._pool.map(_embed_shard, shards)))
+        self._dim = vectors.shape[1]
+
+        with self._lock:
+            self.texts += len(texts)
+            self._last_end = time.perf_counter()
+        return vectors
+
+    def stats(self) -> dict:
+        with self._lock:
+            seconds = (self._last_end - self._first_start) if self._last_end else 0.0
+            return {
+                "workers": self.workers,
+                "threads_per_worker": self.threads_per_worker,
+                "texts": self.texts,
+                "seconds": seconds,
+                "chunks_per_s": self.texts / seconds if seconds else 0.0,
+            }
+
+    def close(self):
+        self._pool.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
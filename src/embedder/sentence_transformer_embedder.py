@@ -1,4 +1,6 @@
 # src/embedders/sentence_transformers_embedder.py
+import threading
+import numpy as np
 from sentence_transformers import SentenceTransformer
 from typing import List
 
@@ -6,13 +8,23 @@ class SentenceTransformerEmbedder:
     """
     Simple wrapper around SentenceTransformers.
     Automatically downloads model if missing.
+
+    Thread-safe: fast tokenizers fail on concurrent use ("Already
+    borrowed"), so encode calls on one instance are serialized. Use
+    src.embedder.shared to get the process-wide instance.
     """
     def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
         self.model_name = model_name
         self.model = SentenceTransformer(model_name)
+        self._lock = threading.Lock()
 
-    def embed(self, texts: List[str]) -> List[List[float]]:
+    def embed(self, texts: List[str]) -> np.ndarray:
         """
-        Generate embeddings for a list of texts.
+        Generate embeddings for a list of texts as a (n, dim) float32 array.
         """
-        return self.model.encode(texts, convert_to_numpy=True).tolist()
+        if not texts:
+            return np.empty((0, self.model.get_sentence_embedding_dimension()), dtype=np.float32)
+
+        with self._lock:
+            vectors = self.model.encode(list(texts), convert_to_numpy=True)
+        return np.ascontiguousarray(vectors, dtype=np.float32)
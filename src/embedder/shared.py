@@ -0,0 +1,70 @@
+# src/embedder/shared.py
+"""
+Process-wide embedder instances.
+
+Loading MiniLM costs seconds and a few hundred MB, so every part of a
+process (API, vector store, scripts, EmbeddingModel) gets the same model
+object from here instead of loading its own. Models are loaded lazily,
+on first request, under a lock; embedders themselves are thread-safe.
+"""
+
+import threading
+
+from src.config import EMBEDDING_MODEL_NAME
+
+_lock = threading.RLock()
+_models = {}     # (backend, model_name) -> model embedder
+_embedders = {}  # (embedder_name, cache, micro_batch) -> wrapped embedder
+
+
+def get_base_embedder(model_name: str, backend: str = "torch"):
+    """
+    The one model embedder for (backend, model_name), loading it if needed.
+    backend: "torch", "onnx" or "onnx-int8".
+    """
+    key = (backend, model_name)
+
+    with _lock:
+        if key not in _models:
+            if backend in ("onnx", "onnx-int8"):
+                from .onnx_embedder import OnnxEmbedder
+                _models[key] = OnnxEmbedder(model_name=model_name, quantize=backend == "onnx-int8")
+            else:
+                from .sentence_transformer_embedder import SentenceTransformerEmbedder
+                _models[key] = SentenceTransformerEmbedder(model_name=model_name)
+
+        return _models[key]
+
+
+def get_shared_embedder(
+    embedder_name: str = EMBEDDING_MODEL_NAME,
+    cache: bool | None = None,
+    micro_batch: bool = False,
+):
+    """
+    Shared create_embedder(embedder_name, cache, micro_batch): the same
+    arguments always return the same instance, so e.g. every API request
+    goes through one micro-batching scheduler.
+    """
+    from .factory import create_embedder
+
+    key = (embedder_name, cache, micro_batch)
+
+    with _lock:
+        if key not in _embedders:
+            _embedders[key] = create_embedder(embedder_name, cache=cache, micro_batch=micro_batch)
+        return _embedders[key]
+
+
+def loaded_models() -> list[str]:
+    """
+    Names of the models loaded in this process, e.g. for readiness checks.
+    """
+    with _lock:
+        return [f"{model_name} ({backend})" for backend, model_name in _models]
+
+
+def clear_shared_embedders():
+    with _lock:
+        _models.clear()
+        _embedders.clear()
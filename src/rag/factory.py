@@ -1,22 +1,23 @@
 # src/rag/factory.py
 from src.rag.pipeline import RAGPipeline
-from src.search.retriever_adapter import SemanticSearchRetriever
+from src.search.retriever_adapter import SemanticSearchRetriever, HybridRetriever
 from src.search.reranker import BaseRanker, LocalSimpleRanker
-from src.vectorstore.db_store import ChromaStore
+from src.vectorstore.factory import create_vector_store
 from src.llm.gemini import GeminiLLMClient
 from src.prompts.prompt_builder import PromptBuilder
-from src.config import CHROMA_DIR
+from src.config import CHROMA_DIR, RETRIEVER_MODE
 
 
-def create_rag_pipeline() -> RAGPipeline:
-    # 1. Shared infrastructure
-    store = ChromaStore(persist_dir=CHROMA_DIR)
+def create_rag_pipeline(embedder=None) -> RAGPipeline:
+    # 1. Shared infrastructure (embedder=None → the store builds its own)
+    store = create_vector_store(persist_dir=CHROMA_DIR, embedder=embedder)
 
     # 2. Ranking
     ranker: BaseRanker = LocalSimpleRanker()
 
-    # 3. Retriever
-    retriever = SemanticSearchRetriever(
+    # 3. Retriever (RETRIEVER_MODE=hybrid adds BM25 via rank fusion)
+    retriever_cls = HybridRetriever if RETRIEVER_MODE == "hybrid" else SemanticSearchRetriever
+    retriever = retriever_cls(
         store=store,
         ranker=ranker,
     )
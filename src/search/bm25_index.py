@@ -0,0 +1,249 @@
+# src/search/bm25_index.py
+"""
+Persistent BM25 inverted index over chunk texts.
+
+Each document's term counts are stored as one row of a small sqlite
+file next to the vector collection; the postings (term → {doc: term
+frequency}) are rebuilt from them on open, kept in memory for scoring
+and brought up to date when another process writes to the file. ChromaStore updates the index on every add / upsert /
+delete, so it grows incrementally with ingestion. A query only touches
+the postings of its own terms: rare terms such as product codes and
+names are answered without looking at the rest of the corpus.
+"""
+
+import heapq
+import json
+import math
+import re
+import sqlite3
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+# Words joined by - . / _ (product codes, versions, file names) are kept
+# whole and also split into their parts
+_TOKEN = re.compile(r"\w+(?:[-./]\w+)*")
+_PARTS = re.compile(r"[^\W_]+")
+
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have how i if in into is it its of on or "
+    "that the their there these this to was were what when where which who why will with "
+    "you your".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    tokens = []
+    for token in _TOKEN.findall(text.lower()):
+        if token.isalnum():
+            tokens.append(token)
+            continue
+        parts = _PARTS.findall(token)
+        if len(parts) > 1:
+            tokens.append(token)
+        tokens += parts
+    return [t for t in tokens if t not in STOPWORDS]
+
+
+class BM25Index:
+    """
+    search(query, top_k) returns [(chunk_id, score)], best first.
+
+    The index is thread-safe, and several processes may share one file
+    (the API and an ingest script): sqlite numbers the documents, and
+    each handle folds in other processes' commits before it reads or
+    writes (PRAGMA data_version).
+    """
+
+    def __init__(self, path: str = ":memory:", k1: float = 1.5, b: float = 0.75):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+
+        self._lock = threading.RLock()
+        # Autocommit; writes open their own BEGIN IMMEDIATE transaction
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._init_schema()
+
+        with self._lock:
+            self._reset_memory()
+            self._refresh()
+
+    def _init_schema(self):
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            # terms: JSON {term: tf}; one row per document keeps writes cheap.
+            # AUTOINCREMENT never reuses a number, so "doc > last seen"
+            # finds every document another process added
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS docs ("
+                "doc INTEGER PRIMARY KEY AUTOINCREMENT, chunk_id TEXT UNIQUE, length INTEGER, terms TEXT)"
+            )
+
+    def _reset_memory(self):
+        # Documents are numbered internally; chunk ids are only mapped
+        # back for the results
+        self._docs = {}      # chunk_id -> doc
+        self._ids = {}       # doc -> chunk_id
+        self._lengths = {}   # doc -> tokens
+        self._terms = {}     # doc -> terms (to drop its postings)
+        self._postings = {}  # term -> {doc: tf}
+        self._total_length = 0
+        self._max_doc = 0
+        self._data_version = None
+
+    # -------------------------------------------------------------
+    # In-memory postings
+    # -------------------------------------------------------------
+
+    def _remember(self, doc: int, chunk_id: str, length: int, counts: dict):
+        self._docs[chunk_id] = doc
+        self._ids[doc] = chunk_id
+        self._lengths[doc] = length
+        self._total_length += length
+        self._max_doc = max(self._max_doc, doc)
+
+        terms = tuple(sys.intern(term) for term in counts)
+        self._terms[doc] = terms
+        for term in terms:
+            self._postings.setdefault(term, {})[doc] = counts[term]
+
+    def _forget(self, doc: int):
+        for term in self._terms.pop(doc):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc, None)
+                if not postings:
+                    del self._postings[term]
+
+        self._total_length -= self._lengths.pop(doc)
+        chunk_id = self._ids.pop(doc)
+        if self._docs.get(chunk_id) == doc:
+            del self._docs[chunk_id]
+
+    def _refresh(self):
+        """
+        Applies commits made through other connections since the last
+        look. Replaced documents get a new number, so added and deleted
+        numbers cover every change.
+        """
+        (version,) = self._conn.execute("PRAGMA data_version").fetchone()
+        if version == self._data_version:
+            return
+
+        current = {doc for (doc,) in self._conn.execute("SELECT doc FROM docs")}
+        for doc in [doc for doc in self._ids if doc not in current]:
+            self._forget(doc)
+
+        rows = self._conn.execute(
+            "SELECT doc, chunk_id, length, terms FROM docs WHERE doc > ?", (self._max_doc,)
+        ).fetchall()
+        for doc, chunk_id, length, terms in rows:
+            old = self._docs.get(chunk_id)
+            if old is not None:
+                self._forget(old)
+            self._remember(doc, chunk_id, length, json.loads(terms))
+
+        self._data_version = version
+
+    @contextmanager
+    def _write(self):
+        """
+        One write transaction, holding sqlite's write lock from the start
+        so no other process commits between the refresh and the write.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._refresh()
+                yield
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                # Memory may already hold the rolled back changes
+                self._reset_memory()
+                self._refresh()
+                raise
+
+    # -------------------------------------------------------------
+    # Writes
+    # -------------------------------------------------------------
+
+    def _delete(self, doc: int):
+        self._conn.execute("DELETE FROM docs WHERE doc = ?", (doc,))
+        self._forget(doc)
+
+    def add(self, chunk_ids, texts, replace: bool = True):
+        """
+        Indexes texts under chunk_ids. With replace=False, ids already in
+        the index are left untouched (like Chroma's add).
+        """
+        with self._write():
+            for chunk_id, text in zip(chunk_ids, texts):
+                old = self._docs.get(chunk_id)
+                if old is not None:
+                    if not replace:
+                        continue
+                    self._forget(old)
+
+                counts = Counter(tokenize(text or ""))
+                length = sum(counts.values())
+
+                # REPLACE drops a conflicting row and the new one gets a
+                # fresh number, so other handles see the change
+                (doc,) = self._conn.execute(
+                    "INSERT OR REPLACE INTO docs (chunk_id, length, terms) VALUES (?, ?, ?) RETURNING doc",
+                    (chunk_id, length, json.dumps(counts)),
+                ).fetchone()
+                self._remember(doc, chunk_id, length, counts)
+
+    def remove(self, chunk_ids):
+        with self._write():
+            for chunk_id in chunk_ids:
+                doc = self._docs.get(chunk_id)
+                if doc is not None:
+                    self._delete(doc)
+
+    def clear(self):
+        with self._write():
+            self._conn.execute("DELETE FROM docs")
+            for doc in list(self._ids):
+                self._forget(doc)
+
+    # -------------------------------------------------------------
+    # Search
+    # -------------------------------------------------------------
+
+    def search(self, query: str, top_k: int = 5) -> list[tuple[str, float]]:
+        terms = set(tokenize(query))
+
+        with self._lock:
+            self._refresh()
+            n = len(self._lengths)
+            if not n or not terms:
+                return []
+            avg_length = self._total_length / n or 1.0
+
+            scores = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+
+                df = len(postings)
+                idf = math.log(1.0 + (n - df + 0.5) / (df + 0.5))
+                for doc, tf in postings.items():
+                    norm = self.k1 * (1.0 - self.b + self.b * self._lengths[doc] / avg_length)
+                    scores[doc] = scores.get(doc, 0.0) + idf * tf * (self.k1 + 1.0) / (tf + norm)
+
+            best = heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+            return [(self._ids[doc], score) for doc, score in best]
+
+    def __len__(self):
+        with self._lock:
+            self._refresh()
+            return len(self._docs)
+
+    def close(self):
+        self._conn.close()
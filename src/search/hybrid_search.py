@@ -0,0 +1,101 @@
+# src/search/hybrid_search.py
+"""
+Hybrid retrieval: BM25 and vector search fused by reciprocal rank fusion.
+
+Both indexes are queried at the same time (BM25 in a worker thread while
+the query is embedded and searched). RRF only looks at ranks, so the two
+incomparable score scales never have to be calibrated against each
+other: a document scores sum(1 / (k + rank)) over the lists it is in.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple, Optional
+
+from src.vectorstore.db_store import ChromaStore
+from src.search.vector_search import vector_search
+from src.config import HYBRID_CANDIDATES, RRF_K
+
+ScorePair = Tuple[str, float]
+
+_lexical_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="bm25")
+
+
+def lexical_search(query: str, store: ChromaStore, top_k: int = 5) -> List[ScorePair]:
+    """
+    BM25 search over the store's bm25_index.
+    Returns: List of (text, bm25 score)
+    """
+    index = getattr(store, "bm25_index", None)
+    if index is None:
+        return []
+
+    hits = index.search(query, top_k=top_k)
+    if not hits:
+        return []
+
+    found = store.collection.get(ids=[chunk_id for chunk_id, _ in hits], include=["documents"])
+    texts = dict(zip(found["ids"], found.get("documents") or []))
+    return [(texts[chunk_id], score) for chunk_id, score in hits if texts.get(chunk_id)]
+
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = RRF_K) -> List[ScorePair]:
+    """
+    rankings: lists of texts, best first.
+    Returns: List of (text, rrf score), best first.
+    """
+    scores = {}
+    for ranking in rankings:
+        seen = set()
+        for rank, text in enumerate(ranking, start=1):
+            if text in seen:
+                continue
+            seen.add(text)
+            scores[text] = scores.get(text, 0.0) + 1.0 / (k + rank)
+
+    return sorted(scores.items(), key=lambda x: x[1], reverse=True)
+
+
+def hybrid_search(
+    query: str,
+    store: Optional[ChromaStore] = None,
+    top_k: int = 5,
+    candidates: int = HYBRID_CANDIDATES,
+    k: int = RRF_K,
+) -> List[ScorePair]:
+    """
+    Fuses the top `candidates` of BM25 and vector search.
+    Returns: List of (text, score); scores are RRF scaled so that a
+    document ranked first by both indexes scores 1.0.
+    """
+    if not query or not query.strip():
+        print("Empty query")
+        return []
+
+    if store is None:
+        print("No Chroma store provided")
+        return []
+
+    depth = max(top_k, candidates)
+
+    # -------------------------
+    # Both indexes at once
+    # -------------------------
+    lexical_future = _lexical_pool.submit(lexical_search, query, store, depth)
+    vec_res = vector_search(query, top_k=depth, store=store)
+
+    try:
+        lex_res = lexical_future.result()
+    except Exception as e:
+        print("BM25 search failed:", e)
+        lex_res = []
+
+    # -------------------------
+    # Fusion
+    # -------------------------
+    fused = reciprocal_rank_fusion(
+        [[text for text, _ in vec_res], [text for text, _ in lex_res]],
+        k=k,
+    )
+
+    best = 2.0 / (k + 1)
+    return [(text, score / best) for text, score in fused[:top_k]]
@@ -0,0 +1,113 @@
+# src/search/result_cache.py
+"""
+Query-result cache for vector search.
+
+Entries are keyed by (normalized query, top_k, collection name and
+directory, collection version). Every write to a store bumps its
+version in a counter shared through the store's directory, so a cached
+result is never served after the collection changed, whichever process
+wrote to it.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from src.config import QUERY_CACHE_ENABLED, QUERY_CACHE_MAX_ITEMS, QUERY_CACHE_TTL_SECONDS
+
+
+def normalize_query(query: str) -> str:
+    # Whitespace runs don't change the tokens the model sees
+    return " ".join(query.split())
+
+
+class QueryResultCache:
+    def __init__(self, max_items: int = QUERY_CACHE_MAX_ITEMS, ttl: float = QUERY_CACHE_TTL_SECONDS):
+        """
+        max_items: entries kept; least recently used are evicted
+        ttl:       seconds an entry stays valid (0 = no expiry)
+        """
+        self.max_items = max_items
+        self.ttl = ttl
+
+        self._items = OrderedDict()  # key -> (stored_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(query: str, top_k: int, store) -> tuple:
+        """
+        Must be taken before searching: a write racing the search bumps
+        the version, so its result lands under a key nobody asks for again.
+        """
+        return (
+            normalize_query(query),
+            top_k,
+            getattr(store, "persist_dir", None),
+            store.collection.name,
+            getattr(store, "version", 0),
+        )
+
+    def get(self, key) -> Optional[Any]:
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is not None and self.ttl and time.monotonic() - entry[0] > self.ttl:
+                del self._items[key]
+                self.expired += 1
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._items.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = (time.monotonic(), value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "items": len(self._items),
+                "max_items": self.max_items,
+                "ttl_seconds": self.ttl,
+            }
+
+
+_cache: Optional[QueryResultCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_query_cache() -> Optional[QueryResultCache]:
+    """
+    The process-wide cache, or None when QUERY_CACHE_ENABLED is off.
+    """
+    global _cache
+    if not QUERY_CACHE_ENABLED:
+        return None
+
+    with _cache_lock:
+        if _cache is None:
+            _cache = QueryResultCache()
+        return _cache
@@ -2,6 +2,8 @@
 
 from src.rag.pipeline import RetrievedDoc
 from src.search.semantic_search import semantic_search
+from src.search.hybrid_search import hybrid_search
+from src.config import HYBRID_CANDIDATES, RRF_K
 
 
 class SemanticSearchRetriever:
@@ -39,3 +41,47 @@ class SemanticSearchRetriever:
             docs = self.ranker.rerank(query, docs)
 
         return docs
+
+
+class HybridRetriever(SemanticSearchRetriever):
+    """
+    Like SemanticSearchRetriever, but fuses BM25 and vector search
+    with reciprocal rank fusion (see src/search/hybrid_search.py).
+    """
+
+    def __init__(self, store, ranker=None, candidates: int = HYBRID_CANDIDATES, k: int = RRF_K):
+        super().__init__(store, ranker)
+        self.candidates = candidates
+        self.k = k
+
+        index = getattr(store, "bm25_index", None)
+        if index is None:
+            print("BM25 index disabled (BM25_ENABLED=false); hybrid retrieval falls back to vector search")
+        elif not len(index) and store.collection.count():
+            print("BM25 index is empty; run scripts/build_bm25_index.py to index existing documents")
+
+    def search(self, query: str, top_k: int = 5):
+        # Step 1: BM25 + vector search, fused
+        results = hybrid_search(
+            query=query,
+            store=self.store,
+            top_k=top_k,
+            candidates=self.candidates,
+            k=self.k,
+        )
+
+        # Step 2: Normalize to RetrievedDoc
+        docs = [
+            RetrievedDoc(
+                text=text,
+                score=score,
+                id=str(i),
+            )
+            for i, (text, score) in enumerate(results)
+        ]
+
+        # Step 3: Optional reranking
+        if self.ranker:
+            docs = self.ranker.rerank(query, docs)
+
+        return docs
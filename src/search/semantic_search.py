@@ -2,7 +2,7 @@
 
 from typing import List, Tuple, Optional
 from src.vectorstore.db_store import ChromaStore
-from .vector_search import vector_search
+from .vector_search import vector_search, vector_search_many
 
 ScorePair = Tuple[str, float]
 
@@ -36,3 +36,19 @@ def semantic_search(
 
     # vec_res = [(text, distance_score), ...]
     return vec_res[:top_k]
+
+
+def semantic_search_many(
+    queries: List[str],
+    store: Optional[ChromaStore] = None,
+    top_k: int = 5,
+) -> List[List[ScorePair]]:
+    """
+    semantic_search for many queries with one batched embed and one
+    vector query. Returns one (text, score) list per query, in order.
+    """
+    if store is None:
+        print("No Chroma store provided")
+        return [[] for _ in queries]
+
+    return [res[:top_k] for res in vector_search_many(queries, top_k=top_k, store=store)]
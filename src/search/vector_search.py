@@ -1,6 +1,8 @@
 # src/search/vector_search.py
 from typing import List, Tuple, Optional
 from src.vectorstore.db_store import ChromaStore
+from src.vectorstore.factory import create_vector_store
+from src.search.result_cache import get_query_cache
 from src.config import CHROMA_DIR
 
 _store: Optional[ChromaStore] = None
@@ -9,7 +11,7 @@ _store: Optional[ChromaStore] = None
 def get_store(persist_dir: str = CHROMA_DIR) -> ChromaStore:
     global _store
     if _store is None:
-        _store = ChromaStore(persist_dir=persist_dir)
+        _store = create_vector_store(persist_dir=persist_dir)
     return _store
 
 
@@ -21,15 +23,41 @@ def _distance_to_similarity(distance: float) -> float:
     return 1.0 / (1.0 + max(0.0, d))
 
 
+def _to_results(documents, distances, top_k: int) -> List[Tuple[str, float]]:
+    # -----------------------------
+    # Convert distance → similarity
+    # -----------------------------
+    out = []
+    for doc, dist in zip(documents or [], distances or []):
+        sim = _distance_to_similarity(dist)
+        out.append((doc, sim))
+
+    return sorted(out, key=lambda x: x[1], reverse=True)[:top_k]
+
+
 def vector_search(
     query: str,
     top_k: int = 5,
     store: Optional[ChromaStore] = None,
-    persist_dir: str = CHROMA_DIR
+    persist_dir: str = CHROMA_DIR,
+    use_cache: bool = True,
 ) -> List[Tuple[str, float]]:
-    
-    if not query or not query.strip():
-        return []
+    return vector_search_many([query], top_k=top_k, store=store, persist_dir=persist_dir, use_cache=use_cache)[0]
+
+
+def vector_search_many(
+    queries: List[str],
+    top_k: int = 5,
+    store: Optional[ChromaStore] = None,
+    persist_dir: str = CHROMA_DIR,
+    use_cache: bool = True,
+) -> List[List[Tuple[str, float]]]:
+    """
+    Searches many queries at once: one batched embed call and one
+    collection.query for every query not already cached.
+    Returns one (text, score) list per query, in order.
+    """
+    results: List[List[Tuple[str, float]]] = [[] for _ in queries]
 
     # -----------------------------
     # Ensure we have a store
@@ -38,49 +66,71 @@ def vector_search(
         store = get_store(persist_dir=persist_dir)
 
     # -----------------------------
-    # Embed the query properly
+    # Repeat queries: served from the result cache
+    # -----------------------------
+    cache = get_query_cache() if use_cache else None
+    pending = {}  # query text -> (positions, cache key)
+
+    for i, query in enumerate(queries):
+        if not query or not query.strip():
+            continue
+
+        if query in pending:
+            pending[query][0].append(i)
+            continue
+
+        cache_key = cache.key(query, top_k, store) if cache is not None else None
+        cached = cache.get(cache_key) if cache is not None else None
+        if cached is not None:
+            results[i] = list(cached)
+        else:
+            pending[query] = ([i], cache_key)
+
+    if not pending:
+        return results
+
+    texts = list(pending)
+
+    # -----------------------------
+    # Embed all queries in one batch
     # -----------------------------
     try:
-        query_vec = store.embedder.embed([query])  # <-- FIXED
+        embed = getattr(store, "embed_query", None) or store.embedder.embed
+        query_vecs = embed(texts)  # (n, dim) float32, compressed like the index
     except Exception:
-        return []
+        return results
 
     # -----------------------------
-    # Run vector search by embeddings
+    # One vector search for all of them
     # -----------------------------
     try:
         result = store.collection.query(
-            query_embeddings=query_vec,
+            query_embeddings=query_vecs,
             n_results=top_k,
             include=["documents", "distances"]
         )
     except Exception:
-        return []
+        return results
 
     # -----------------------------
-    # Extract results
+    # Extract results (one list per query)
     # -----------------------------
-    documents = []
-    distances = []
-
     docs_lists = result.get("documents")
     dist_lists = result.get("distances")
 
-    if docs_lists and isinstance(docs_lists, list):
-        documents = docs_lists[0] or []
+    if not (docs_lists and isinstance(docs_lists, list)):
+        return results
 
-    if dist_lists and isinstance(dist_lists, list):
-        distances = dist_lists[0] or []
+    for j, text in enumerate(texts):
+        documents = docs_lists[j] if j < len(docs_lists) else []
+        distances = dist_lists[j] if dist_lists and j < len(dist_lists) else []
+        out = _to_results(documents, distances, top_k)
 
-    if not documents:
-        return []
+        positions, cache_key = pending[text]
+        for i in positions:
+            results[i] = list(out)
 
-    # -----------------------------
-    # Convert distance → similarity
-    # -----------------------------
-    out = []
-    for doc, dist in zip(documents, distances):
-        sim = _distance_to_similarity(dist)
-        out.append((doc, sim))
+        if cache is not None and out:
+            cache.put(cache_key, tuple(out))
 
-    return sorted(out, key=lambda x: x[1], reverse=True)[:top_k]
+    return results
@@ -1,7 +1,7 @@
 # src/utils.py
+import contextlib
 import re
-import io
-import pdfplumber
+import hashlib
 
 def clean_text(text: str) -> str:
     """
@@ -66,17 +66,406 @@ def ingest_text(
 
     return len(chunks)
 
-def extract_text_from_pdf_bytes(data: bytes) -> str:
+def content_hash(text: str) -> str:
+    """
+    Stable content address for a chunk.
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def chunk_id(source: str, digest: str) -> str:
+    """
+    Id of a chunk: its source and a prefix of its content hash, so every
+    ingest path stores the same chunk under the same id.
+    """
+    return f"{source}_{digest[:16]}"
+
+
+def split_for_ingest(
+    text: str,
+    size: int,
+    overlap: int,
+    chunk_mode: str | None = None,
+) -> list[str]:
+    """
+    Paragraph-aligned chunking for incremental ingest.
+    Fixed character windows shift after any edit, so every later hash
+    would change; section-aware chunks keep edits local. Oversized
+    sections still fall back to fixed windows.
+
+    chunk_mode="tokens" packs by embedding-model tokens instead
+    (defaults to CHUNK_MODE from config).
+    """
+    from src.config import CHUNK_MODE, CHUNK_TOKEN_BUDGET
+    from src.data_prep.chunker import chunk_text
+
+    if (chunk_mode or CHUNK_MODE) == "tokens":
+        from src.data_prep.token_chunker import chunk_text_by_tokens
+        return chunk_text_by_tokens(text, max_tokens=CHUNK_TOKEN_BUDGET or None)
+
+    chunks = []
+    for section in chunk_text(text, chunk_size=size):
+        if len(section) > size:
+            chunks.extend(split_text(section, size, overlap))
+        else:
+            chunks.append(section)
+
+    return chunks
+
+
+def iter_split_for_ingest(
+    stream,
+    size: int,
+    overlap: int,
+    chunk_mode: str | None = None,
+):
+    """
+    Streaming split_for_ingest over cleaned text in a file or stream:
+    the same chunks (so the same ids), with only the section being
+    built held in memory.
+    """
+    from src.config import CHUNK_MODE, CHUNK_TOKEN_BUDGET
+    from src.data_prep.chunker import iter_paragraphs, iter_sections
+
+    if (chunk_mode or CHUNK_MODE) == "tokens":
+        from src.data_prep.token_chunker import iter_token_chunks
+        yield from iter_token_chunks(stream, max_tokens=CHUNK_TOKEN_BUDGET or None)
+        return
+
+    for section in iter_sections(iter_paragraphs(stream), max_size=size):
+        if len(section) > size:
+            yield from split_text(section, size, overlap)
+        else:
+            yield section
+
+
+class SourcePlan:
+    """
+    Diffs one source against the store, one batch of its chunks at a
+    time, so a large file can be planned as it streams.
+
+    add(chunks) returns the batch's {"items": [(id, chunk, metadata)] to
+    add, "moved": [(id, metadata)] of unchanged chunks whose chunk_index
+    changed, "signatures": {id: simhash}, "aliases": dropped duplicates
+    (see record_duplicates)}. finish() returns {"stale_ids": ids to
+    delete, "stale_aliases": duplicates no longer dropped from this
+    source} once every chunk has been added. stats holds the counters.
+
+    If the store has a dedup_index, new chunks that are near-duplicates
+    of anything already indexed, or of chunks kept earlier in this run
+    (pending), are left out of items. Chunks of this source not seen yet
+    may be stale, so they never count as matches. lock guards the
+    lookups when several sources are planned at once.
+    """
+
+    def __init__(self, filename: str, vector_store, pending=None, lock=None):
+        self.filename = filename
+        self.existing = vector_store.get_source_chunks(filename)
+        self.existing_ids = {
+            meta["content_hash"]: cid for cid, meta in self.existing.items() if meta.get("content_hash")
+        }
+        self.seen = set()  # hashes of this source so far
+        self.position = 0
+
+        self.dedup_index = getattr(vector_store, "dedup_index", None)
+        if self.dedup_index is not None and pending is None:
+            from src.data_prep.dedup import NearDuplicateIndex
+            pending = NearDuplicateIndex(similarity=self.dedup_index.similarity)
+        self.pending = pending
+        self.lock = lock or contextlib.nullcontext()
+        self.aliased = set()
+
+        self.stats = {
+            "chunks": 0,
+            "added": 0,
+            "embedded": 0,
+            "unchanged": 0,
+            "moved": 0,
+            "deleted": 0,
+            "near_duplicates": 0,
+        }
+
+    def add(self, chunks) -> dict:
+        # 1️⃣ Hash and diff against what the store holds for this source
+        new, moved = [], []  # new: (chunk_index, hash, chunk)
+        for chunk in chunks:
+            i = self.position
+            self.position += 1
+            self.stats["chunks"] += 1
+
+            h = content_hash(chunk)
+            if h in self.seen:
+                continue
+            self.seen.add(h)
+
+            cid = self.existing_ids.get(h)
+            if cid is None:
+                new.append((i, h, chunk))
+                continue
+
+            # Unchanged chunks that moved (paragraphs inserted or removed
+            # above them) only get their chunk_index rewritten
+            self.stats["unchanged"] += 1
+            if self.existing[cid].get("chunk_index") != i:
+                moved.append((cid, {**self.existing[cid], "chunk_index": i}))
+        self.stats["moved"] += len(moved)
+
+        # 2️⃣ Drop near-duplicates
+        signatures, aliases = {}, []
+        if self.dedup_index is not None and new:
+            from src.data_prep.dedup import simhash
+            signed = [(i, h, chunk, simhash(chunk)) for i, h, chunk in new]
+            exclude = {cid for cid, meta in self.existing.items() if meta.get("content_hash") not in self.seen}
+
+            kept = []
+            with self.lock:
+                for i, h, chunk, signature in signed:
+                    cid = chunk_id(self.filename, h)
+
+                    # A match on its own id is a leftover from an earlier run
+                    match = self.dedup_index.find(chunk, signature=signature, exclude=exclude)
+                    if match is None:
+                        match = self.pending.find(chunk, signature=signature)
+                    if match is not None and match != cid:
+                        self.stats["near_duplicates"] += 1
+                        meta = {"source": self.filename, "chunk_index": i, "content_hash": h}
+                        aliases.append((cid, match, chunk, meta))
+                        self.aliased.add(cid)
+                        continue
+
+                    self.pending.add(cid, chunk, signature=signature)
+                    signatures[cid] = signature
+                    kept.append((i, h, chunk))
+            new = kept
+
+        items = [
+            (chunk_id(self.filename, h), chunk, {"source": self.filename, "chunk_index": i, "content_hash": h})
+            for i, h, chunk in new
+        ]
+        return {"items": items, "moved": moved, "signatures": signatures, "aliases": aliases}
+
+    def finish(self) -> dict:
+        stale_ids = [cid for cid, meta in self.existing.items() if meta.get("content_hash") not in self.seen]
+        stale_aliases = []
+        if self.dedup_index is not None:
+            stale_aliases = [cid for cid in self.dedup_index.source_aliases(self.filename) if cid not in self.aliased]
+        return {"stale_ids": stale_ids, "stale_aliases": stale_aliases}
+
+
+def plan_incremental_ingest(
+    text: str,
+    filename: str,
+    vector_store,  # ChromaStore
+    chunk_size: int = 500,
+    overlap: int = 50,
+    chunk_mode: str | None = None,
+    pending=None,
+) -> dict:
+    """
+    Splits and hashes one source and diffs it against the store
+    (SourcePlan over the whole text). Nothing is embedded or written yet.
+
+    Returns SourcePlan.add and SourcePlan.finish merged, plus "stats".
+    The kept chunks are only registered in the dedup index once
+    embed_and_add has written them.
+
+    pending: in-memory NearDuplicateIndex of chunks kept by earlier plans
+    of the same run (shared when planning several sources at once).
+    """
+    planner = SourcePlan(filename, vector_store, pending=pending)
+    plan = planner.add(split_for_ingest(text, chunk_size, overlap, chunk_mode=chunk_mode))
+    plan.update(planner.finish())
+    plan["stats"] = planner.stats
+    return plan
+
+
+def update_positions(vector_store, moved: list):
+    """
+    Applies a plan's moved [(id, metadata)] as metadata-only updates.
+    """
+    if moved:
+        vector_store.update_metadata([cid for cid, _ in moved], [meta for _, meta in moved])
+
+
+def record_duplicates(vector_store, aliases: list, stale_aliases: list):
+    """
+    After a plan's items are written: remembers the dropped duplicates
+    (duplicate → kept id) so they can be stored if the kept chunk is
+    deleted, and forgets those no longer dropped from their source.
+    """
+    dedup_index = getattr(vector_store, "dedup_index", None)
+    if dedup_index is not None:
+        dedup_index.remove_aliases(stale_aliases)
+        dedup_index.add_aliases(aliases)
+
+
+def embed_and_add(
+    items: list,
+    embedder,
+    vector_store,  # ChromaStore
+    stats: dict,
+    batch_size: int = 64,
+    on_progress=None,
+    signatures: dict | None = None,
+):
+    """
+    Embeds (id, chunk, metadata) items and adds them to the store,
+    batch_size at a time. stats["embedded"] / stats["added"] are updated
+    and on_progress(stats) is called after each step.
+
+    signatures ({id: simhash} from the plan) are registered in the
+    store's dedup_index only after their batch has been written, so a
+    failed write leaves no signatures of chunks that were never stored.
+    """
+    from src.embedder.bucketing import for_ingest
+
+    embedder = for_ingest(embedder)
+    dedup_index = getattr(vector_store, "dedup_index", None)
+
+    for start in range(0, len(items), batch_size):
+        batch = items[start:start + batch_size]
+        documents = [chunk for _, chunk, _ in batch]
+
+        embeddings = embedder.embed(documents)
+        stats["embedded"] += len(batch)
+        if on_progress:
+            on_progress(stats)
+
+        vector_store.add(
+            ids=[cid for cid, _, _ in batch],
+            documents=documents,
+            embeddings=embeddings,
+            metadatas=[meta for _, _, meta in batch],
+        )
+        if signatures and dedup_index is not None:
+            for cid, chunk, _ in batch:
+                if cid in signatures:
+                    dedup_index.add(cid, chunk, signature=signatures[cid])
+        stats["added"] += len(batch)
+        if on_progress:
+            on_progress(stats)
+
+
+def ingest_text_incremental(
+    text: str,
+    filename: str,
+    embedder,
+    vector_store,  # ChromaStore
+    chunk_size: int = 500,
+    overlap: int = 50,
+    batch_size: int = 64,
+    on_progress=None,
+    chunk_mode: str | None = None,
+) -> dict:
+    """
+    Content-addressed ingest: only chunks whose hash is not yet stored
+    for this source are embedded, chunks that disappeared from the
+    source are deleted, and unchanged chunks that moved get their
+    chunk_index updated in place.
+
+    If the store has a dedup_index, new chunks that are near-duplicates
+    of anything already indexed are dropped before embedding.
+
+    New chunks are embedded and written in batches of batch_size;
+    on_progress(stats) is called with the running totals after each one.
+    """
+    plan = plan_incremental_ingest(
+        text, filename, vector_store,
+        chunk_size=chunk_size, overlap=overlap, chunk_mode=chunk_mode,
+    )
+    stats = plan["stats"]
+
+    # 4️⃣ Embed + add only the new chunks
+    embed_and_add(plan["items"], embedder, vector_store, stats, batch_size, on_progress, plan["signatures"])
+    update_positions(vector_store, plan["moved"])
+    record_duplicates(vector_store, plan["aliases"], plan["stale_aliases"])
+
+    # 5️⃣ Remove chunks that are gone from the source
+    vector_store.delete(plan["stale_ids"])
+    stats["deleted"] = len(plan["stale_ids"])
+
+    return stats
+
+
+def ingest_documents_incremental(
+    documents: list[tuple[str, str]],
+    embedder,
+    vector_store,  # ChromaStore
+    chunk_size: int = 500,
+    overlap: int = 50,
+    batch_size: int = 256,
+    on_progress=None,
+    chunk_mode: str | None = None,
+) -> dict:
+    """
+    Incremental ingest of many (filename, text) sources at once.
+
+    Every source is diffed on its own (same rules as
+    ingest_text_incremental), but the new chunks of all sources are pooled,
+    sorted by length so each batch pads to similar sizes, and embedded and
+    written batch_size at a time. Many small files then cost a few large
+    embedder calls instead of one tiny call each.
+    """
+    stats = {
+        "chunks": 0,
+        "added": 0,
+        "embedded": 0,
+        "unchanged": 0,
+        "moved": 0,
+        "deleted": 0,
+        "near_duplicates": 0,
+    }
+
+    # Chunks kept by earlier sources of this batch, not yet written
+    pending = None
+    dedup_index = getattr(vector_store, "dedup_index", None)
+    if dedup_index is not None:
+        from src.data_prep.dedup import NearDuplicateIndex
+        pending = NearDuplicateIndex(similarity=dedup_index.similarity)
+
+    items, stale_ids, moved, signatures = [], [], [], {}
+    aliases, stale_aliases = [], []
+    for filename, text in documents:
+        plan = plan_incremental_ingest(
+            text, filename, vector_store,
+            chunk_size=chunk_size, overlap=overlap, chunk_mode=chunk_mode,
+            pending=pending,
+        )
+        items.extend(plan["items"])
+        stale_ids.extend(plan["stale_ids"])
+        moved.extend(plan["moved"])
+        aliases.extend(plan["aliases"])
+        stale_aliases.extend(plan["stale_aliases"])
+        signatures.update(plan["signatures"])
+        for key in ("chunks", "unchanged", "moved", "near_duplicates"):
+            stats[key] += plan["stats"][key]
+
+    if on_progress:
+        on_progress(stats)
+
+    items.sort(key=lambda item: len(item[1]))
+    embed_and_add(items, embedder, vector_store, stats, batch_size, on_progress, signatures)
+    update_positions(vector_store, moved)
+    record_duplicates(vector_store, aliases, stale_aliases)
+
+    vector_store.delete(stale_ids)
+    stats["deleted"] = len(stale_ids)
+
+    return stats
+
+def extract_text_from_pdf_bytes(data: bytes, on_page=None) -> str:
     """
     Extract text from PDF bytes and return a single cleaned string.
+    on_page(pages_parsed) is called after every page.
     """
-    output = []
+    from src.data_prep.pdf_engine import iter_pdf_pages
 
-    with pdfplumber.open(io.BytesIO(data)) as pdf:
-        for page in pdf.pages:
-            text = page.extract_text()
-            if text:
-                output.append(text)
+    output = []
+    for i, text in enumerate(iter_pdf_pages(data, extractor="pdfplumber"), start=1):
+        if text:
+            output.append(text)
+        if on_page:
+            on_page(i)
 
     combined = "\n\n".join(output)
     return clean_text(combined)
@@ -0,0 +1,108 @@
+# src/vectorstore/compression.py
+"""
+Optional vector compression for the index.
+
+- "pca":      project onto the top singular directions of the corpus
+              (uncentered, so dot products / cosines are preserved as
+              well as possible at the target dimension)
+- "truncate": keep the first `dim` coordinates (no fitting needed)
+
+Outputs are re-normalized so cosine distances stay meaningful. With
+float16=True vectors are rounded to half precision; backends that store
+float16 (NumpyStore) keep them at 2 bytes per value, Chroma stores
+them as float32 regardless.
+
+The same fitted compressor must be applied at index and at query time,
+so it is saved next to the collection it belongs to.
+"""
+
+import os
+
+import numpy as np
+
+METHODS = ("pca", "truncate")
+
+
+class VectorCompressor:
+    def __init__(self, method: str = "pca", dim: int = 128, float16: bool = False):
+        if method not in METHODS:
+            raise ValueError(f"Unknown compression method: {method} (expected one of {METHODS})")
+
+        self.method = method
+        self.dim = dim
+        self.float16 = float16
+
+        self.components = None  # (dim, source_dim)
+
+    @property
+    def fitted(self) -> bool:
+        return self.method == "truncate" or self.components is not None
+
+    @property
+    def dtype(self):
+        return np.float16 if self.float16 else np.float32
+
+    def bytes_per_vector(self) -> int:
+        return self.dim * np.dtype(self.dtype).itemsize
+
+    # -------------------------------------------------------------
+
+    def fit(self, vectors) -> "VectorCompressor":
+        """
+        Fits PCA on a corpus sample (needs at least `dim` vectors).
+        No-op for truncation.
+        """
+        if self.method == "truncate":
+            return self
+
+        x = np.asarray(vectors, dtype=np.float32)
+        if len(x) < self.dim:
+            raise ValueError(f"PCA to {self.dim} dims needs at least {self.dim} vectors, got {len(x)}")
+
+        # Rows of vt are singular directions, strongest first
+        _, _, vt = np.linalg.svd(x, full_matrices=False)
+        self.components = np.ascontiguousarray(vt[:self.dim], dtype=np.float32)
+        return self
+
+    def transform(self, vectors) -> np.ndarray:
+        if not self.fitted:
+            raise RuntimeError("VectorCompressor must be fitted before use (see scripts/compress_index.py)")
+
+        x = np.asarray(vectors, dtype=np.float32)
+        if x.ndim == 1:
+            x = x[None, :]
+
+        if self.method == "pca":
+            out = x @ self.components.T
+        else:
+            out = x[:, :self.dim].copy()
+
+        out /= np.clip(np.linalg.norm(out, axis=1, keepdims=True), 1e-12, None)
+
+        if self.float16:
+            out = out.astype(np.float16).astype(np.float32)
+        return np.ascontiguousarray(out, dtype=np.float32)
+
+    # -------------------------------------------------------------
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        arrays = {
+            "method": np.array(self.method),
+            "dim": np.array(self.dim),
+            "float16": np.array(self.float16),
+        }
+        if self.components is not None:
+            arrays["components"] = self.components
+
+        tmp = path + ".tmp.npz"
+        np.savez(tmp, **arrays)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "VectorCompressor":
+        with np.load(path) as data:
+            compressor = cls(str(data["method"]), int(data["dim"]), bool(data["float16"]))
+            if "components" in data:
+                compressor.components = data["components"]
+        return compressor
@@ -1,10 +1,24 @@
 # src/vectorstore/db_store.py
 
 import hashlib
+import os
+import sqlite3
+import threading
 from chromadb import PersistentClient
 
-from src.embedder.factory import create_embedder
-from src.config import EMBEDDING_MODEL_NAME
+from src.embedder.shared import get_shared_embedder
+from src.data_prep.dedup import NearDuplicateIndex
+from src.search.bm25_index import BM25Index
+from src.vectorstore.compression import VectorCompressor
+from src.config import (
+    EMBEDDING_MODEL_NAME,
+    DEDUP_ENABLED,
+    DEDUP_SIMILARITY,
+    BM25_ENABLED,
+    VECTOR_COMPRESSION,
+    VECTOR_DIM,
+    VECTOR_FLOAT16,
+)
 
 
 class ChromaEmbeddingWrapper:
@@ -13,20 +27,45 @@ class ChromaEmbeddingWrapper:
     Ensures the embedder receives full strings, not characters.
     """
 
-    def __init__(self, embedder):
+    def __init__(self, embedder, transform=None):
         self._embedder = embedder
+        self._transform = transform
 
-    def __call__(self, input: list[str]) -> list[list[float]]:
+    def __call__(self, input: list[str]):
         if isinstance(input, str):
             input = [input]
 
-        return self._embedder.embed(input)
+        vectors = self._embedder.embed(input)
+        return self._transform(vectors) if self._transform else vectors
 
     def embed(self, input: list[str]):
         return self.__call__(input)
 
     def name(self):
-        return f"custom_{self._embedder.__class__.__name__}"
+        # Wrappers (e.g. the embedding cache) don't change the vectors,
+        # so the collection is named after the model embedder underneath
+        embedder = self._embedder
+        while hasattr(embedder, "inner"):
+            embedder = embedder.inner
+        return f"custom_{embedder.__class__.__name__}"
+
+
+def _open_versions(persist_dir: str) -> sqlite3.Connection:
+    """
+    Write counters per collection, in a sqlite file under persist_dir so
+    every process using the directory (API workers, ingest scripts) sees
+    every write; part of the query-result cache key.
+    """
+    os.makedirs(persist_dir, exist_ok=True)
+    conn = sqlite3.connect(
+        os.path.join(persist_dir, "collection_versions.sqlite"),
+        check_same_thread=False,
+        timeout=30,
+        isolation_level=None,
+    )
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS versions (collection TEXT PRIMARY KEY, version INTEGER NOT NULL)")
+    return conn
 
 
 class ChromaStore:
@@ -40,19 +79,81 @@ class ChromaStore:
         persist_dir: str,
         embedder_name: str = EMBEDDING_MODEL_NAME,
         embedder_override: str | None = None,
+        dedup: bool = DEDUP_ENABLED,
+        embedder=None,
+        compression: str = VECTOR_COMPRESSION,
+        compression_dim: int = VECTOR_DIM,
+        float16: bool = VECTOR_FLOAT16,
+        bm25: bool = BM25_ENABLED,
     ):
+        """
+        embedder: an already built embedder for embedder_name to use
+        (e.g. the API's micro-batched one); defaults to the process-wide
+        shared embedder.
+
+        compression: "none", "pca" or "truncate" to compression_dim.
+        Compressed stores get their own collection, with the fitted
+        compressor saved next to it.
+
+        bm25: keep a BM25 index of the documents next to the collection
+        (for hybrid retrieval), updated on every write.
+        """
         self.persist_dir = persist_dir
         self.embedder_name = embedder_override or embedder_name
-        self.embedder = create_embedder(self.embedder_name)
+        self.embedder = embedder or get_shared_embedder(self.embedder_name)
+
+        self.compressor = None
+        if compression and compression != "none":
+            self.compressor = VectorCompressor(compression, compression_dim, float16)
 
-        self.client = PersistentClient(path=persist_dir)
+        if self.compressor and os.path.exists(self.compressor_path):
+            self.compressor = VectorCompressor.load(self.compressor_path)
+
+        self.client = self._connect()
         self.collection = self._get_or_create_collection()
 
+        self._versions = _open_versions(persist_dir)
+        self._versions_lock = threading.Lock()
+
+        # Near-duplicate signatures live next to the collection they describe
+        self.dedup_index = None
+        if dedup:
+            self.dedup_index = NearDuplicateIndex(
+                os.path.join(persist_dir, f"{self.collection.name}_near_dups.sqlite"),
+                similarity=DEDUP_SIMILARITY,
+            )
+
+        self.bm25_index = None
+        if bm25:
+            self.bm25_index = BM25Index(os.path.join(persist_dir, f"{self.collection.name}_bm25.sqlite"))
+
         print("Using collection:", self.collection.name)
         print("Docs count:", self.collection.count())
 
+    @property
+    def version(self) -> int:
+        with self._versions_lock:
+            row = self._versions.execute(
+                "SELECT version FROM versions WHERE collection = ?", (self.collection.name,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def _bump_version(self):
+        with self._versions_lock:
+            self._versions.execute(
+                "INSERT INTO versions VALUES (?, 1) "
+                "ON CONFLICT(collection) DO UPDATE SET version = version + 1",
+                (self.collection.name,),
+            )
+
+    def _connect(self):
+        return PersistentClient(path=self.persist_dir)
+
     def _collection_name(self):
         key = f"linkedin_{self.embedder_name}"
+        if self.compressor:
+            # e.g. linkedin_minilm_pca128 / linkedin_minilm_truncate256f16
+            key += f"_{self.compressor.method}{self.compressor.dim}{'f16' if self.compressor.float16 else ''}"
         hashed = hashlib.sha1(key.encode()).hexdigest()[:8]
         return f"{key}_{hashed}"
 
@@ -60,26 +161,154 @@ class ChromaStore:
         return self.client.get_or_create_collection(
             name=self._collection_name(),
             metadata={"hnsw:space": "cosine"},
-            embedding_function=ChromaEmbeddingWrapper(self.embedder),
+            embedding_function=ChromaEmbeddingWrapper(self.embedder, transform=self._compress),
         )
 
+    # -------------------------------------------------------------
+    # Compression
+    # -------------------------------------------------------------
+
+    @property
+    def compressor_path(self) -> str:
+        return os.path.join(self.persist_dir, f"{self._collection_name()}_compressor.npz")
+
+    def _compress(self, embeddings):
+        if self.compressor is None:
+            return embeddings
+        return self.compressor.transform(embeddings)
+
+    def fit_compressor(self, vectors):
+        """
+        Fits the compressor on a sample of full-size corpus vectors and
+        saves it. Must happen before the first add to a PCA store.
+        """
+        self.compressor.fit(vectors)
+        self.compressor.save(self.compressor_path)
+        self._bump_version()
+
+    def embed_query(self, texts: list[str]):
+        """
+        Query vectors in the same space as the stored ones.
+        """
+        return self._compress(self.embedder.embed(texts))
+
     # -------------------------------------------------------------
 
     def add(self, ids, documents, embeddings=None, metadatas=None):
         if embeddings is None:
             embeddings = self.embedder.embed(documents) # Correct full-doc embedding
 
-        self.collection.add(
-            ids=ids,
-            documents=documents,
-            embeddings=embeddings,
-            metadatas=metadatas,
-        )
+        if self.bm25_index is not None:
+            self.bm25_index.add(ids, documents, replace=False)
+
+        try:
+            self.collection.add(
+                ids=ids,
+                documents=documents,
+                embeddings=self._compress(embeddings),
+                metadatas=metadatas,
+            )
+        except Exception:
+            self._resync_bm25(ids)
+            raise
+        self._bump_version()
+
+    def upsert(self, ids, documents, embeddings=None, metadatas=None):
+        """
+        Like add, but overwrites existing ids (idempotent bulk loads).
+        """
+        if embeddings is None:
+            embeddings = self.embedder.embed(documents)
+
+        if self.bm25_index is not None:
+            self.bm25_index.add(ids, documents)
+
+        try:
+            self.collection.upsert(
+                ids=ids,
+                documents=documents,
+                embeddings=self._compress(embeddings),
+                metadatas=metadatas,
+            )
+        except Exception:
+            self._resync_bm25(ids)
+            raise
+        self._bump_version()
+
+    def _resync_bm25(self, ids):
+        """
+        After a failed collection write: BM25 was updated first, so put
+        those ids back to what the collection actually holds.
+        """
+        if self.bm25_index is None:
+            return
+        try:
+            found = self.collection.get(ids=list(ids), include=["documents"])
+            self.bm25_index.remove(set(ids) - set(found["ids"]))
+            self.bm25_index.add(found["ids"], found.get("documents") or [])
+        except Exception as e:
+            print("BM25 resync failed (run scripts/build_bm25_index.py):", e)
+
+    def delete(self, ids):
+        if ids:
+            self.collection.delete(ids=list(ids))
+            self._bump_version()
+            if self.dedup_index:
+                self.dedup_index.remove(ids)
+            if self.bm25_index is not None:
+                self.bm25_index.remove(ids)
+            if self.dedup_index:
+                self._readmit_duplicates(ids)
+
+    def _readmit_duplicates(self, deleted_ids):
+        """
+        Duplicates that were dropped in favour of a deleted chunk: each is
+        re-aliased to another near-duplicate still stored, or embedded and
+        stored itself, so its content stays retrievable.
+        """
+        for cid, document, metadata in self.dedup_index.aliases_of(deleted_ids):
+            match = self.dedup_index.find(document)
+            if match is not None:
+                self.dedup_index.add_aliases([(cid, match, document, metadata)])
+                continue
+
+            self.add(ids=[cid], documents=[document], metadatas=[metadata])
+            self.dedup_index.add(cid, document)
+            self.dedup_index.remove_aliases([cid])
+
+    def update_metadata(self, ids, metadatas):
+        """
+        Rewrites the metadata of existing chunks without re-embedding
+        them (e.g. a chunk_index that moved after an edit).
+        """
+        if ids:
+            self.collection.update(ids=list(ids), metadatas=list(metadatas))
+            self._bump_version()
+
+    def get_source_chunks(self, source: str) -> dict[str, dict]:
+        """
+        Returns {chunk_id: metadata} for every chunk of a source.
+        """
+        result = self.collection.get(where={"source": source}, include=["metadatas"])
+        ids = result.get("ids") or []
+        metadatas = result.get("metadatas") or [None] * len(ids)
+
+        return {chunk_id: meta or {} for chunk_id, meta in zip(ids, metadatas)}
+
+    def get_source_hashes(self, source: str) -> dict[str, str | None]:
+        """
+        Returns {chunk_id: content_hash} for every chunk of a source.
+        Chunks ingested before content hashing map to None.
+        """
+        return {
+            chunk_id: meta.get("content_hash")
+            for chunk_id, meta in self.get_source_chunks(source).items()
+        }
 
     def search(self, query_text: str, n_results: int = 5):
-        query_vec = self.embedder.embed([query_text])[0]
+        query_vecs = self.embed_query([query_text])
         return self.collection.query(
-            query_embeddings=[query_vec],
+            query_embeddings=query_vecs,
             n_results=n_results,
         )
 
@@ -88,3 +317,8 @@ class ChromaStore:
         name = self._collection_name()
         self.client.delete_collection(name)
         self.collection = self._get_or_create_collection()
+        self._bump_version()
+        if self.dedup_index:
+            self.dedup_index.clear()
+        if self.bm25_index is not None:
+            self.bm25_index.clear()
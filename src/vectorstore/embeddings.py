@@ -1,20 +1,25 @@
 # src/vectorstore/embeddings.py
-from sentence_transformers import SentenceTransformer
+import numpy as np
+
+from src.embedder.shared import get_base_embedder
 
 
 class EmbeddingModel:
     """
     Wrapper around SentenceTransformer for consistent embeddings.
+    Uses the process-wide model instance, so it never loads a second copy.
+    Vectors are float32 numpy arrays, not Python lists.
     """
 
     def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2"):
-        self.model = SentenceTransformer(model_name)
+        self._embedder = get_base_embedder(model_name)
+        self.model = self._embedder.model
 
-    def embed_text(self, text: str):
+    def embed_text(self, text: str) -> np.ndarray:
         """
         Returns embedding vector for a single string.
         """
-        return self.model.encode(text).tolist()
+        return self._embedder.embed([text])[0]
 
-    def embed_texts(self, texts: list[str]):
-        return self.model.encode(texts).tolist()
+    def embed_texts(self, texts: list[str]) -> np.ndarray:
+        return self._embedder.embed(texts)
@@ -0,0 +1,18 @@
+# src/vectorstore/factory.py
+from src.config import CHROMA_DIR, VECTOR_BACKEND
+
+
+def create_vector_store(persist_dir: str = CHROMA_DIR, backend: str = VECTOR_BACKEND, **kwargs):
+    """
+    The configured vector store; kwargs go to the ChromaStore constructor.
+    backend: "chroma" or "numpy".
+    """
+    if backend == "numpy":
+        from src.vectorstore.numpy_store import NumpyStore
+        return NumpyStore(persist_dir=persist_dir, **kwargs)
+
+    if backend != "chroma":
+        raise ValueError(f"Unsupported vector backend: {backend}")
+
+    from src.vectorstore.db_store import ChromaStore
+    return ChromaStore(persist_dir=persist_dir, **kwargs)
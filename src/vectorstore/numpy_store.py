@@ -0,0 +1,396 @@
+# src/vectorstore/numpy_store.py
+"""
+In-process exact vector search.
+
+For small and medium collections (up to a few hundred thousand chunks)
+one matrix-vector product over every stored vector is cheaper than an
+HNSW round trip through Chroma, and recall is exact.
+
+NumpyCollection keeps L2-normalized vectors in a memory-mapped matrix
+(row i belongs to ids[i]) and ids, documents and metadata in sqlite next
+to it. It answers the subset of the Chroma collection API this project
+uses (add / upsert / get / query / delete / count), so NumpyStore is a
+drop-in ChromaStore: vector_search, the indexers and compression work
+unchanged. With float16 compression the matrix is stored as float16.
+
+Single process only: the row ↔ id map lives in memory, so a collection
+directory is locked by the first process that opens it, and any other
+process (a second API worker, an ingest script next to the API) fails
+fast instead of corrupting it. Within a process, every NumpyStore on a
+directory shares one NumpyCollection. Use the Chroma backend when
+several processes need the same index.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process guard
+    fcntl = None
+
+from src.vectorstore.db_store import ChromaStore, ChromaEmbeddingWrapper
+
+DEFAULT_INCLUDE = ("documents", "metadatas", "distances")
+
+
+def _normalize(vectors) -> np.ndarray:
+    x = np.asarray(vectors, dtype=np.float32)
+    if x.ndim == 1:
+        x = x[None, :]
+    return x / np.clip(np.linalg.norm(x, axis=1, keepdims=True), 1e-12, None)
+
+
+def _lock_directory(path: str):
+    """
+    Holds an exclusive lock on path/.lock for the life of the process.
+    POSIX record locks are per process, so reopening the directory in
+    the same process is fine; another process gets a RuntimeError.
+    """
+    handle = open(os.path.join(path, ".lock"), "a+")
+    if fcntl is not None:
+        try:
+            fcntl.lockf(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            raise RuntimeError(
+                f"{path} is in use by another process. The numpy vector backend is single-process: "
+                "stop the other process (e.g. the API) first, or use VECTOR_BACKEND=chroma."
+            )
+    return handle
+
+
+def _where_sql(where: dict) -> tuple[str, list]:
+    """
+    Equality filters only: {"source": "a.pdf"} or {"source": {"$eq": "a.pdf"}};
+    several keys must all match.
+    """
+    clauses, params = [], []
+    for key, value in where.items():
+        if isinstance(value, dict):
+            if set(value) != {"$eq"}:
+                raise ValueError(f"NumpyStore supports equality filters only, got {where}")
+            value = value["$eq"]
+        clauses.append("json_extract(metadata, ?) = ?")
+        params += [f"$.{key}", value]
+    return " AND ".join(clauses), params
+
+
+class NumpyCollection:
+    def __init__(self, path: str, name: str, dtype=np.float32, embedding_function=None):
+        self.path = path
+        self.name = name
+        self.dtype = np.dtype(dtype)
+        self._embedding_function = embedding_function
+        self._lock = threading.RLock()
+
+        os.makedirs(path, exist_ok=True)
+        self._dir_lock = _lock_directory(path)
+        self._vectors_path = os.path.join(path, "vectors.bin")
+        self._db = sqlite3.connect(os.path.join(path, "rows.sqlite"), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS rows ("
+            "row INTEGER PRIMARY KEY, id TEXT UNIQUE NOT NULL, document TEXT, metadata TEXT)"
+        )
+        self._db.execute("CREATE TABLE IF NOT EXISTS info (key TEXT PRIMARY KEY, value TEXT)")
+        self._db.commit()
+
+        # In memory: row → id and id → row; vectors stay in the memmap
+        self.ids = [cid for (cid,) in self._db.execute("SELECT id FROM rows ORDER BY row")]
+        self._rows = {cid: i for i, cid in enumerate(self.ids)}
+
+        dim = self._db.execute("SELECT value FROM info WHERE key = 'dim'").fetchone()
+        self.dim = int(dim[0]) if dim else None
+        self._matrix = None
+        if self.dim:
+            self._map(os.path.getsize(self._vectors_path) // (self.dim * self.dtype.itemsize))
+
+    # -------------------------------------------------------------
+    # Storage
+    # -------------------------------------------------------------
+
+    def _map(self, capacity: int):
+        """
+        (Re)maps the vector file with room for capacity rows.
+        """
+        if self._matrix is not None:
+            self._matrix.flush()
+            self._matrix = None
+
+        size = capacity * self.dim * self.dtype.itemsize
+        with open(self._vectors_path, "ab"):
+            pass
+        if os.path.getsize(self._vectors_path) < size:
+            os.truncate(self._vectors_path, size)
+
+        if capacity:
+            self._matrix = np.memmap(self._vectors_path, dtype=self.dtype, mode="r+", shape=(capacity, self.dim))
+
+    def _ensure_capacity(self, rows: int):
+        capacity = 0 if self._matrix is None else self._matrix.shape[0]
+        if rows > capacity:
+            # Grow geometrically so bulk loads remap O(log n) times
+            self._map(max(rows, 2 * capacity, 1024))
+
+    def _embed(self, documents):
+        if self._embedding_function is None:
+            raise ValueError("No embeddings given and the collection has no embedding function")
+        return self._embedding_function(documents)
+
+    # -------------------------------------------------------------
+    # Writes
+    # -------------------------------------------------------------
+
+    def count(self) -> int:
+        return len(self.ids)
+
+    def upsert(self, ids, embeddings=None, documents=None, metadatas=None):
+        ids = list(ids)
+        if len(set(ids)) != len(ids):
+            raise ValueError("Duplicate ids in one upsert")
+        if embeddings is None:
+            embeddings = self._embed(documents)
+
+        vectors = _normalize(embeddings)
+        documents = documents or [None] * len(ids)
+        metadatas = metadatas or [None] * len(ids)
+
+        with self._lock:
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+                self._db.execute("INSERT INTO info (key, value) VALUES ('dim', ?)", (str(self.dim),))
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match collection ({self.dim})")
+
+            for cid in ids:
+                if cid not in self._rows:
+                    self._rows[cid] = len(self.ids)
+                    self.ids.append(cid)
+
+            self._ensure_capacity(len(self.ids))
+            rows = np.array([self._rows[cid] for cid in ids])
+            self._matrix[rows] = vectors.astype(self.dtype)
+            self._matrix.flush()
+
+            self._db.executemany(
+                "INSERT INTO rows (row, id, document, metadata) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET document = excluded.document, metadata = excluded.metadata",
+                [
+                    (int(row), cid, doc, json.dumps(meta) if meta is not None else None)
+                    for row, cid, doc, meta in zip(rows, ids, documents, metadatas)
+                ],
+            )
+            self._db.commit()
+
+    def add(self, ids, embeddings=None, documents=None, metadatas=None):
+        """
+        Like Chroma, ids that already exist are left untouched.
+        """
+        ids = list(ids)
+        with self._lock:
+            keep = [i for i, cid in enumerate(ids) if cid not in self._rows]
+        if not keep:
+            return
+
+        pick = lambda values: [values[i] for i in keep] if values is not None else None
+        if embeddings is None:
+            embeddings = self._embed(pick(documents))
+        else:
+            embeddings = np.asarray(embeddings)[keep]
+        self.upsert([ids[i] for i in keep], embeddings, pick(documents), pick(metadatas))
+
+    def update(self, ids, metadatas=None):
+        """
+        Metadata-only update; vectors and documents are left as they are.
+        Unknown ids are ignored.
+        """
+        if metadatas is None:
+            return
+        with self._lock:
+            self._db.executemany(
+                "UPDATE rows SET metadata = ? WHERE id = ?",
+                [
+                    (json.dumps(meta) if meta is not None else None, cid)
+                    for cid, meta in zip(ids, metadatas)
+                    if cid in self._rows
+                ],
+            )
+            self._db.commit()
+
+    def delete(self, ids=None, where=None):
+        with self._lock:
+            targets = set(ids or [])
+            if where:
+                targets.update(self.get(where=where, include=[])["ids"])
+
+            # Swap-remove, highest rows first, so the matrix stays dense
+            for row in sorted((self._rows[cid] for cid in targets if cid in self._rows), reverse=True):
+                last = len(self.ids) - 1
+                removed = self.ids[row]
+                self._db.execute("DELETE FROM rows WHERE id = ?", (removed,))
+
+                if row != last:
+                    moved = self.ids[last]
+                    self._matrix[row] = self._matrix[last]
+                    self.ids[row] = moved
+                    self._rows[moved] = row
+                    self._db.execute("UPDATE rows SET row = ? WHERE id = ?", (row, moved))
+
+                self.ids.pop()
+                del self._rows[removed]
+
+            if self._matrix is not None:
+                self._matrix.flush()
+            self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._matrix = None
+            self._db.execute("DELETE FROM rows")
+            self._db.execute("DELETE FROM info")
+            self._db.commit()
+            if os.path.exists(self._vectors_path):
+                os.remove(self._vectors_path)
+            self.ids, self._rows, self.dim = [], {}, None
+
+    # -------------------------------------------------------------
+    # Reads
+    # -------------------------------------------------------------
+
+    def _fetch(self, rows) -> dict:
+        """
+        row → (document, metadata) for the given rows.
+        """
+        rows = sorted({int(r) for r in rows})
+        found = {}
+        for start in range(0, len(rows), 900):  # sqlite parameter limit
+            part = rows[start:start + 900]
+            for row, doc, meta in self._db.execute(
+                f"SELECT row, document, metadata FROM rows WHERE row IN ({','.join('?' * len(part))})", part
+            ):
+                found[row] = (doc, json.loads(meta) if meta else None)
+        return found
+
+    def get(self, ids=None, where=None, limit=None, offset=None, include=("documents", "metadatas")):
+        with self._lock:
+            if ids is not None:
+                rows = [self._rows[cid] for cid in ids if cid in self._rows]
+            else:
+                sql, params = "SELECT row FROM rows", []
+                if where:
+                    clause, params = _where_sql(where)
+                    sql += f" WHERE {clause}"
+                sql += " ORDER BY row LIMIT ? OFFSET ?"
+                params += [-1 if limit is None else limit, offset or 0]
+                rows = [row for (row,) in self._db.execute(sql, params)]
+
+            result = {"ids": [self.ids[r] for r in rows], "documents": None, "metadatas": None, "embeddings": None}
+            if "documents" in include or "metadatas" in include:
+                found = self._fetch(rows)
+                if "documents" in include:
+                    result["documents"] = [found[r][0] for r in rows]
+                if "metadatas" in include:
+                    result["metadatas"] = [found[r][1] for r in rows]
+            if "embeddings" in include:
+                dim = self.dim or 0
+                result["embeddings"] = (
+                    np.asarray(self._matrix[rows], dtype=np.float32) if rows else np.empty((0, dim), np.float32)
+                )
+            return result
+
+    def query(self, query_embeddings=None, query_texts=None, n_results: int = 10, where=None, include=DEFAULT_INCLUDE):
+        """
+        Exact top-k by cosine similarity for one or many queries.
+        Distances are cosine distances (1 - similarity), as in Chroma.
+        """
+        if query_embeddings is None:
+            query_embeddings = self._embed(query_texts)
+        queries = _normalize(query_embeddings)
+
+        with self._lock:
+            if where:
+                candidates = np.array(
+                    [self._rows[cid] for cid in self.get(where=where, include=[])["ids"]], dtype=np.int64
+                )
+                matrix = self._matrix[candidates] if len(candidates) else None
+            else:
+                candidates = None
+                matrix = self._matrix[:len(self.ids)] if self.ids else None
+
+            if matrix is None:
+                empty = [[] for _ in queries]
+                return {
+                    "ids": empty,
+                    "documents": empty if "documents" in include else None,
+                    "metadatas": empty if "metadatas" in include else None,
+                    "distances": empty if "distances" in include else None,
+                    "embeddings": None,
+                }
+
+            # (n_queries, n) similarities; float16 matrices are upcast by numpy
+            scores = queries @ matrix.T
+
+            k = min(n_results, scores.shape[1])
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            order = np.argsort(-top_scores, axis=1)
+            top = np.take_along_axis(top, order, axis=1)
+            top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+            rows = candidates[top] if candidates is not None else top
+            found = self._fetch(rows.ravel()) if ("documents" in include or "metadatas" in include) else {}
+
+            return {
+                "ids": [[self.ids[r] for r in q] for q in rows],
+                "documents": [[found[r][0] for r in q] for q in rows] if "documents" in include else None,
+                "metadatas": [[found[r][1] for r in q] for q in rows] if "metadatas" in include else None,
+                "distances": (1.0 - top_scores).tolist() if "distances" in include else None,
+                "embeddings": (
+                    [np.asarray(self._matrix[q], dtype=np.float32) for q in rows] if "embeddings" in include else None
+                ),
+            }
+
+
+# One NumpyCollection per directory in this process, shared by every
+# NumpyStore on it (separate handles would each have their own row map)
+_open_collections = {}
+_open_lock = threading.Lock()
+
+
+class NumpyStore(ChromaStore):
+    """
+    ChromaStore backed by a NumpyCollection instead of Chroma. Same
+    constructor and methods; store.collection answers the Chroma calls.
+    """
+
+    def _connect(self):
+        return None
+
+    def _get_or_create_collection(self):
+        name = f"{self._collection_name()}_numpy"
+        path = os.path.abspath(os.path.join(self.persist_dir, name))
+        float16 = self.compressor is not None and self.compressor.float16
+
+        with _open_lock:
+            if path not in _open_collections:
+                _open_collections[path] = NumpyCollection(
+                    path,
+                    name=name,
+                    dtype=np.float16 if float16 else np.float32,
+                    embedding_function=ChromaEmbeddingWrapper(self.embedder, transform=self._compress),
+                )
+            return _open_collections[path]
+
+    def reset(self):
+        """Drops all vectors and rows."""
+        self.collection.clear()
+        self._bump_version()
+        if self.dedup_index:
+            self.dedup_index.clear()
+        if self.bm25_index is not None:
+            self.bm25_index.clear()
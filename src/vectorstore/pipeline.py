@@ -1,39 +1,231 @@
 # src/vectorstore/pipeline.py
-import json
+"""
+Streaming bulk indexer: saved chunk files (data/chunks) → ChromaStore.
+
+Chunk files are read one at a time and cut into fixed-size batches that
+flow through an embed → write StagedPipeline with bounded queues, so
+memory stays flat however large the corpus is. Ids are content hashes
+(src.utils.chunk_id, shared with uploads and directory loads, and
+stored as content_hash metadata) and writes are upserts, so replaying a batch
+after an interruption is harmless; a checkpoint file records how far
+each chunk file got, and the next run resumes from there.
+"""
+
 import glob
+import itertools
+import json
 import os
-from src.vectorstore.embeddings import EmbeddingModel
-from src.vectorstore.chroma_store import ChromaStore
+import time
+
+from src.config import CHROMA_DIR
+from src.data_prep.saver import iter_saved_chunks
+from src.utils import chunk_id, content_hash
+from src.vectorstore.staged_pipeline import Stage, StagedPipeline
+
+
+def list_chunk_files(chunks_folder: str) -> list[str]:
+    return sorted(
+        glob.glob(os.path.join(chunks_folder, "*.json"))
+        + glob.glob(os.path.join(chunks_folder, "*.chunks"))
+    )
+
+
+def _signature(path: str) -> list:
+    """
+    (size, mtime) of a chunk file or chunk store directory; a changed
+    file is re-indexed from the start.
+    """
+    paths = [os.path.join(path, name) for name in sorted(os.listdir(path))] if os.path.isdir(path) else [path]
+    stats = [os.stat(p) for p in paths]
+    return [sum(s.st_size for s in stats), max((s.st_mtime_ns for s in stats), default=0)]
 
 
-def index_chunks(chunks_folder: str = "data/chunks", persist_dir="data/chroma"):
+class IndexCheckpoint:
     """
-    Loads chunked text files and stores embeddings in ChromaDB.
+    Per chunk file: chunks written so far and whether it is complete.
+    Saved atomically after every update.
     """
 
-    model = EmbeddingModel()
-    store = ChromaStore(persist_directory=persist_dir)
+    def __init__(self, path: str):
+        self.path = path
+        self.files = {}
+
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.files = json.load(f).get("files", {})
+
+    def resume_offset(self, chunk_file: str) -> int | None:
+        """
+        Chunks of chunk_file already written, or None if it is done.
+        """
+        entry = self.files.get(chunk_file)
+        if not entry or entry["signature"] != _signature(chunk_file):
+            return 0
+        return None if entry["complete"] else entry["chunks"]
+
+    def update(self, chunk_file: str, chunks: int, complete: bool):
+        self.files[chunk_file] = {
+            "signature": _signature(chunk_file),
+            "chunks": chunks,
+            "complete": complete,
+        }
+        self.save()
 
-    chunk_files = glob.glob(os.path.join(chunks_folder, "*.json"))
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"files": self.files}, f)
+        os.replace(tmp, self.path)
+
+
+def _iter_batches(chunk_files, checkpoint: IndexCheckpoint, batch_size: int, stats: dict):
+    """
+    Yields {"seq", "file", "end", "last", "items": [(id, text, meta)]}
+    in order. Each file ends with a "last" batch (possibly empty) so the
+    checkpoint can mark it complete.
+    """
+    seq = itertools.count()
+
+    for chunk_file in chunk_files:
+        offset = checkpoint.resume_offset(chunk_file)
+        if offset is None:
+            stats["files_skipped"] += 1
+            continue
+
+        stats["chunks_skipped"] += offset
+        items, ids, end = [], set(), offset
+        for i, (text, meta) in enumerate(iter_saved_chunks(chunk_file)):
+            if i < offset:
+                continue
+
+            end = i + 1
+            digest = content_hash(text)
+            cid = chunk_id(meta["source"], digest)
+            # A repeated chunk has the same id; one upsert can't hold both
+            if cid not in ids:
+                ids.add(cid)
+                items.append((cid, text, {**meta, "content_hash": digest}))
+            if len(items) >= batch_size:
+                yield {"seq": next(seq), "file": chunk_file, "end": end, "last": False, "items": items}
+                items, ids = [], set()
+
+        yield {"seq": next(seq), "file": chunk_file, "end": end, "last": True, "items": items}
+
+
+def index_chunks(
+    chunks_folder: str = "data/chunks",
+    persist_dir: str = CHROMA_DIR,
+    store=None,
+    embedder=None,
+    batch_size: int = 256,
+    embed_workers: int = 1,
+    queue_size: int = 4,
+    checkpoint_path: str | None = None,
+    restart: bool = False,
+    on_stats=None,
+) -> dict:
+    """
+    Streams every chunk file in chunks_folder into the vector store.
+
+    - batch_size:     chunks per embedder call
+    - embed_workers:  batches embedded concurrently (for ProcessPoolEmbedder)
+    - checkpoint_path: defaults to <persist_dir>/<collection>_index_checkpoint.json
+    - restart:        ignore the checkpoint and index everything again
+
+    A failed batch stops the run (stopped_early) at the next batch; the
+    checkpoint stays before it. Returns counters including chunks_per_s.
+    """
+    from src.embedder.bucketing import LengthBucketedEmbedder, for_ingest
+
+    if store is None:
+        from src.vectorstore.factory import create_vector_store
+        store = create_vector_store(persist_dir=persist_dir)
+
+    embedder = for_ingest(embedder or store.embedder)
+    bucketed = isinstance(embedder, LengthBucketedEmbedder)
+    # The wrapper is shared across runs; report this run's tokens only
+    tokens_before = (embedder.real_tokens, embedder.padded_tokens) if bucketed else None
+    max_write = getattr(store.client, "get_max_batch_size", lambda: 5000)()
+
+    checkpoint_path = checkpoint_path or os.path.join(
+        store.persist_dir, f"{store.collection.name}_index_checkpoint.json"
+    )
+    if restart and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    checkpoint = IndexCheckpoint(checkpoint_path)
+
+    chunk_files = list_chunk_files(chunks_folder)
+    stats = {
+        "files": len(chunk_files),
+        "files_skipped": 0,
+        "chunks_skipped": 0,
+        "chunks_written": 0,
+        "seconds": 0.0,
+        "chunks_per_s": 0.0,
+        "stopped_early": False,
+    }
     if not chunk_files:
         print("No chunk files found in:", chunks_folder)
-        return
+        return stats
+
+    # Batches can finish out of order with several embed workers; the
+    # checkpoint only advances over a contiguous run of written batches.
+    # Only (file, end, last) is kept per finished batch, never its chunks
+    done = {}
+    next_seq = [0]
+
+    def embed(batch):
+        texts = [text for _, text, _ in batch["items"]]
+        return batch, embedder.embed(texts) if texts else None
+
+    def write(embedded):
+        batch, embeddings = embedded
+        items = batch["items"]
+        for start in range(0, len(items), max_write):
+            part = items[start:start + max_write]
+            store.upsert(
+                ids=[cid for cid, _, _ in part],
+                documents=[text for _, text, _ in part],
+                embeddings=embeddings[start:start + max_write],
+                metadatas=[meta for _, _, meta in part],
+            )
+        stats["chunks_written"] += len(items)
 
-    all_texts = []
-    all_metadata = []
+        done[batch["seq"]] = (batch["file"], batch["end"], batch["last"])
+        while next_seq[0] in done:
+            checkpoint.update(*done.pop(next_seq[0]))
+            next_seq[0] += 1
+        return len(items)
 
-    for file_path in chunk_files:
-        with open(file_path, "r", encoding="utf-8") as f:
-            chunk_data = json.load(f)
+    pipeline = StagedPipeline([
+        Stage("embed", embed, workers=embed_workers, queue_size=queue_size, units=lambda e: len(e[0]["items"])),
+        Stage("write", write, workers=1, queue_size=queue_size, units=lambda n: n),
+    ])
 
-        for idx, chunk in enumerate(chunk_data["chunks"]):
-            all_texts.append(chunk)
-            all_metadata.append({
-                "source": chunk_data.get("source", file_path),
-                "chunk_index": idx
-            })
+    def feed():
+        # After a failed batch the checkpoint can't move past it, so
+        # stop reading; the next run resumes from the checkpoint
+        for batch in _iter_batches(chunk_files, checkpoint, batch_size, stats):
+            if any(stage.stats.errors for stage in pipeline.stages):
+                stats["stopped_early"] = True
+                print("A batch failed; stopping. Re-run to resume from the checkpoint.")
+                return
+            yield batch
 
-    embeddings = model.embed_texts(all_texts)
-    store.add(all_texts, embeddings, all_metadata)
+    started = time.perf_counter()
+    snapshot = pipeline.run(feed(), on_stats=on_stats)
+    stats["seconds"] = time.perf_counter() - started
+    stats["chunks_per_s"] = stats["chunks_written"] / stats["seconds"] if stats["seconds"] else 0.0
+    stats["errors"] = sum(s["errors"] for s in snapshot["stages"])
+    stats["last_error"] = next((s["last_error"] for s in snapshot["stages"] if s["last_error"]), None)
+    if bucketed:
+        padded = embedder.padded_tokens - tokens_before[1]
+        if padded:
+            stats["padding_efficiency"] = (embedder.real_tokens - tokens_before[0]) / padded
 
-    print(f"Indexed {len(all_texts)} chunks into ChromaDB collection 'linkedin_chunks'")
+    print(
+        f"Indexed {stats['chunks_written']} chunks from {stats['files'] - stats['files_skipped']} files "
+        f"into {store.collection.name} ({stats['chunks_per_s']:.1f} chunks/s)"
+    )
+    return stats
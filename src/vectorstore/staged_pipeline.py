@@ -0,0 +1,339 @@
+# src/vectorstore/staged_pipeline.py
+"""
+Staged ingestion engine.
+
+Each stage runs on its own worker threads and talks to the next one
+through a bounded queue, so parsing, embedding and vector-store writes
+overlap instead of running strictly in sequence. A full queue blocks the
+upstream stage (backpressure), which keeps memory flat on bulk loads.
+"""
+
+import itertools
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Callable, Iterable, Optional
+
+_DONE = object()
+
+
+@dataclass
+class StageStats:
+    name: str
+    workers: int
+    items_in: int = 0
+    items_out: int = 0
+    units_out: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+    queue_depth: int = 0
+    queue_max_depth: int = 0
+    last_error: Optional[str] = None
+
+
+@dataclass
+class Stage:
+    """
+    fn(item) returns one output, or None to drop the item.
+    With fan_out=True, fn returns an iterable of outputs instead.
+    units(output) optionally counts what an output holds (e.g. chunks
+    in a batch) for throughput reporting.
+    """
+    name: str
+    fn: Callable
+    workers: int = 1
+    queue_size: int = 8
+    fan_out: bool = False
+    units: Optional[Callable] = None
+    stats: StageStats = field(init=False)
+
+    def __post_init__(self):
+        self.stats = StageStats(name=self.name, workers=self.workers)
+
+
+class StagedPipeline:
+    def __init__(self, stages: list[Stage]):
+        if not stages:
+            raise ValueError("StagedPipeline needs at least one stage")
+
+        self.stages = stages
+        self.queues = [queue.Queue(maxsize=s.queue_size) for s in stages]
+        self._lock = threading.Lock()
+        self._started = None
+        self._finished = None
+
+    # -------------------------------------------------------------
+
+    def _put(self, index: int, item):
+        q = self.queues[index]
+        q.put(item)
+
+        stats = self.stages[index].stats
+        depth = q.qsize()
+        if depth > stats.queue_max_depth:
+            stats.queue_max_depth = depth
+
+    def _emit(self, index: int, output):
+        # Last stage outputs are dropped: the stage itself is the sink
+        if output is not None and index + 1 < len(self.stages):
+            self._put(index + 1, output)
+
+    def _worker(self, index: int, remaining: list):
+        stage = self.stages[index]
+        stats = stage.stats
+        q = self.queues[index]
+
+        while True:
+            item = q.get()
+            if item is _DONE:
+                break
+
+            busy = 0.0
+            started = time.perf_counter()
+
+            try:
+                result = stage.fn(item)
+                outputs = (result or ()) if stage.fan_out else (result,)
+
+                for output in outputs:
+                    if output is None:
+                        continue
+
+                    # Time blocked on a full downstream queue isn't "busy"
+                    busy += time.perf_counter() - started
+                    self._emit(index, output)
+                    started = time.perf_counter()
+
+                    with self._lock:
+                        stats.items_out += 1
+                        stats.units_out += stage.units(output) if stage.units else 1
+            except Exception as e:
+                with self._lock:
+                    stats.errors += 1
+                    stats.last_error = f"{type(e).__name__}: {e}"
+            finally:
+                busy += time.perf_counter() - started
+                with self._lock:
+                    stats.items_in += 1
+                    stats.busy_seconds += busy
+
+        # Last worker of this stage closes the next stage
+        with self._lock:
+            remaining[index] -= 1
+            closing = remaining[index] == 0
+
+        if closing and index + 1 < len(self.stages):
+            for _ in range(self.stages[index + 1].workers):
+                self.queues[index + 1].put(_DONE)
+
+    # -------------------------------------------------------------
+
+    def run(
+        self,
+        source: Iterable,
+        on_stats: Callable[[dict], None] | None = None,
+        stats_interval: float = 2.0,
+    ) -> dict:
+        """
+        Feeds every item of source into the first stage and blocks until
+        all stages drain. on_stats(snapshot) is called every
+        stats_interval seconds while running. Returns the final snapshot.
+        """
+        self._started = time.perf_counter()
+        remaining = [s.workers for s in self.stages]
+
+        threads = [
+            threading.Thread(target=self._worker, args=(i, remaining), name=f"{s.name}-{w}", daemon=True)
+            for i, s in enumerate(self.stages)
+            for w in range(s.workers)
+        ]
+        for t in threads:
+            t.start()
+
+        stop_monitor = threading.Event()
+        monitor = None
+        if on_stats:
+            def report():
+                while not stop_monitor.wait(stats_interval):
+                    on_stats(self.snapshot())
+
+            monitor = threading.Thread(target=report, name="pipeline-stats", daemon=True)
+            monitor.start()
+
+        try:
+            for item in source:
+                self._put(0, item)
+        finally:
+            for _ in range(self.stages[0].workers):
+                self.queues[0].put(_DONE)
+
+            for t in threads:
+                t.join()
+
+            self._finished = time.perf_counter()
+            stop_monitor.set()
+            if monitor:
+                monitor.join()
+
+        return self.snapshot()
+
+    def snapshot(self) -> dict:
+        """
+        Per-stage counters, throughput and live queue depth.
+        Safe to call from another thread while running.
+        """
+        end = self._finished or time.perf_counter()
+        elapsed = max(end - (self._started or end), 1e-9)
+
+        stages = []
+        for stage, q in zip(self.stages, self.queues):
+            stage.stats.queue_depth = q.qsize()
+            row = asdict(stage.stats)
+            row["items_per_s"] = stage.stats.items_out / elapsed
+            row["units_per_s"] = stage.stats.units_out / elapsed
+            # Share of wall time the stage's workers were doing work
+            row["utilization"] = stage.stats.busy_seconds / (elapsed * stage.workers)
+            stages.append(row)
+
+        return {"elapsed_seconds": elapsed, "stages": stages}
+
+
+# ============================================================
+# Document ingestion: parse → embed → write
+# ============================================================
+
+def build_ingest_pipeline(
+    store,
+    embedder=None,
+    batch_size: int = 64,
+    chunk_size: int = 500,
+    overlap: int = 50,
+    parse_workers: int = 2,
+    queue_size: int = 8,
+    embed_workers: int = 1,
+    root: str | None = None,
+) -> StagedPipeline:
+    """
+    Pipeline for bulk loads: feed it file paths.
+    - parse: stream → chunk → plan each batch of chunks (same chunking,
+      content-hash ids and near-duplicate check as uploads), emitted in
+      embedding-sized batches, then one end-of-file marker
+    - embed: one embedder call per batch
+    - write: add each embedded batch to the vector store and register
+      its dedup signatures; once every batch of a file is written,
+      delete the file's stale chunks
+
+    Sources are named by their path relative to root (default: the full
+    path), so a directory load and an upload of the same file share ids.
+    Counters (chunks, unchanged, moved, near_duplicates, deleted) are
+    kept in pipeline.ingest_stats.
+
+    embed_workers > 1 keeps that many batches in flight, which only
+    helps with an embedder that runs calls in parallel (ProcessPoolEmbedder).
+    """
+    from src.data_prep.pipeline import open_prepared_text
+    from src.embedder.bucketing import for_ingest
+    from src.utils import SourcePlan, iter_split_for_ingest, record_duplicates, update_positions
+
+    embedder = for_ingest(embedder or store.embedder)
+    dedup_index = getattr(store, "dedup_index", None)
+
+    # Chunks kept by files planned earlier in this run, not yet written.
+    # Only the lookups hold the lock, so two parse workers can't both
+    # keep a near-duplicate pair
+    pending = None
+    if dedup_index is not None:
+        from src.data_prep.dedup import NearDuplicateIndex
+        pending = NearDuplicateIndex(similarity=dedup_index.similarity)
+    dedup_lock = threading.Lock()
+
+    stats = {"chunks": 0, "unchanged": 0, "moved": 0, "near_duplicates": 0, "deleted": 0}
+    stats_lock = threading.Lock()
+
+    def parse(path):
+        source = os.path.relpath(path, root) if root else path
+        planner = SourcePlan(source, store, pending=pending, lock=dedup_lock)
+
+        batch = {"source": source, "items": [], "signatures": {}, "moved": [], "aliases": []}
+        batches = 0
+        with open_prepared_text(path) as stream:
+            chunks = iter_split_for_ingest(stream, chunk_size, overlap)
+            while True:
+                part = list(itertools.islice(chunks, batch_size))
+                if not part:
+                    break
+
+                plan = planner.add(part)
+                for key in ("items", "moved", "aliases"):
+                    batch[key] += plan[key]
+                batch["signatures"].update(plan["signatures"])
+
+                if len(batch["items"]) >= batch_size:
+                    yield batch
+                    batches += 1
+                    batch = {"source": source, "items": [], "signatures": {}, "moved": [], "aliases": []}
+
+        if batch["items"] or batch["moved"] or batch["aliases"]:
+            yield batch
+            batches += 1
+
+        with stats_lock:
+            for key in ("chunks", "unchanged", "moved", "near_duplicates"):
+                stats[key] += planner.stats[key]
+
+        # Stale chunks go only after all of this file's batches are written
+        yield {"source": source, "batches": batches, **planner.finish()}
+
+    def embed(batch):
+        items = batch.get("items")
+        return batch, embedder.embed([text for _, text, _ in items]) if items else None
+
+    # Per source: batches written so far, and its end-of-file marker.
+    # Batches can arrive out of order with several embed workers
+    written = {}
+    finished = {}
+
+    def write(embedded):
+        batch, embeddings = embedded
+        source = batch["source"]
+
+        if "batches" in batch:
+            finished[source] = batch
+        else:
+            items = batch["items"]
+            if items:
+                store.add(
+                    ids=[cid for cid, _, _ in items],
+                    documents=[text for _, text, _ in items],
+                    embeddings=embeddings,
+                    metadatas=[meta for _, _, meta in items],
+                )
+            if dedup_index is not None:
+                for cid, text, _ in items:
+                    if cid in batch["signatures"]:
+                        dedup_index.add(cid, text, signature=batch["signatures"][cid])
+            update_positions(store, batch["moved"])
+            record_duplicates(store, batch["aliases"], [])
+            written[source] = written.get(source, 0) + 1
+
+        done = finished.get(source)
+        if done is not None and written.get(source, 0) == done["batches"]:
+            del finished[source]
+            written.pop(source, None)
+            record_duplicates(store, [], done["stale_aliases"])
+            if done["stale_ids"]:
+                store.delete(done["stale_ids"])
+                stats["deleted"] += len(done["stale_ids"])
+
+        return len(batch.get("items", ()))
+
+    units = lambda batch: len(batch.get("items", ()))
+    pipeline = StagedPipeline([
+        Stage("parse", parse, workers=parse_workers, queue_size=queue_size, fan_out=True, units=units),
+        Stage("embed", embed, workers=embed_workers, queue_size=queue_size, units=lambda e: units(e[0])),
+        Stage("write", write, workers=1, queue_size=queue_size, units=lambda n: n),
+    ])
+    pipeline.ingest_stats = stats
+    return pipeline
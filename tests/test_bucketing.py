@@ -0,0 +1,81 @@
+# tests/test_bucketing.py
+import numpy as np
+
+from src.embedder import bucketing
+from src.embedder.bucketing import LengthBucketedEmbedder, padded_cost, for_ingest, ingest_padding_stats
+
+
+class RecordingEmbedder:
+    model_name = "dummy-model"
+
+    def __init__(self):
+        self.calls = []
+
+    def embed(self, texts):
+        self.calls.append([len(t) for t in texts])
+        return [[float(len(t)), 0.0] for t in texts]
+
+
+def word_lengths(texts):
+    return [len(t.split()) for t in texts]
+
+
+def test_order_is_restored_and_buckets_are_sorted():
+    texts = ["w " * n for n in [50, 2, 40, 3, 45, 1, 60, 2]]
+    inner = RecordingEmbedder()
+    bucketed = LengthBucketedEmbedder(inner, bucket_size=4, length_fn=word_lengths)
+
+    vectors = bucketed.embed(texts)
+
+    assert vectors[:, 0].tolist() == [float(len(t)) for t in texts]
+    # Short texts share one bucket, long texts the other
+    assert [sorted(c) for c in inner.calls] == [[2, 4, 4, 6], [80, 90, 100, 120]]
+
+
+def test_padding_efficiency_improves_over_caller_order():
+    texts = ["w " * n for n in [50, 2, 40, 3, 45, 1, 60, 2]]
+    bucketed = LengthBucketedEmbedder(RecordingEmbedder(), bucket_size=4, length_fn=word_lengths)
+    bucketed.embed(texts)
+
+    stats = bucketed.stats()
+    assert stats["real_tokens"] == 203
+    assert stats["padded_tokens"] == padded_cost(sorted(word_lengths(texts)), 4)
+    assert stats["padding_efficiency"] > 0.8
+    assert stats["unsorted_efficiency"] < 0.5
+
+
+def test_for_ingest_wraps_once():
+    wrapped = for_ingest(RecordingEmbedder())
+    assert isinstance(wrapped, LengthBucketedEmbedder)
+    assert for_ingest(wrapped) is wrapped
+    assert np.asarray(wrapped.embed(["only one"])).shape == (1, 2)
+
+
+def test_for_ingest_reuses_one_wrapper_per_embedder(monkeypatch):
+    monkeypatch.setattr(bucketing, "token_length_fn", lambda name: word_lengths)
+    inner = RecordingEmbedder()
+    first = for_ingest(inner)
+    first.embed(["w " * 50, "w"])
+
+    # A later ingest gets the same wrapper, so stats keep accumulating
+    assert for_ingest(inner) is first
+    assert for_ingest(RecordingEmbedder()) is not first
+    assert ingest_padding_stats()["real_tokens"] >= 51
+
+
+def test_token_lengths_resolve_model_alias(monkeypatch):
+    import src.data_prep.token_chunker as token_chunker
+    loaded = []
+
+    def load_tokenizer(alias):
+        loaded.append(alias)
+        return object()
+
+    monkeypatch.setattr(token_chunker, "load_tokenizer", load_tokenizer)
+    monkeypatch.setattr(token_chunker, "count_tokens", lambda texts, tokenizer: [len(t.split()) for t in texts])
+
+    # ProcessPoolEmbedder reports the alias, SentenceTransformer embedders the model id
+    # + [CLS] and [SEP]
+    assert bucketing.token_length_fn("minilm")(["a b c"]) == [5]
+    assert bucketing.token_length_fn(bucketing.EMBEDDING_MODEL_REGISTRY["minilm"])(["a b"]) == [4]
+    assert loaded == ["minilm", "minilm"]
@@ -0,0 +1,52 @@
+# tests/test_chunk_store.py
+import json
+import os
+from src.data_prep.chunk_store import ChunkStoreReader, ChunkStoreWriter, INDEX_FILE, TEXT_FILE
+from src.data_prep.saver import save_chunks, save_chunks_binary, iter_saved_chunks
+
+
+def test_roundtrip_random_access(tmp_path):
+    path = str(tmp_path / "doc.chunks")
+    chunks = ["first chunk", "ünïcödé → chunk", "", "last"]
+
+    assert save_chunks_binary(iter(chunks), path, source="doc.txt") == 4
+
+    with ChunkStoreReader(path) as reader:
+        assert len(reader) == 4
+        assert reader[1] == "ünïcödé → chunk"
+        assert reader[-1] == "last"
+        assert reader.metadata(2) == {"source": "doc.txt", "chunk_index": 2}
+        assert [text for text, _ in reader.iter_range(1, 3)] == chunks[1:3]
+
+
+def test_append_and_torn_record_recovery(tmp_path):
+    path = str(tmp_path / "doc.chunks")
+    save_chunks_binary(["a", "b"], path)
+    save_chunks_binary(["c"], path, append=True)
+
+    # Simulate a crash: index record written, text blob not flushed
+    with open(os.path.join(path, INDEX_FILE), "ab") as f:
+        f.write(b"\x00" * 7)
+    with ChunkStoreWriter(path) as writer:
+        writer.append("d", {"chunk_index": 3})
+    with open(os.path.join(path, TEXT_FILE), "r+b") as f:
+        f.truncate(3)
+
+    with ChunkStoreReader(path) as reader:
+        assert [text for text, _ in reader] == ["a", "b", "c"]
+        assert reader.metadata(2)["chunk_index"] == 2
+
+
+def test_iter_saved_chunks_reads_all_formats(tmp_path):
+    as_list = tmp_path / "list.json"
+    save_chunks(["x", "y"], as_list)
+
+    as_dict = tmp_path / "dict.json"
+    as_dict.write_text(json.dumps({"source": "orig.pdf", "chunks": ["z"]}))
+
+    as_bin = str(tmp_path / "bin.chunks")
+    save_chunks_binary(["w"], as_bin, source="bin.txt")
+
+    assert list(iter_saved_chunks(str(as_list)))[1] == ("y", {"source": "list", "chunk_index": 1})
+    assert list(iter_saved_chunks(str(as_dict))) == [("z", {"source": "orig.pdf", "chunk_index": 0})]
+    assert list(iter_saved_chunks(as_bin)) == [("w", {"source": "bin.txt", "chunk_index": 0})]
@@ -7,3 +7,32 @@ def test_chunking_basic():
     assert len(chunks) >= 2
     # ensure headings preserved
     assert any("PHASE 1" in c for c in chunks)
+
+
+def test_iter_chunks_matches_chunk_text():
+    import io
+    from src.data_prep.chunker import iter_chunks
+
+    text = (
+        "INTRODUCTION\n\nFirst paragraph.\n  \n\nSecond paragraph.\n\n"
+        "PHASE 2: BUILD\n• A\n• B\n\n" + ("y" * 400) + "\n\n" + ("z" * 400)
+    )
+
+    expected = chunk_text(text, chunk_size=300, overlap=40)
+
+    assert list(iter_chunks(io.StringIO(text), chunk_size=300, overlap=40)) == expected
+    assert list(iter_chunks(io.BytesIO(text.encode("utf-8")), chunk_size=300, overlap=40)) == expected
+
+
+def test_iter_chunks_is_lazy():
+    from src.data_prep.chunker import iter_chunks
+
+    def endless_lines():
+        while True:
+            yield "Some paragraph text.\n"
+            yield "\n"
+
+    chunks = iter_chunks(endless_lines(), chunk_size=100)
+    first = next(chunks)
+    assert first.startswith("Some paragraph text.")
+    assert len(first) <= 100
@@ -0,0 +1,86 @@
+# tests/test_compression.py
+import numpy as np
+import pytest
+
+from src.vectorstore.compression import VectorCompressor
+from src.vectorstore.db_store import ChromaStore
+from evaluation.compression_report import exact_top_k, recall_vs_full
+
+
+def low_rank_vectors(n=200, dim=32, rank=4, seed=0):
+    rng = np.random.default_rng(seed)
+    return (rng.normal(size=(n, rank)) @ rng.normal(size=(rank, dim))).astype(np.float32)
+
+
+class HashEmbedder:
+    model_name = "dummy-model"
+
+    def embed(self, texts):
+        return np.stack([low_rank_vectors(n=1, seed=len(t))[0] for t in texts])
+
+
+def test_pca_keeps_neighbours_of_low_rank_data():
+    vectors = low_rank_vectors()
+    compressor = VectorCompressor("pca", dim=8).fit(vectors)
+
+    compressed = compressor.transform(vectors)
+    assert compressed.shape == (200, 8) and compressed.dtype == np.float32
+    assert np.allclose(np.linalg.norm(compressed, axis=1), 1.0, atol=1e-5)
+
+    reference = exact_top_k(vectors, vectors[:20], k=5, exclude=np.arange(20))
+    found = exact_top_k(compressed, compressed[:20], k=5, exclude=np.arange(20))
+    assert recall_vs_full(reference, found) > 0.95
+
+
+def test_truncate_and_float16():
+    compressor = VectorCompressor("truncate", dim=4, float16=True)
+    out = compressor.transform(np.arange(1, 9, dtype=np.float32))
+
+    assert compressor.fitted and compressor.bytes_per_vector() == 8
+    assert out.shape == (1, 4)
+    expected = np.arange(1, 5) / np.linalg.norm(np.arange(1, 5))
+    assert np.allclose(out[0], expected, atol=1e-3)
+    assert np.array_equal(out, out.astype(np.float16).astype(np.float32))
+
+
+def test_unfitted_pca_and_bad_method_raise():
+    with pytest.raises(RuntimeError):
+        VectorCompressor("pca", dim=4).transform(np.ones((1, 8)))
+    with pytest.raises(ValueError):
+        VectorCompressor("svd")
+    with pytest.raises(ValueError):
+        VectorCompressor("pca", dim=16).fit(np.ones((4, 32)))
+
+
+def test_save_load_roundtrip(tmp_path):
+    vectors = low_rank_vectors()
+    compressor = VectorCompressor("pca", dim=8, float16=True).fit(vectors)
+    compressor.save(str(tmp_path / "c.npz"))
+
+    loaded = VectorCompressor.load(str(tmp_path / "c.npz"))
+    assert (loaded.method, loaded.dim, loaded.float16) == ("pca", 8, True)
+    assert np.allclose(loaded.transform(vectors), compressor.transform(vectors))
+
+
+def test_compressed_store_indexes_and_queries_in_reduced_space(tmp_path):
+    embedder = HashEmbedder()
+    store = ChromaStore(persist_dir=str(tmp_path), embedder=embedder, compression="pca", compression_dim=4)
+    assert "_pca4" in store.collection.name
+
+    with pytest.raises(RuntimeError):
+        store.add(ids=["a"], documents=["x"])
+
+    store.fit_compressor(low_rank_vectors(n=50))
+    docs = ["short", "a bit longer", "the longest document of all"]
+    store.add(ids=["a", "b", "c"], documents=docs)
+
+    stored = store.collection.get(ids=["a"], include=["embeddings"])["embeddings"]
+    assert np.asarray(stored).shape == (1, 4)
+
+    result = store.search("a bit longer", n_results=1)
+    assert result["ids"][0] == ["b"]
+
+    # Reopening picks up the saved compressor
+    reopened = ChromaStore(persist_dir=str(tmp_path), embedder=embedder, compression="pca", compression_dim=4)
+    assert reopened.compressor.fitted
+    assert np.allclose(reopened.embed_query(["short"]), store.embed_query(["short"]))
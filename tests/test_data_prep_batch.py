@@ -0,0 +1,55 @@
+# tests/test_data_prep_batch.py
+import json
+from src.data_prep.batch import prepare_many, resolve_inputs
+
+
+def test_resolve_inputs_filters_supported(tmp_path):
+    (tmp_path / "a.txt").write_text("alpha")
+    (tmp_path / "nested").mkdir()
+    (tmp_path / "nested" / "b.txt").write_text("beta")
+    (tmp_path / "ignore.csv").write_text("x,y")
+
+    inputs = resolve_inputs(str(tmp_path))
+
+    assert [p.split("/")[-1] for p in inputs] == ["a.txt", "b.txt"]
+    assert resolve_inputs(str(tmp_path / "*.txt")) == [str(tmp_path / "a.txt")]
+
+
+def test_prepare_many_isolates_failures(tmp_path):
+    good = tmp_path / "good.txt"
+    good.write_text("TITLE SECTION\n\nSome body text.\n\nMore body text.")
+    bad = tmp_path / "bad.docx"
+    bad.write_bytes(b"not a real docx")
+    out_dir = tmp_path / "chunks"
+
+    seen = []
+    summary = prepare_many(
+        [str(good), str(bad)],
+        output_dir=str(out_dir),
+        workers=2,
+        on_result=lambda stats, done, total: seen.append((done, total)),
+    )
+
+    assert summary["files"] == 2
+    assert summary["succeeded"] == 1
+    assert summary["failed"] == 1
+    assert summary["chunks"] > 0
+    assert sorted(seen) == [(1, 2), (2, 2)]
+
+    saved = json.loads((out_dir / "good.json").read_text())
+    assert saved and "Some body text." in saved[0]
+
+
+def test_outputs_are_named_relative_to_the_input_root(tmp_path):
+    from src.data_prep.batch import output_paths_for
+    import pytest
+
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    inputs = [str(tmp_path / "a" / "notes.txt"), str(tmp_path / "b" / "notes.txt")]
+
+    outputs = output_paths_for(inputs, "out")
+    assert sorted(outputs.values()) == ["out/a__notes.json", "out/b__notes.json"]
+
+    with pytest.raises(ValueError):
+        output_paths_for([str(tmp_path / "x.txt"), str(tmp_path / "x.pdf")], "out")
@@ -0,0 +1,162 @@
+# tests/test_dedup.py
+from src.data_prep.dedup import NearDuplicateIndex, simhash, hamming
+
+BASE = (
+    "This document is confidential and intended solely for the use of the "
+    "individual or entity to whom it is addressed. If you have received it "
+    "in error please notify the sender immediately and delete all copies."
+)
+
+
+def test_simhash_is_stable_and_similarity_sensitive():
+    assert simhash(BASE) == simhash(BASE)
+
+    near = BASE.replace("immediately", "right away")
+    far = "Quarterly revenue grew by twelve percent driven by cloud subscriptions."
+
+    assert hamming(simhash(BASE), simhash(near)) < hamming(simhash(BASE), simhash(far))
+
+
+def test_index_finds_near_duplicates_and_persists(tmp_path):
+    path = str(tmp_path / "dups.sqlite")
+
+    index = NearDuplicateIndex(path, similarity=0.85)
+    index.add("a", BASE)
+    assert index.find(BASE + " Thank you.") == "a"
+    assert index.find("Completely unrelated text about vector databases and search.") is None
+    index.close()
+
+    reopened = NearDuplicateIndex(path, similarity=0.85)
+    assert len(reopened) == 1
+    assert reopened.find(BASE) == "a"
+
+    reopened.remove(["a"])
+    assert reopened.find(BASE) is None
+
+
+def test_ingest_drops_near_duplicate_chunks():
+    from src.utils import ingest_text_incremental
+    from tests.test_ingest import HashAwareStore, CountingEmbedder
+
+    store = HashAwareStore()
+    store.dedup_index = NearDuplicateIndex(similarity=0.85)
+    embedder = CountingEmbedder()
+
+    first = "FIRST DOCUMENT\n\nAlpha facts about retrieval pipelines.\n\nDISCLAIMER\n\n" + BASE
+    ingest_text_incremental(first, "a.txt", embedder, store, chunk_size=300)
+
+    second = "SECOND DOCUMENT\n\nBeta notes on embeddings.\n\nDISCLAIMER\n\n" + BASE + " Thanks."
+    stats = ingest_text_incremental(second, "b.txt", embedder, store, chunk_size=300)
+
+    assert stats["near_duplicates"] == 1
+    assert stats["added"] == stats["chunks"] - 1
+    assert embedder.embedded == len(store.rows)
+
+
+def test_single_band_thresholds_fit_in_sqlite():
+    for similarity in (0.99, 1.0):
+        index = NearDuplicateIndex(similarity=similarity)
+        assert len(index.bands) == 1
+
+        for i in range(20):  # some signatures have the top bit set
+            index.add(f"c{i}", f"{BASE} variant {i}")
+
+        assert index.find(BASE + " variant 7") == "c7"
+        assert index.find("Completely unrelated text about vector databases and search.") is None
+
+
+def test_failed_write_leaves_no_signatures():
+    import pytest
+    from src.utils import ingest_text_incremental
+    from tests.test_ingest import HashAwareStore, CountingEmbedder
+
+    class FailingStore(HashAwareStore):
+        def add(self, ids, documents, embeddings=None, metadatas=None):
+            raise RuntimeError("write failed")
+
+    failing = FailingStore()
+    failing.dedup_index = NearDuplicateIndex(similarity=0.85)
+    with pytest.raises(RuntimeError):
+        ingest_text_incremental(BASE, "a.txt", CountingEmbedder(), failing, chunk_size=300)
+    assert len(failing.dedup_index) == 0
+
+    store = HashAwareStore()
+    store.dedup_index = failing.dedup_index
+    stats = ingest_text_incremental(BASE + " Thanks.", "b.txt", CountingEmbedder(), store, chunk_size=300)
+    assert stats["near_duplicates"] == 0
+    assert len(store.dedup_index) == stats["added"] == 1
+
+
+def test_batch_ingest_drops_duplicates_across_its_own_files():
+    from src.utils import ingest_documents_incremental
+    from tests.test_ingest import HashAwareStore, CountingEmbedder
+
+    store = HashAwareStore()
+    store.dedup_index = NearDuplicateIndex(similarity=0.85)
+
+    stats = ingest_documents_incremental(
+        [("a.txt", BASE), ("b.txt", BASE + " Thanks.")], CountingEmbedder(), store, chunk_size=300,
+    )
+
+    assert stats["near_duplicates"] == 1
+    assert len(store.rows) == len(store.dedup_index) == 1
+
+
+def test_failed_reingest_keeps_signatures_of_stored_chunks():
+    import pytest
+    from src.utils import ingest_text_incremental
+    from tests.test_ingest import HashAwareStore, CountingEmbedder
+
+    class FailingEmbedder(CountingEmbedder):
+        def embed(self, texts):
+            raise RuntimeError("embedding failed")
+
+    store = HashAwareStore()
+    store.dedup_index = NearDuplicateIndex(similarity=0.85)
+    ingest_text_incremental(BASE, "a.txt", CountingEmbedder(), store, chunk_size=300)
+
+    with pytest.raises(RuntimeError):
+        ingest_text_incremental("Rewritten document.", "a.txt", FailingEmbedder(), store, chunk_size=300)
+
+    # The old chunk is still stored, so it must still be found
+    assert len(store.rows) == len(store.dedup_index) == 1
+    assert store.dedup_index.find(BASE) in store.rows
+
+
+def test_dropped_duplicate_is_stored_when_its_kept_chunk_goes(tmp_path):
+    from src.utils import ingest_text_incremental
+    from src.vectorstore.numpy_store import NumpyStore
+    from tests.test_hybrid_search import DummyEmbedder
+
+    store = NumpyStore(persist_dir=str(tmp_path), embedder=DummyEmbedder(), dedup=True)
+    store.dedup_index = NearDuplicateIndex(str(tmp_path / "dups.sqlite"), similarity=0.85)
+
+    ingest_text_incremental(BASE, "a.txt", DummyEmbedder(), store, chunk_size=300)
+    stats = ingest_text_incremental(BASE + " Thanks.", "b.txt", DummyEmbedder(), store, chunk_size=300)
+    assert stats["near_duplicates"] == 1
+    assert store.collection.get(where={"source": "b.txt"})["ids"] == []
+
+    # a.txt drops the shared text: b.txt's copy takes its place
+    ingest_text_incremental("Something else entirely.", "a.txt", DummyEmbedder(), store, chunk_size=300)
+    kept = store.collection.get(where={"source": "b.txt"}, include=["documents"])
+    assert kept["documents"] == [BASE + " Thanks."]
+    assert store.dedup_index.find(BASE) == kept["ids"][0]
+    assert store.dedup_index.aliases_of([kept["ids"][0]]) == []
+
+    # ...and b.txt now sees it as its own unchanged chunk
+    again = ingest_text_incremental(BASE + " Thanks.", "b.txt", DummyEmbedder(), store, chunk_size=300)
+    assert again["unchanged"] == 1 and again["added"] == 0
+
+
+def test_duplicate_removed_from_its_source_is_forgotten(tmp_path):
+    from src.utils import ingest_text_incremental
+    from tests.test_ingest import HashAwareStore, CountingEmbedder
+
+    store = HashAwareStore()
+    store.dedup_index = NearDuplicateIndex(similarity=0.85)
+    ingest_text_incremental(BASE, "a.txt", CountingEmbedder(), store, chunk_size=300)
+    ingest_text_incremental(BASE + " Thanks.", "b.txt", CountingEmbedder(), store, chunk_size=300)
+    assert len(store.dedup_index.source_aliases("b.txt")) == 1
+
+    ingest_text_incremental("Unrelated replacement text.", "b.txt", CountingEmbedder(), store, chunk_size=300)
+    assert store.dedup_index.source_aliases("b.txt") == {}
@@ -1,5 +1,9 @@
 # tests/test_embedding_api.py
+import base64
+
+import numpy as np
 from fastapi.testclient import TestClient
+from src.api import main
 from src.api.main import app
 
 client = TestClient(app)
@@ -23,3 +27,47 @@ def test_embedding_api():
 def test_embedding_empty_text():
     res = client.post("/embedding", json={"text": ""})
     assert res.status_code == 422
+
+
+class DummyEmbedder:
+    model_name = "dummy-model"
+
+    def __init__(self):
+        self.calls = []
+
+    def embed(self, texts):
+        self.calls.append(list(texts))
+        return np.array([[len(t), 0.5, -1.0] for t in texts], dtype=np.float32)
+
+
+def test_embedding_batch_encodings(monkeypatch):
+    embedder = DummyEmbedder()
+    monkeypatch.setattr(main, "get_embedder", lambda: embedder)
+    expected = [[2.0, 0.5, -1.0], [5.0, 0.5, -1.0]]
+
+    res = client.post("/embedding/batch", json={"texts": ["ab", "hello"]})
+    assert res.status_code == 200
+    assert res.json()["embeddings"] == expected
+    assert res.json()["count"] == 2 and res.json()["dimensions"] == 3
+
+    res = client.post("/embedding/batch", json={"texts": ["ab", "hello"], "encoding": "base64"})
+    body = res.json()
+    raw = np.frombuffer(base64.b64decode(body["embeddings_base64"]), dtype="<f4")
+    assert raw.reshape(body["count"], body["dimensions"]).tolist() == expected
+
+    res = client.post("/embedding/batch", json={"texts": ["ab", "hello"], "encoding": "binary"})
+    assert res.headers["content-type"] == "application/octet-stream"
+    assert res.headers["x-embedding-dimensions"] == "3"
+    assert np.frombuffer(res.content, dtype="<f4").reshape(2, 3).tolist() == expected
+
+    # One batched model call per request
+    assert embedder.calls == [["ab", "hello"]] * 3
+
+
+def test_embedding_batch_limits(monkeypatch):
+    monkeypatch.setattr(main, "get_embedder", lambda: DummyEmbedder())
+    monkeypatch.setattr(main, "EMBEDDING_BATCH_MAX_TEXTS", 2)
+
+    assert client.post("/embedding/batch", json={"texts": ["a", "b", "c"]}).status_code == 413
+    assert client.post("/embedding/batch", json={"texts": []}).status_code == 422
+    assert client.post("/embedding/batch", json={"texts": ["a", ""]}).status_code == 422
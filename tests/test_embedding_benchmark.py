@@ -0,0 +1,42 @@
+# tests/test_embedding_benchmark.py
+import numpy as np
+
+from benchmarks.embedding_throughput import run_config, compare_results, best_settings
+
+
+class DummyEmbedder:
+    def embed(self, texts):
+        return np.ones((len(texts), 3), dtype=np.float32)
+
+
+def test_run_config_covers_the_matrix():
+    config = {
+        "backend": "dummy",
+        "threads": 1,
+        "batch_sizes": [1, 4],
+        "lengths": ["short", "long"],
+        "cache": [False, True],
+        "min_texts": 8,
+        "min_calls": 3,
+    }
+    results = run_config(config, factory=lambda backend, cache: DummyEmbedder())
+
+    assert len(results) == 8
+    for row in results:
+        assert row["texts_per_s"] > 0
+        assert row["p99_ms"] >= row["p50_ms"] >= 0
+        assert row["peak_rss_mb"] > 0
+    assert {r["calls"] for r in results if r["batch_size"] == 1} == {8}
+
+
+def test_compare_and_best_settings():
+    base = {"backend": "m", "threads": 4, "length": "short", "cache": False, "p99_ms": 2.0}
+    old = {"results": [dict(base, batch_size=8, texts_per_s=100.0), dict(base, batch_size=32, texts_per_s=300.0)]}
+    new = {"results": [dict(base, batch_size=8, texts_per_s=150.0, p99_ms=1.0)]}
+
+    rows = compare_results(old, new)
+    assert len(rows) == 1
+    assert rows[0]["speedup"] == 1.5 and rows[0]["p99_ratio"] == 0.5
+
+    best = best_settings(old["results"])
+    assert best[("m", "short")]["batch_size"] == 32
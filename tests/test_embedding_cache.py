@@ -0,0 +1,97 @@
+# tests/test_embedding_cache.py
+import numpy as np
+
+from src.embedder.cached import CachedEmbedder, text_key
+
+
+class CountingEmbedder:
+    model_name = "dummy-model"
+
+    def __init__(self):
+        self.calls = []
+
+    def embed(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(t)), 1.0, 0.5] for t in texts]
+
+
+def test_repeated_texts_hit_memory_tier():
+    inner = CountingEmbedder()
+    cached = CachedEmbedder(inner)
+
+    first = cached.embed(["alpha", "beta", "alpha"])
+    second = cached.embed(["beta", "alpha  "])  # whitespace-normalized
+
+    assert first.dtype == np.float32 and first.flags["C_CONTIGUOUS"]
+    first, second = first.tolist(), second.tolist()
+
+    assert inner.calls == [["alpha", "beta"]]
+    assert first == [[5.0, 1.0, 0.5], [4.0, 1.0, 0.5], [5.0, 1.0, 0.5]]
+    assert second == [first[1], first[0]]
+
+    stats = cached.stats()
+    assert stats["misses"] == 2
+    assert stats["memory_hits"] == 2
+    assert stats["hit_rate"] == 0.5
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    inner = CountingEmbedder()
+    CachedEmbedder(inner, cache_dir=str(tmp_path)).embed(["persisted text"])
+
+    fresh_inner = CountingEmbedder()
+    reopened = CachedEmbedder(fresh_inner, cache_dir=str(tmp_path))
+    assert reopened.embed(["persisted text"]).tolist() == [[14.0, 1.0, 0.5]]
+    assert fresh_inner.calls == []
+    assert reopened.stats()["disk_hits"] == 1
+
+
+def test_cache_is_keyed_by_model(tmp_path):
+    CachedEmbedder(CountingEmbedder(), cache_dir=str(tmp_path)).embed(["shared"])
+
+    other = CountingEmbedder()
+    other.model_name = "other-model"
+    CachedEmbedder(other, cache_dir=str(tmp_path)).embed(["shared"])
+    assert other.calls == [["shared"]]
+
+
+def test_tiers_are_size_bounded(tmp_path):
+    cached = CachedEmbedder(CountingEmbedder(), cache_dir=str(tmp_path), memory_items=2, disk_items=10)
+    cached.embed([f"text {i}" for i in range(25)])
+
+    stats = cached.stats()
+    assert stats["memory_items"] == 2
+    assert stats["disk_items"] <= 10
+
+
+def test_text_key_ignores_whitespace_runs():
+    assert text_key("a  b\n c ") == text_key("a b c")
+    assert text_key("a b") != text_key("ab")
+
+
+def test_backends_of_one_model_do_not_share_vectors(tmp_path):
+    torch_embedder = CountingEmbedder()
+    CachedEmbedder(torch_embedder, cache_dir=str(tmp_path)).embed(["shared"])
+
+    class Int8Embedder(CountingEmbedder):
+        cache_key = "dummy-model#onnx-int8"
+
+    # Same model_name, different runtime: a miss, not the torch vector
+    onnx = Int8Embedder()
+    cached = CachedEmbedder(onnx, cache_dir=str(tmp_path))
+    cached.embed(["shared"])
+    assert onnx.calls == [["shared"]]
+    assert cached.stats()["disk_hits"] == 0
+
+    # The key is found through wrappers too
+    class Wrapper:
+        def __init__(self, inner):
+            self.inner = inner
+            self.model_name = inner.model_name
+
+        def embed(self, texts):
+            return self.inner.embed(texts)
+
+    wrapped = Int8Embedder()
+    CachedEmbedder(Wrapper(wrapped), cache_dir=str(tmp_path)).embed(["shared"])
+    assert wrapped.calls == []
@@ -0,0 +1,120 @@
+# tests/test_hybrid_search.py
+import numpy as np
+import pytest
+
+from src.search.bm25_index import BM25Index, tokenize
+from src.search.hybrid_search import hybrid_search, reciprocal_rank_fusion
+from src.search.retriever_adapter import HybridRetriever
+from src.search.vector_search import vector_search
+from src.vectorstore.numpy_store import NumpyStore
+
+
+class DummyEmbedder:
+    model_name = "dummy-model"
+
+    def embed(self, texts):
+        return np.stack([np.random.default_rng(len(t)).normal(size=8) for t in texts]).astype(np.float32)
+
+
+def test_tokenize_keeps_codes_whole_and_split():
+    assert tokenize("The XJ-9000 router, v2.5") == ["xj-9000", "xj", "9000", "router", "v2.5", "v2", "5"]
+
+
+def test_bm25_ranks_rare_terms_and_persists(tmp_path):
+    path = str(tmp_path / "bm25.sqlite")
+    index = BM25Index(path)
+    index.add(
+        ["a", "b", "c"],
+        ["the router manual", "router firmware for the XJ-9000", "router router router setup"],
+    )
+
+    assert [cid for cid, _ in index.search("XJ-9000 router", top_k=3)][0] == "b"
+    assert [cid for cid, _ in index.search("setup")] == ["c"]
+    assert index.search("unknown words") == []
+
+    # Upsert replaces, add(replace=False) keeps, remove drops
+    index.add(["c"], ["nothing relevant"])
+    index.add(["b"], ["ignored"], replace=False)
+    index.remove(["a"])
+    assert index.search("setup") == []
+
+    reopened = BM25Index(path)
+    assert len(reopened) == 2
+    assert reopened.search("xj-9000") == index.search("xj-9000")
+    assert reopened.search("relevant")[0][0] == "c"
+
+
+def test_reciprocal_rank_fusion():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["c", "a"]], k=60)
+
+    assert [text for text, _ in fused] == ["a", "c", "b"]
+    assert fused[0][1] == 1 / 61 + 1 / 62
+
+
+def test_handles_on_one_file_see_each_others_writes(tmp_path):
+    path = str(tmp_path / "bm25.sqlite")
+    a, b, c = BM25Index(path), BM25Index(path), BM25Index(path)
+
+    a.add(["x"], ["alpha router"])
+    b.add(["y"], ["beta router"])
+    a.add(["y"], ["gamma"])       # replaces b's document
+    b.remove(["x"])
+
+    for index in (a, b, c):
+        assert len(index) == 1
+        assert index.search("router") == []
+        assert [cid for cid, _ in index.search("gamma")] == ["y"]
+
+
+def test_failed_collection_write_rolls_bm25_back(tmp_path):
+    store = NumpyStore(persist_dir=str(tmp_path), embedder=DummyEmbedder(), bm25=True)
+    store.upsert(ids=["a"], documents=["alpha"])
+
+    def fail(**kwargs):
+        raise RuntimeError("write failed")
+    store.collection.upsert = fail
+
+    with pytest.raises(RuntimeError):
+        store.upsert(ids=["a", "b"], documents=["replaced", "beta"])
+
+    assert [cid for cid, _ in store.bm25_index.search("alpha")] == ["a"]
+    assert store.bm25_index.search("replaced beta") == []
+
+
+def test_store_writes_keep_bm25_in_sync(tmp_path):
+    store = NumpyStore(persist_dir=str(tmp_path), embedder=DummyEmbedder(), bm25=True)
+    store.add(ids=["a", "b"], documents=["alpha product", "beta SKU-42 product"])
+    store.upsert(ids=["c"], documents=["gamma"])
+    assert len(store.bm25_index) == 3
+
+    store.delete(["b"])
+    assert store.bm25_index.search("sku-42") == []
+
+    store.reset()
+    assert len(store.bm25_index) == 0
+
+
+def test_hybrid_search_finds_exact_terms_vector_search_misses(tmp_path):
+    store = NumpyStore(persist_dir=str(tmp_path), embedder=DummyEmbedder(), bm25=True)
+    docs = [f"generic document number {i} about networking" for i in range(30)]
+    docs.append("Order code QX-7731 is discontinued")
+    store.add(ids=[f"d{i}" for i in range(len(docs))], documents=docs)
+
+    vector_only = [text for text, _ in vector_search("QX-7731", top_k=3, store=store)]
+    results = hybrid_search("QX-7731", store=store, top_k=3, candidates=5)
+
+    assert "Order code QX-7731 is discontinued" not in vector_only
+    assert "Order code QX-7731 is discontinued" in [text for text, _ in results]
+    assert len(results) == 3
+    assert all(0 < score <= 1 for _, score in results)
+
+
+def test_hybrid_retriever_without_bm25_falls_back_to_vectors(tmp_path):
+    store = NumpyStore(persist_dir=str(tmp_path), embedder=DummyEmbedder(), bm25=False)
+    store.add(ids=["a", "b"], documents=["alpha", "beta"])
+
+    docs = HybridRetriever(store).search("alpha", top_k=2)
+
+    assert sorted(d.text for d in docs) == ["alpha", "beta"]
+    assert docs[0].text == "alpha"
+    assert docs[0].score == 0.5  # first in one of the two lists
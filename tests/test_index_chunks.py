@@ -0,0 +1,76 @@
+# tests/test_index_chunks.py
+import json
+
+import numpy as np
+
+from src.data_prep.saver import save_chunks_binary
+from src.vectorstore.db_store import ChromaStore
+from src.vectorstore.pipeline import index_chunks
+from src.utils import chunk_id, content_hash
+
+
+class DummyEmbedder:
+    model_name = "dummy-model"
+
+    def __init__(self, fail_on=None):
+        self.calls = []
+        self.fail_on = fail_on
+
+    def embed(self, texts):
+        self.calls.append(len(texts))
+        if self.fail_on and self.fail_on in texts:
+            raise RuntimeError("interrupted")
+        return np.array([[len(t), 1.0, 0.5] for t in texts], dtype=np.float32)
+
+
+def make_chunks(folder):
+    folder.mkdir()
+    with open(folder / "a.json", "w") as f:
+        json.dump([f"alpha chunk {i}" for i in range(25)], f)
+    save_chunks_binary([f"beta chunk {i}" for i in range(12)], str(folder / "b.chunks"), source="b")
+
+
+def test_streams_in_fixed_batches_and_skips_done_files(tmp_path):
+    make_chunks(tmp_path / "chunks")
+    embedder = DummyEmbedder()
+    store = ChromaStore(persist_dir=str(tmp_path / "db"), embedder=embedder)
+
+    stats = index_chunks(str(tmp_path / "chunks"), store=store, batch_size=10)
+
+    assert stats["chunks_written"] == 37
+    assert store.collection.count() == 37
+    assert max(embedder.calls) <= 10
+    # Same ids as an upload of the same chunk
+    assert store.get_source_hashes("a")[chunk_id("a", content_hash("alpha chunk 24"))] == content_hash("alpha chunk 24")
+
+    again = index_chunks(str(tmp_path / "chunks"), store=store, batch_size=10)
+    assert again["files_skipped"] == 2 and again["chunks_written"] == 0
+
+
+def test_interrupted_run_resumes_from_checkpoint(tmp_path):
+    make_chunks(tmp_path / "chunks")
+    failing = DummyEmbedder(fail_on="alpha chunk 15")
+    store = ChromaStore(persist_dir=str(tmp_path / "db"), embedder=failing)
+
+    first = index_chunks(str(tmp_path / "chunks"), store=store, batch_size=10)
+    assert first["errors"] == 1
+
+    resumed = index_chunks(str(tmp_path / "chunks"), store=store, embedder=DummyEmbedder(), batch_size=10)
+    # a.json resumes after its first batch; the rest is replayed as upserts
+    assert resumed["chunks_skipped"] == 10
+    assert resumed["chunks_written"] == 27
+    assert store.collection.count() == 37
+
+
+def test_failed_batch_stops_feeding(tmp_path):
+    folder = tmp_path / "chunks"
+    folder.mkdir()
+    with open(folder / "a.json", "w") as f:
+        json.dump([f"alpha chunk {i}" for i in range(200)], f)
+
+    store = ChromaStore(persist_dir=str(tmp_path / "db"), embedder=DummyEmbedder(fail_on="alpha chunk 0"))
+    stats = index_chunks(str(folder), store=store, batch_size=1, queue_size=1)
+
+    assert stats["errors"] == 1
+    assert stats["stopped_early"]
+    assert stats["chunks_written"] < 10
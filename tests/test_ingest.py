@@ -28,3 +28,108 @@ def test_ingest_text_calls_store():
 
     assert chunks > 0
     assert store.called
+
+
+class HashAwareStore:
+    def __init__(self):
+        self.rows = {}  # id -> (document, metadata)
+
+    def add(self, ids, documents, embeddings=None, metadatas=None):
+        assert len(embeddings) == len(ids)
+        for i, doc, meta in zip(ids, documents, metadatas):
+            assert i not in self.rows
+            self.rows[i] = (doc, meta)
+
+    def delete(self, ids):
+        for i in ids:
+            del self.rows[i]
+
+    def update_metadata(self, ids, metadatas):
+        for i, meta in zip(ids, metadatas):
+            self.rows[i] = (self.rows[i][0], meta)
+
+    def get_source_chunks(self, source):
+        return {i: meta for i, (_, meta) in self.rows.items() if meta["source"] == source}
+
+
+class CountingEmbedder(DummyEmbedder):
+    def __init__(self):
+        self.embedded = 0
+
+    def embed(self, texts):
+        self.embedded += len(texts)
+        return super().embed(texts)
+
+
+def test_ingest_text_incremental_skips_unchanged_chunks():
+    from src.utils import ingest_text_incremental
+
+    paragraphs = [f"Paragraph {i} " + "word " * 20 for i in range(10)]
+    store = HashAwareStore()
+    embedder = CountingEmbedder()
+
+    first = ingest_text_incremental("\n\n".join(paragraphs), "doc.txt", embedder, store, chunk_size=150)
+    assert first["added"] == first["chunks"] > 1
+    assert embedder.embedded == first["added"]
+
+    # Re-upload unchanged → nothing embedded
+    again = ingest_text_incremental("\n\n".join(paragraphs), "doc.txt", embedder, store, chunk_size=150)
+    assert again["added"] == 0 and again["deleted"] == 0
+    assert embedder.embedded == first["added"]
+
+    # Edit one paragraph → only its chunk is replaced
+    paragraphs[3] = "Edited paragraph " + "term " * 20
+    edited = ingest_text_incremental("\n\n".join(paragraphs), "doc.txt", embedder, store, chunk_size=150)
+    assert edited["added"] == 1
+    assert edited["deleted"] == 1
+    assert len(store.rows) == edited["chunks"]
+
+
+def test_moved_chunks_get_their_new_index_without_reembedding():
+    from src.utils import ingest_text_incremental
+
+    paragraphs = [f"Paragraph {i} " + "word " * 20 for i in range(6)]
+    store = HashAwareStore()
+    embedder = CountingEmbedder()
+    ingest_text_incremental("\n\n".join(paragraphs), "doc.txt", embedder, store, chunk_size=150)
+    embedded = embedder.embedded
+
+    # Two paragraphs inserted at the top shift every later chunk
+    paragraphs[:0] = [f"New intro {i} " + "term " * 20 for i in range(2)]
+    stats = ingest_text_incremental("\n\n".join(paragraphs), "doc.txt", embedder, store, chunk_size=150)
+
+    assert stats["added"] == 2 and stats["moved"] == 6
+    assert embedder.embedded == embedded + 2
+    ordered = sorted(store.rows.values(), key=lambda row: row[1]["chunk_index"])
+    assert [meta["chunk_index"] for _, meta in ordered] == list(range(8))
+    assert [doc.split()[0:2] for doc, _ in ordered][:3] == [["New", "intro"], ["New", "intro"], ["Paragraph", "0"]]
+
+
+def test_ingest_documents_incremental_pools_chunks_across_files():
+    from src.utils import ingest_documents_incremental
+
+    class CallCountingEmbedder(CountingEmbedder):
+        def __init__(self):
+            super().__init__()
+            self.batches = []
+
+        def embed(self, texts):
+            self.batches.append([len(t) for t in texts])
+            return super().embed(texts)
+
+    docs = [(f"doc{i}.txt", f"Short note {i} " + "word " * (i + 1)) for i in range(20)]
+    store = HashAwareStore()
+    embedder = CallCountingEmbedder()
+
+    stats = ingest_documents_incremental(docs, embedder, store, batch_size=8)
+    assert stats["added"] == stats["chunks"] == 20
+    # 20 single-chunk files → 3 embedder calls, not 20
+    assert len(embedder.batches) == 3
+    lengths = [n for batch in embedder.batches for n in batch]
+    assert lengths == sorted(lengths)
+
+    # Each source still diffs on its own
+    docs[5] = ("doc5.txt", "Rewritten note")
+    again = ingest_documents_incremental(docs, embedder, store, batch_size=8)
+    assert again["added"] == again["deleted"] == 1
+    assert again["unchanged"] == 19
@@ -0,0 +1,163 @@
+# tests/test_jobs.py
+import threading
+import time
+from src.api.jobs import JobQueue
+from src.api.uploads import run_upload_job
+
+
+def wait(job, timeout=5):
+    deadline = time.time() + timeout
+    while job.finished_at is None and time.time() < deadline:
+        time.sleep(0.01)
+
+
+def test_submit_returns_immediately_and_runs_in_background():
+    release = threading.Event()
+    queue = JobQueue(workers=1)
+
+    def slow(job):
+        release.wait(timeout=5)
+        job.chunks_written = 3
+
+    job = queue.submit("slow.txt", slow)
+    assert queue.get(job.id).status in ("queued", "running")
+
+    release.set()
+    wait(job)
+    assert job.status == "done"
+    assert job.chunks_written == 3
+    queue.shutdown()
+
+
+def test_failed_job_records_error():
+    queue = JobQueue(workers=1)
+
+    def boom(job):
+        raise RuntimeError("parse failed")
+
+    job = queue.submit("bad.pdf", boom)
+    wait(job)
+    assert job.status == "failed"
+    assert "parse failed" in job.error
+    queue.shutdown()
+
+
+def test_finished_jobs_are_evicted_first():
+    queue = JobQueue(workers=1, max_jobs=2)
+    jobs = [queue.submit(f"{i}.txt", lambda job: None) for i in range(3)]
+    for job in jobs:
+        wait(job)
+
+    queue.submit("3.txt", lambda job: None)
+    assert queue.get(jobs[0].id) is None
+    queue.shutdown()
+
+
+class DummyEmbedder:
+    def embed(self, texts):
+        return [[0.1] * 5 for _ in texts]
+
+
+class MemoryStore:
+    def __init__(self):
+        self.rows = {}
+
+    def add(self, ids, documents, embeddings=None, metadatas=None):
+        self.rows.update(zip(ids, metadatas))
+
+    def delete(self, ids):
+        for i in ids:
+            self.rows.pop(i)
+
+    def update_metadata(self, ids, metadatas):
+        self.rows.update(zip(ids, metadatas))
+
+    def get_source_chunks(self, source):
+        return {i: m for i, m in self.rows.items() if m["source"] == source}
+
+
+def test_run_upload_job_reports_progress():
+    queue = JobQueue(workers=1)
+    store = MemoryStore()
+    text = "\n\n".join(f"Paragraph {i} " + "text " * 30 for i in range(6))
+
+    job = queue.submit("doc.txt", run_upload_job, "doc.txt", text.encode(), DummyEmbedder(), store)
+    wait(job)
+
+    assert job.status == "done", job.error
+    assert job.chunks_created > 0
+    assert job.chunks_embedded == job.chunks_written == len(store.rows)
+    queue.shutdown()
+
+
+def make_zip(files):
+    import io, zipfile
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as z:
+        for name, data in files.items():
+            z.writestr(name, data)
+    return buf.getvalue()
+
+
+def make_tar(files):
+    import io, tarfile
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz") as t:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            t.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+def test_expand_uploads_flattens_archives():
+    from src.api.uploads import expand_uploads
+
+    uploads = [
+        ("a.txt", b"alpha"),
+        ("bundle.zip", make_zip({"docs/b.txt": b"beta", "docs/skip.csv": b"x", "__MACOSX/docs/._b.txt": b"junk"})),
+        ("more.tar.gz", make_tar({"c.txt": b"gamma"})),
+    ]
+
+    documents = dict(expand_uploads(uploads))
+    assert documents == {"a.txt": b"alpha", "docs/b.txt": b"beta", "c.txt": b"gamma"}
+
+
+def test_expand_uploads_enforces_limits():
+    import pytest
+    from src.api.uploads import expand_uploads
+
+    with pytest.raises(ValueError):
+        expand_uploads([("a.txt", b"x"), ("b.txt", b"y")], max_files=1)
+
+    with pytest.raises(ValueError):
+        expand_uploads([("big.zip", make_zip({"a.txt": b"x" * 100}))], max_bytes=50)
+
+
+def test_run_batch_upload_job_pools_files_and_records_failures():
+    from src.api.uploads import run_batch_upload_job
+
+    queue = JobQueue(workers=1)
+    store = MemoryStore()
+
+    calls = []
+
+    class RecordingEmbedder(DummyEmbedder):
+        def embed(self, texts):
+            calls.append(len(texts))
+            return super().embed(texts)
+
+    files = {f"note{i}.txt": f"Note {i} about onboarding".encode() for i in range(30)}
+    files["broken.pdf"] = b"not a pdf"
+    uploads = [("notes.zip", make_zip(files))]
+
+    job = queue.submit("notes.zip", run_batch_upload_job, uploads, RecordingEmbedder(), store)
+    wait(job)
+
+    assert job.status == "done", job.error
+    assert job.files_total == 31
+    assert job.files_parsed == 30
+    assert job.files_failed == 1 and "broken.pdf" in job.file_errors
+    assert job.chunks_written == len(store.rows) == 30
+    assert calls == [30]
+    queue.shutdown()
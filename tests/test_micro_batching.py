@@ -0,0 +1,75 @@
+# tests/test_micro_batching.py
+import threading
+import time
+
+import pytest
+
+from src.embedder.batching import MicroBatchingEmbedder
+
+
+class SlowEmbedder:
+    model_name = "dummy-model"
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.calls = []
+
+    def embed(self, texts):
+        self.calls.append(len(texts))
+        time.sleep(self.delay)
+        return [[float(len(t))] for t in texts]
+
+
+def test_concurrent_requests_are_merged():
+    inner = SlowEmbedder()
+    batcher = MicroBatchingEmbedder(inner, max_batch=32, max_wait=0.05)
+
+    results = {}
+
+    def call(i):
+        results[i] = batcher.embed(["x" * i]).tolist()
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(1, 21)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # Every caller gets its own vector back
+    assert results == {i: [[float(i)]] for i in range(1, 21)}
+    assert sum(inner.calls) == 20
+    assert len(inner.calls) < 20
+    assert batcher.stats()["mean_batch_size"] > 1
+
+
+def test_batches_respect_max_batch():
+    inner = SlowEmbedder()
+    batcher = MicroBatchingEmbedder(inner, max_batch=4, max_wait=0.05)
+
+    threads = [threading.Thread(target=batcher.embed, args=(["a", "b", "c"],)) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sum(inner.calls) == 18
+    assert max(inner.calls) <= 4
+
+
+def test_large_requests_bypass_scheduler():
+    inner = SlowEmbedder(delay=0)
+    batcher = MicroBatchingEmbedder(inner, max_batch=4)
+
+    assert batcher.embed(["t"] * 10) == [[1.0]] * 10
+    assert inner.calls == [10]
+    assert batcher.stats()["batches"] == 0
+
+
+def test_errors_reach_every_caller():
+    class Broken:
+        def embed(self, texts):
+            raise RuntimeError("model crashed")
+
+    batcher = MicroBatchingEmbedder(Broken(), max_wait=0.001)
+    with pytest.raises(RuntimeError, match="model crashed"):
+        batcher.embed(["q"])
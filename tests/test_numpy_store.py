@@ -0,0 +1,125 @@
+# tests/test_numpy_store.py
+import numpy as np
+import pytest
+
+from src.search.vector_search import vector_search
+from src.utils import ingest_text_incremental
+from src.vectorstore.factory import create_vector_store
+from src.vectorstore.numpy_store import NumpyCollection, NumpyStore
+
+
+class DummyEmbedder:
+    model_name = "dummy-model"
+
+    def embed(self, texts):
+        return np.stack([np.random.default_rng(len(t)).normal(size=8) for t in texts]).astype(np.float32)
+
+
+def random_vectors(n, dim=8, seed=0):
+    return np.random.default_rng(seed).normal(size=(n, dim)).astype(np.float32)
+
+
+def test_query_is_exact_top_k_for_batched_queries(tmp_path):
+    collection = NumpyCollection(str(tmp_path / "c"), name="c")
+    vectors = random_vectors(3000)
+    ids = [f"id{i}" for i in range(3000)]
+    for start in range(0, 3000, 700):  # several writes → matrix grows
+        collection.add(ids=ids[start:start + 700], embeddings=vectors[start:start + 700],
+                       documents=[f"doc {i}" for i in range(start, min(start + 700, 3000))])
+
+    queries = random_vectors(4, seed=1)
+    result = collection.query(query_embeddings=queries, n_results=5)
+
+    normed = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = (queries / np.linalg.norm(queries, axis=1, keepdims=True)) @ normed.T
+    for q in range(4):
+        expected = np.argsort(-scores[q])[:5]
+        assert result["ids"][q] == [f"id{i}" for i in expected]
+        assert result["documents"][q][0] == f"doc {expected[0]}"
+        assert np.allclose(result["distances"][q], 1 - scores[q][expected], atol=1e-5)
+
+
+def test_upsert_delete_where_and_reopen(tmp_path):
+    path = str(tmp_path / "c")
+    collection = NumpyCollection(path, name="c")
+    metas = [{"source": "a" if i < 3 else "b", "chunk_index": i} for i in range(5)]
+    collection.upsert(ids=list("vwxyz"), embeddings=random_vectors(5), metadatas=metas, documents=list("VWXYZ"))
+
+    collection.upsert(ids=["w"], embeddings=random_vectors(1, seed=9), documents=["W2"], metadatas=[metas[1]])
+    collection.add(ids=["v"], embeddings=random_vectors(1, seed=5), documents=["ignored"])
+    collection.delete(ids=["v"])
+
+    assert collection.count() == 4
+    assert sorted(collection.get(where={"source": "a"})["ids"]) == ["w", "x"]
+    assert collection.get(ids=["w"])["documents"] == ["W2"]
+
+    collection.delete(where={"source": {"$eq": "b"}})
+    reopened = NumpyCollection(path, name="c")
+    assert sorted(reopened.ids) == ["w", "x"]
+    top = reopened.query(query_embeddings=random_vectors(1, seed=9), n_results=1)
+    assert top["ids"] == [["w"]] and top["metadatas"][0][0]["source"] == "a"
+
+    with pytest.raises(ValueError):
+        reopened.get(where={"chunk_index": {"$gt": 1}})
+
+
+def test_store_is_a_drop_in_backend(tmp_path):
+    store = create_vector_store(persist_dir=str(tmp_path), backend="numpy", embedder=DummyEmbedder())
+    assert isinstance(store, NumpyStore)
+
+    text = "First paragraph about retrieval.\n\nSecond paragraph about ranking."
+    stats = ingest_text_incremental(text, "notes.txt", DummyEmbedder(), store, chunk_size=40, overlap=0)
+    assert stats["added"] == store.collection.count() == 2
+
+    # Re-ingest is incremental through get_source_chunks / collection.get(where=...)
+    again = ingest_text_incremental(text, "notes.txt", DummyEmbedder(), store, chunk_size=40, overlap=0)
+    assert again["added"] == 0 and again["unchanged"] == 2
+
+    # A paragraph inserted on top moves the others: metadata-only update
+    moved = ingest_text_incremental("Intro paragraph.\n\n" + text, "notes.txt", DummyEmbedder(), store,
+                                    chunk_size=40, overlap=0)
+    assert moved["added"] == 1 and moved["moved"] == 2
+    metas = store.collection.get(include=["metadatas"])["metadatas"]
+    assert sorted(m["chunk_index"] for m in metas) == [0, 1, 2]
+
+    results = vector_search("Second paragraph about ranking.", top_k=1, store=store)
+    assert results[0][0] == "Second paragraph about ranking."
+
+    store.reset()
+    assert store.collection.count() == 0
+
+
+def test_float16_storage_halves_the_matrix(tmp_path):
+    store = NumpyStore(persist_dir=str(tmp_path), embedder=DummyEmbedder(),
+                       compression="truncate", compression_dim=4, float16=True)
+    store.add(ids=["a", "b"], documents=["one", "three"])
+
+    assert store.collection.dtype == np.float16
+    assert store.collection.get(ids=["a"], include=["embeddings"])["embeddings"].shape == (1, 4)
+    assert store.search("three", n_results=1)["ids"] == [["b"]]
+
+
+def test_stores_share_a_collection_and_other_processes_are_locked_out(tmp_path):
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    store = NumpyStore(persist_dir=str(tmp_path), embedder=DummyEmbedder())
+    other = NumpyStore(persist_dir=str(tmp_path), embedder=DummyEmbedder())
+    assert other.collection is store.collection
+
+    other.add(ids=["a"], documents=["alpha"])
+    store.delete(["a"])
+    store.add(ids=["b"], documents=["beta"])
+    assert other.search("beta", n_results=1)["ids"] == [["b"]]
+
+    script = (
+        "import sys; from src.vectorstore.numpy_store import NumpyCollection\n"
+        "try:\n    NumpyCollection(sys.argv[1], name='c')\n"
+        "except RuntimeError:\n    sys.exit(3)\n"
+    )
+    child = subprocess.run(
+        [sys.executable, "-c", script, store.collection.path],
+        cwd=Path(__file__).parent.parent,
+    )
+    assert child.returncode == 3
@@ -0,0 +1,81 @@
+# tests/test_onnx_embedder.py
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip("onnx")
+torch = pytest.importorskip("torch")
+
+from src.embedder.onnx_embedder import OnnxEmbedder, check_parity, model_cache_dir
+
+WORDS = "the a of to and vector search embedding query document chunk model fast slow text".split()
+
+
+@pytest.fixture(scope="module")
+def tiny_model(tmp_path_factory):
+    """A small random BERT with a local vocab, so no download is needed."""
+    from transformers import BertConfig, BertModel, BertTokenizerFast
+
+    path = str(tmp_path_factory.mktemp("tiny_bert"))
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + WORDS
+    with open(os.path.join(path, "vocab.txt"), "w") as f:
+        f.write("\n".join(vocab))
+
+    BertTokenizerFast(vocab_file=os.path.join(path, "vocab.txt")).save_pretrained(path)
+
+    torch.manual_seed(0)
+    config = BertConfig(
+        vocab_size=len(vocab), hidden_size=32, num_hidden_layers=2,
+        num_attention_heads=2, intermediate_size=64, max_position_embeddings=64,
+    )
+    BertModel(config).save_pretrained(path)
+    return path
+
+
+class TorchReference:
+    """Mean pooling + normalize on the PyTorch model."""
+
+    def __init__(self, path):
+        from transformers import AutoModel, AutoTokenizer
+        self.tokenizer = AutoTokenizer.from_pretrained(path)
+        self.model = AutoModel.from_pretrained(path).eval()
+
+    def embed(self, texts):
+        encoded = self.tokenizer(texts, padding=True, return_tensors="pt")
+        with torch.no_grad():
+            hidden = self.model(**encoded).last_hidden_state
+        mask = encoded["attention_mask"].unsqueeze(-1).float()
+        pooled = (hidden * mask).sum(1) / mask.sum(1)
+        return torch.nn.functional.normalize(pooled, dim=1).tolist()
+
+
+TEXTS = ["vector search", "the query and the document", "fast embedding model", "a chunk of text"]
+
+
+def test_onnx_matches_torch(tiny_model, tmp_path):
+    embedder = OnnxEmbedder(tiny_model, cache_dir=str(tmp_path), max_seq_length=32)
+
+    vectors = embedder.embed(TEXTS)
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0, atol=1e-5)
+    assert embedder.embed([]).shape == (0, vectors.shape[1])
+
+    report = check_parity(embedder, TorchReference(tiny_model), TEXTS)
+    assert report["min_cosine"] > 0.9999
+
+
+def test_int8_is_cached_and_close(tiny_model, tmp_path):
+    embedder = OnnxEmbedder(tiny_model, quantize=True, cache_dir=str(tmp_path), max_seq_length=32)
+    assert embedder.model_path.endswith("model.int8.onnx")
+    assert embedder.cache_key == f"{tiny_model}#onnx-int8"
+
+    cached = model_cache_dir(tiny_model, str(tmp_path))
+    assert sorted(f for f in os.listdir(cached) if f.endswith(".onnx")) == ["model.int8.onnx", "model.onnx"]
+
+    report = check_parity(embedder, TorchReference(tiny_model), TEXTS)
+    assert report["min_cosine"] > 0.95
+
+    # Second load reuses the cached export
+    mtime = os.path.getmtime(embedder.model_path)
+    OnnxEmbedder(tiny_model, quantize=True, cache_dir=str(tmp_path), max_seq_length=32)
+    assert os.path.getmtime(embedder.model_path) == mtime
@@ -0,0 +1,120 @@
+# tests/test_pdf_engine.py
+import os
+
+import pytest
+from src.data_prep import pdf_engine
+from src.data_prep.pdf_engine import iter_pdf_pages
+
+
+def make_pdf(pages: list[str]) -> bytes:
+    """
+    Builds a minimal multi-page PDF with one line of text per page.
+    """
+    n = len(pages)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids ["
+        + b" ".join(f"{4 + 2 * i} 0 R".encode() for i in range(n))
+        + f"] /Count {n} >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, text in enumerate(pages):
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>".encode()
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for num, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{num} 0 obj\n".encode() + body + b"\nendobj\n"
+
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for off in offsets:
+        out += f"{off:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+@pytest.mark.parametrize("extractor", ["pypdf", "pdfplumber"])
+def test_pages_yielded_in_order_and_cached(tmp_path, monkeypatch, extractor):
+    data = make_pdf([f"Page number {i}" for i in range(5)])
+    cache_dir = str(tmp_path / "cache")
+
+    pages = list(iter_pdf_pages(data, extractor=extractor, workers=1, cache_dir=cache_dir))
+    assert [p.strip() for p in pages] == [f"Page number {i}" for i in range(5)]
+
+    # Second pass must be served entirely from the cache
+    def fail(*args, **kwargs):
+        raise AssertionError("extractor should not run on cached pages")
+
+    monkeypatch.setitem(pdf_engine.EXTRACTORS, extractor, fail)
+    assert list(iter_pdf_pages(data, extractor=extractor, workers=1, cache_dir=cache_dir)) == pages
+
+
+def test_parallel_extraction_matches_serial(tmp_path):
+    pdf_path = tmp_path / "doc.pdf"
+    pdf_path.write_bytes(make_pdf([f"Section {i}" for i in range(20)]))
+
+    serial = list(iter_pdf_pages(str(pdf_path), workers=1, cache_dir=None))
+    parallel = list(
+        iter_pdf_pages(str(pdf_path), workers=2, cache_dir=None, min_parallel_pages=1)
+    )
+
+    assert parallel == serial
+    assert serial[19].strip() == "Section 19"
+
+
+def test_cache_evicts_least_recently_used_documents(tmp_path):
+    cache_dir = tmp_path / "cache"
+    docs = [make_pdf([f"Document {d} page {i} " * 40 for i in range(5)]) for d in range(3)]
+    hashes = [pdf_engine.file_hash(data) for data in docs]
+
+    for data in docs[:2]:
+        list(iter_pdf_pages(data, workers=1, cache_dir=str(cache_dir)))
+    os.utime(cache_dir / hashes[0], (1000, 1000))
+    os.utime(cache_dir / hashes[1], (2000, 2000))
+    cap = pdf_engine.PageCache(str(cache_dir)).size(hashes[0]) * 2.5 / (1 << 20)
+
+    # Reading doc 0 again (from the cache) makes doc 1 the oldest
+    list(iter_pdf_pages(docs[0], workers=1, cache_dir=str(cache_dir), cache_max_mb=cap))
+    list(iter_pdf_pages(docs[2], workers=1, cache_dir=str(cache_dir), cache_max_mb=cap))
+
+    assert {p.name for p in cache_dir.iterdir()} == {hashes[0], hashes[2]}
+
+
+def test_pdfplumber_path_does_not_need_pypdf(tmp_path, monkeypatch):
+    def broken(*args, **kwargs):
+        raise pdf_engine.pypdf.errors.PdfReadError("pypdf can't read this file")
+
+    monkeypatch.setattr(pdf_engine.pypdf, "PdfReader", broken)
+    data = make_pdf(["Only page"])
+
+    pages = list(iter_pdf_pages(data, extractor="pdfplumber", workers=1, cache_dir=None))
+    assert [p.strip() for p in pages] == ["Only page"]
+
+
+def test_page_evicted_from_the_cache_is_extracted_again(tmp_path, monkeypatch):
+    data = make_pdf([f"Page number {i}" for i in range(4)])
+    cache_dir = str(tmp_path / "cache")
+    expected = list(iter_pdf_pages(data, workers=1, cache_dir=cache_dir))
+
+    # Another process evicts page 2 while this one runs
+    real_get = pdf_engine.PageCache.get
+    def get(self, file_hash, page, extractor):
+        return None if page == 2 else real_get(self, file_hash, page, extractor)
+    monkeypatch.setattr(pdf_engine.PageCache, "get", get)
+
+    extracted = []
+    real_extract = pdf_engine.EXTRACTORS["pypdf"]
+    def extract(source, start, stop):
+        extracted.append((start, stop))
+        return real_extract(source, start, stop)
+    monkeypatch.setitem(pdf_engine.EXTRACTORS, "pypdf", extract)
+
+    assert list(iter_pdf_pages(data, workers=1, cache_dir=cache_dir)) == expected
+    assert extracted == [(2, 3)]
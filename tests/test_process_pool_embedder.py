@@ -0,0 +1,36 @@
+# tests/test_process_pool_embedder.py
+import os
+
+import numpy as np
+
+from src.embedder.process_pool import ProcessPoolEmbedder
+
+
+class PidEmbedder:
+    """[len(text), worker pid, torch threads] per text."""
+
+    def embed(self, texts):
+        import torch
+        return [[float(len(t)), float(os.getpid()), float(torch.get_num_threads())] for t in texts]
+
+
+def make_pid_embedder(embedder_name):
+    return PidEmbedder()
+
+
+def test_pool_preserves_order_and_pins_threads():
+    texts = ["x" * n for n in range(1, 41)]
+
+    with ProcessPoolEmbedder("dummy", workers=2, threads_per_worker=1, shard_size=5,
+                             factory=make_pid_embedder) as pool:
+        assert pool.warm_up() > 0
+        assert pool.embed([]).shape == (0, 3)  # asks a worker for the dim
+        vectors = pool.embed(texts)
+        stats = pool.stats()
+
+    assert vectors.dtype == np.float32
+    assert vectors[:, 0].tolist() == [float(n) for n in range(1, 41)]
+    assert set(vectors[:, 2].tolist()) == {1.0}
+    assert os.getpid() not in set(vectors[:, 1].astype(int).tolist())
+    assert stats["texts"] == 40
+    assert stats["chunks_per_s"] > 0
@@ -0,0 +1,36 @@
+# tests/test_ready_api.py
+import time
+from fastapi.testclient import TestClient
+from src.api import main
+from src.api.main import app
+
+
+def test_ready_after_warmup():
+    # Entering the client runs the lifespan hook, which starts warm-up
+    with TestClient(app) as client:
+        deadline = time.time() + 60
+        response = client.get("/ready")
+        while response.status_code == 503 and time.time() < deadline:
+            time.sleep(0.1)
+            response = client.get("/ready")
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["ready"] is True
+        assert body["models"]
+
+
+def test_ready_without_warmup(monkeypatch):
+    # Nothing loads the models up front, so /ready must not wait for them
+    monkeypatch.setattr(main, "API_WARMUP", False)
+    monkeypatch.setitem(main._warmup, "finished_at", None)
+    with TestClient(app) as client:
+        response = client.get("/ready")
+        assert response.status_code == 200
+        assert response.json()["ready"] is True
+
+
+def test_stats_reports_query_cache():
+    body = TestClient(app).get("/stats").json()
+    assert set(body["query_cache"]) >= {"hits", "misses", "hit_rate", "items"}
+    assert "ingest_padding" in body
@@ -0,0 +1,81 @@
+# tests/test_result_cache.py
+import numpy as np
+
+from src.search import vector_search as vs
+from src.search.result_cache import QueryResultCache
+from src.vectorstore.numpy_store import NumpyStore
+
+
+class CountingEmbedder:
+    model_name = "dummy-model"
+
+    def __init__(self):
+        self.calls = 0
+
+    def embed(self, texts):
+        self.calls += 1
+        return np.stack([np.random.default_rng(len(t)).normal(size=8) for t in texts]).astype(np.float32)
+
+
+def test_lru_ttl_and_stats(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr("src.search.result_cache.time.monotonic", lambda: clock[0])
+    cache = QueryResultCache(max_items=2, ttl=10)
+
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)          # evicts b, the least recently used
+    assert cache.get("b") is None
+
+    clock[0] += 11
+    assert cache.get("a") is None  # expired
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["expired"]) == (1, 2, 1, 1)
+    assert stats["hit_rate"] == 1 / 3
+
+
+def test_vector_search_is_cached_until_the_collection_changes(tmp_path, monkeypatch):
+    cache = QueryResultCache()
+    monkeypatch.setattr(vs, "get_query_cache", lambda: cache)
+
+    embedder = CountingEmbedder()
+    store = NumpyStore(persist_dir=str(tmp_path), embedder=embedder)
+    store.add(ids=["a", "b"], documents=["alpha", "beta gamma"])
+    embedder.calls = 0
+
+    first = vs.vector_search("beta gamma", top_k=1, store=store)
+    again = vs.vector_search("  beta   gamma ", top_k=1, store=store)
+    assert first == again == [("beta gamma", first[0][1])]
+    assert embedder.calls == 1
+    assert cache.stats()["hits"] == 1
+
+    # Another instance on the same collection sees the write, too
+    other = NumpyStore(persist_dir=str(tmp_path), embedder=embedder)
+    other.add(ids=["c"], documents=["beta gamma!"])
+    vs.vector_search("beta gamma", top_k=1, store=store)
+    assert embedder.calls == 3  # the add + a fresh search
+
+    store.delete(["c"])
+    vs.vector_search("beta gamma", top_k=1, store=store, use_cache=False)
+    assert embedder.calls == 4
+
+
+def test_version_is_shared_through_the_store_directory(tmp_path):
+    import sqlite3
+
+    store = NumpyStore(persist_dir=str(tmp_path), embedder=CountingEmbedder())
+    before = store.version
+    store.add(ids=["a"], documents=["alpha"])
+
+    # What another process sees: a separate connection to the same file
+    conn = sqlite3.connect(str(tmp_path / "collection_versions.sqlite"))
+    (seen,) = conn.execute(
+        "SELECT version FROM versions WHERE collection = ?", (store.collection.name,)
+    ).fetchone()
+    assert seen == store.version == before + 1
+
+    conn.execute("UPDATE versions SET version = version + 1")
+    conn.commit()
+    assert store.version == before + 2
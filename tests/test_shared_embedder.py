@@ -0,0 +1,48 @@
+# tests/test_shared_embedder.py
+import pytest
+
+import src.embedder.sentence_transformer_embedder as st_module
+from src.embedder import shared
+from src.embedder.factory import create_embedder
+
+
+class DummySTEmbedder:
+    loads = 0
+
+    def __init__(self, model_name):
+        DummySTEmbedder.loads += 1
+        self.model_name = model_name
+        self.model = object()
+
+    def embed(self, texts):
+        return [[0.0] for _ in texts]
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry(monkeypatch):
+    monkeypatch.setattr(st_module, "SentenceTransformerEmbedder", DummySTEmbedder)
+    DummySTEmbedder.loads = 0
+    shared.clear_shared_embedders()
+    yield
+    shared.clear_shared_embedders()
+
+
+def test_model_is_loaded_once_per_process():
+    from src.vectorstore.embeddings import EmbeddingModel
+
+    a = create_embedder("minilm", cache=False)
+    b = create_embedder("all-MiniLM-L6-v2", cache=False)
+    model = EmbeddingModel()
+
+    assert a is b
+    assert model.model is a.model
+    assert DummySTEmbedder.loads == 1
+    assert shared.loaded_models() == ["sentence-transformers/all-MiniLM-L6-v2 (torch)"]
+
+
+def test_shared_embedder_reuses_wrappers():
+    batched = shared.get_shared_embedder("minilm", cache=False, micro_batch=True)
+
+    assert shared.get_shared_embedder("minilm", cache=False, micro_batch=True) is batched
+    assert batched.inner is shared.get_shared_embedder("minilm", cache=False)
+    assert DummySTEmbedder.loads == 1
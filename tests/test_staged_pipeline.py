@@ -0,0 +1,170 @@
+# tests/test_staged_pipeline.py
+import threading
+import time
+from src.vectorstore.staged_pipeline import Stage, StagedPipeline, build_ingest_pipeline
+
+
+def test_stages_overlap_and_preserve_all_items():
+    seen = []
+    lock = threading.Lock()
+
+    def slow_double(x):
+        time.sleep(0.01)
+        return x * 2
+
+    def sink(x):
+        with lock:
+            seen.append(x)
+
+    pipeline = StagedPipeline([
+        Stage("double", slow_double, workers=4, queue_size=2),
+        Stage("sink", sink, queue_size=2),
+    ])
+    snapshot = pipeline.run(range(40))
+
+    assert sorted(seen) == [x * 2 for x in range(40)]
+    double, sink_stats = snapshot["stages"]
+    assert double["items_out"] == 40
+    assert sink_stats["items_in"] == 40
+    assert double["queue_max_depth"] <= 2
+    # 4 workers sleeping 10ms each → clearly faster than serial
+    assert snapshot["elapsed_seconds"] < 40 * 0.01
+
+
+def test_errors_are_isolated_per_item():
+    def fail_on_three(x):
+        if x == 3:
+            raise ValueError("bad item")
+        return x
+
+    pipeline = StagedPipeline([Stage("check", fail_on_three), Stage("sink", lambda x: None)])
+    snapshot = pipeline.run(range(5))
+
+    check = snapshot["stages"][0]
+    assert check["errors"] == 1
+    assert check["items_out"] == 4
+    assert "bad item" in check["last_error"]
+
+
+class DummyEmbedder:
+    def __init__(self):
+        self.batches = []
+
+    def embed(self, texts):
+        self.batches.append(len(texts))
+        return [[0.1] * 4 for _ in texts]
+
+
+def write_docs(folder, n_docs=3):
+    paths = []
+    for n in range(n_docs):
+        p = folder / f"doc{n}.txt"
+        p.write_text("\n\n".join(f"Paragraph {n}-{i} " + "text " * 40 for i in range(10)))
+        paths.append(str(p))
+    return paths
+
+
+def test_ingest_pipeline_batches_chunks(tmp_path):
+    from tests.test_ingest import HashAwareStore
+
+    paths = write_docs(tmp_path)
+    store, embedder = HashAwareStore(), DummyEmbedder()
+    pipeline = build_ingest_pipeline(store, embedder=embedder, batch_size=4, chunk_size=250)
+    snapshot = pipeline.run(paths)
+
+    parse, embed, write = snapshot["stages"]
+    assert write["units_out"] == len(store.rows) == parse["units_out"] == 30
+    assert max(embedder.batches) == 4
+
+
+def test_ingest_pipeline_shares_ids_with_uploads(tmp_path):
+    from src.utils import ingest_text_incremental
+    from tests.test_ingest import HashAwareStore, CountingEmbedder
+
+    paths = write_docs(tmp_path, n_docs=1)
+    store = HashAwareStore()
+    build_ingest_pipeline(store, embedder=DummyEmbedder(), chunk_size=250, root=str(tmp_path)).run(paths)
+    loaded = set(store.rows)
+
+    # Uploading the same file finds every chunk already stored
+    embedder = CountingEmbedder()
+    with open(paths[0], encoding="utf-8") as f:
+        stats = ingest_text_incremental(f.read(), "doc0.txt", embedder, store, chunk_size=250)
+    assert embedder.embedded == 0
+    assert stats["unchanged"] == 10
+    assert set(store.rows) == loaded
+
+    # Re-loading an edited file replaces only the changed chunk
+    with open(paths[0], "a", encoding="utf-8") as f:
+        f.write(" edited")
+    pipeline = build_ingest_pipeline(store, embedder=DummyEmbedder(), chunk_size=250, root=str(tmp_path))
+    pipeline.run(paths)
+    assert len(store.rows) == 10
+    assert pipeline.ingest_stats["unchanged"] == 9
+    assert pipeline.ingest_stats["deleted"] == 1
+
+
+def test_ingest_pipeline_skips_near_duplicates_like_uploads(tmp_path):
+    from src.data_prep.dedup import NearDuplicateIndex
+    from src.utils import ingest_documents_incremental
+    from tests.test_dedup import BASE
+    from tests.test_ingest import HashAwareStore, CountingEmbedder
+
+    documents = [("a.txt", f"Alpha facts about retrieval.\n\n{BASE}"), ("b.txt", f"Beta notes on embeddings.\n\n{BASE}")]
+    for name, text in documents:
+        (tmp_path / name).write_text(text)
+
+    store = HashAwareStore()
+    store.dedup_index = NearDuplicateIndex(similarity=0.85)
+    pipeline = build_ingest_pipeline(store, embedder=DummyEmbedder(), chunk_size=200, root=str(tmp_path))
+    pipeline.run([str(tmp_path / name) for name, _ in documents])
+
+    uploaded = HashAwareStore()
+    uploaded.dedup_index = NearDuplicateIndex(similarity=0.85)
+    stats = ingest_documents_incremental(documents, CountingEmbedder(), uploaded, chunk_size=200)
+
+    assert pipeline.ingest_stats["near_duplicates"] == stats["near_duplicates"] > 0
+    assert set(store.rows) == set(uploaded.rows)
+    assert len(store.dedup_index) == len(store.rows)
+
+
+def test_stale_chunks_are_deleted_after_all_batches_of_their_file(tmp_path):
+    from tests.test_ingest import HashAwareStore
+
+    class SlowFirstEmbedder(DummyEmbedder):
+        def embed(self, texts):
+            if not self.batches:
+                time.sleep(0.3)  # the later batches and the end marker overtake it
+            return super().embed(texts)
+
+    class RecordingStore(HashAwareStore):
+        def delete(self, ids):
+            self.stored_at_delete = set(self.rows)
+            super().delete(ids)
+
+    (path,) = write_docs(tmp_path, n_docs=1)
+    store = RecordingStore()
+    build_ingest_pipeline(store, embedder=DummyEmbedder(), chunk_size=250, root=str(tmp_path)).run([path])
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n\n".join(f"Rewritten {i} " + "text " * 40 for i in range(10)))
+    pipeline = build_ingest_pipeline(
+        store, embedder=SlowFirstEmbedder(), batch_size=4, chunk_size=250, embed_workers=2, root=str(tmp_path),
+    )
+    pipeline.run([path])
+
+    assert pipeline.ingest_stats["deleted"] == 10
+    assert len(store.rows) == 10
+    assert set(store.rows) <= store.stored_at_delete
+
+
+def test_streamed_split_matches_upload_split():
+    import io
+    from src.utils import iter_split_for_ingest, split_for_ingest
+
+    text = "\n\n".join(
+        ["INTRODUCTION", "Short paragraph.", "Long paragraph " + "words " * 120, "CHAPTER TWO", "Closing remarks."]
+    )
+    streamed = list(iter_split_for_ingest(io.StringIO(text), 200, 20, chunk_mode="chars"))
+    assert streamed == split_for_ingest(text, 200, 20, chunk_mode="chars")
+    assert len(streamed) > 4
@@ -0,0 +1,42 @@
+# tests/test_token_chunker.py
+import re
+from src.data_prep.token_chunker import chunk_text_by_tokens, count_tokens
+
+
+class WhitespaceTokenizer:
+    """
+    Fast-tokenizer stand-in: one token per whitespace-separated word.
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, texts, add_special_tokens=False, return_offsets_mapping=False):
+        self.calls += 1
+        if isinstance(texts, str):
+            spans = [m.span() for m in re.finditer(r"\S+", texts)]
+            return {"input_ids": list(range(len(spans))), "offset_mapping": spans}
+        return {"input_ids": [t.split() for t in texts]}
+
+
+def test_count_tokens_is_batched():
+    tok = WhitespaceTokenizer()
+    counts = count_tokens(["a b", "c", "d e f"] * 10, tok, batch_size=16)
+
+    assert counts[:3] == [2, 1, 3]
+    assert tok.calls == 2
+
+
+def test_chunks_respect_token_budget():
+    tok = WhitespaceTokenizer()
+    paragraphs = [" ".join(f"w{i}_{j}" for j in range(12)) for i in range(10)]
+    text = "SECTION ONE TITLE\n\n" + "\n\n".join(paragraphs) + "\n\n" + " ".join(["long"] * 70)
+
+    chunks = chunk_text_by_tokens(text, tokenizer=tok, max_tokens=30)
+
+    assert all(len(c.split()) <= 30 for c in chunks)
+    assert chunks[0].startswith("SECTION ONE TITLE")
+    # Paragraphs are packed, not one per chunk
+    assert len(chunks) < len(paragraphs)
+    # Oversized paragraph is split at token boundaries, nothing lost
+    assert sum(c.split().count("long") for c in chunks) == 70
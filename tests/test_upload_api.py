@@ -1,16 +1,60 @@
 # tests/test_upload_api.py
+import time
 from fastapi.testclient import TestClient
 from src.api.main import app
 
 client = TestClient(app)
 
+def wait_for_job(job_id, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        data = client.get(f"/jobs/{job_id}").json()
+        if data["status"] in ("done", "failed"):
+            return data
+        time.sleep(0.1)
+    raise AssertionError("upload job did not finish in time")
+
 def test_upload_txt():
     response = client.post(
         "/upload",
         files={"file": ("test.txt", b"RAG systems use vector databases")},
     )
 
-    assert response.status_code == 200
-    data = response.json()
-    assert data["status"] == "success"
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+
+    data = wait_for_job(job_id)
+    assert data["status"] == "done"
     assert data["chunks_created"] > 0
+
+def test_upload_unsupported_type():
+    response = client.post(
+        "/upload",
+        files={"file": ("test.csv", b"a,b")},
+    )
+    assert response.status_code == 400
+
+def test_unknown_job():
+    assert client.get("/jobs/does-not-exist").status_code == 404
+
+def test_upload_batch_multiple_files():
+    response = client.post(
+        "/upload/batch",
+        files=[
+            ("files", ("batch_a.txt", b"Vector databases store embeddings")),
+            ("files", ("batch_b.txt", b"Chunking splits documents into passages")),
+        ],
+    )
+
+    assert response.status_code == 202
+    data = wait_for_job(response.json()["job_id"])
+    assert data["status"] == "done"
+    assert data["files_total"] == data["files_parsed"] == 2
+    assert data["chunks_created"] > 0
+
+def test_upload_batch_rejects_unsupported_file():
+    response = client.post(
+        "/upload/batch",
+        files=[("files", ("data.csv", b"a,b"))],
+    )
+    assert response.status_code == 400
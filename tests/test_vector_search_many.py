@@ -0,0 +1,64 @@
+# tests/test_vector_search_many.py
+import numpy as np
+
+from src.search import vector_search as vs
+from src.search.semantic_search import semantic_search_many
+from src.search.result_cache import QueryResultCache
+from src.vectorstore.numpy_store import NumpyStore
+
+
+class CountingEmbedder:
+    model_name = "dummy-model"
+
+    def __init__(self):
+        self.calls = []
+
+    def embed(self, texts):
+        self.calls.append(list(texts))
+        return np.stack([np.random.default_rng(len(t)).normal(size=8) for t in texts]).astype(np.float32)
+
+
+def make_store(tmp_path, embedder):
+    store = NumpyStore(persist_dir=str(tmp_path), embedder=embedder)
+    store.add(ids=["a", "b", "c"], documents=["one", "three", "seventeen"])
+    embedder.calls.clear()
+
+    queries = []
+    original = store.collection.query
+    def counting_query(**kwargs):
+        queries.append(len(kwargs["query_embeddings"]))
+        return original(**kwargs)
+    store.collection.query = counting_query
+    return store, queries
+
+
+def test_many_queries_use_one_embed_and_one_query(tmp_path, monkeypatch):
+    monkeypatch.setattr(vs, "get_query_cache", lambda: None)
+    embedder = CountingEmbedder()
+    store, queries = make_store(tmp_path, embedder)
+
+    results = vs.vector_search_many(["seventeen", "", "one", "seventeen"], top_k=2, store=store)
+
+    assert [r[0][0] if r else None for r in results] == ["seventeen", None, "one", "seventeen"]
+    assert all(len(r) == 2 for i, r in enumerate(results) if i != 1)
+    assert embedder.calls == [["seventeen", "one"]]  # deduplicated, one batch
+    assert queries == [2]
+
+    # Same answers as one-at-a-time search
+    single = vs.vector_search("one", top_k=2, store=store)
+    assert [doc for doc, _ in results[2]] == [doc for doc, _ in single]
+    assert np.allclose([s for _, s in results[2]], [s for _, s in single], atol=1e-6)
+
+
+def test_cached_queries_are_skipped(tmp_path, monkeypatch):
+    cache = QueryResultCache()
+    monkeypatch.setattr(vs, "get_query_cache", lambda: cache)
+    embedder = CountingEmbedder()
+    store, queries = make_store(tmp_path, embedder)
+
+    vs.vector_search("one", top_k=1, store=store)
+    results = semantic_search_many(["one", "three"], store=store, top_k=1)
+
+    assert [r[0][0] for r in results] == ["one", "three"]
+    assert embedder.calls == [["one"], ["three"]]
+    assert queries == [1, 1]